@@ -24,6 +24,7 @@ def train(args):
         num_actor_devices=args.num_actor_devices,
         num_actors=args.num_actors,
         training_device=args.training_device,
+        seed=args.seed,
     )
 
     # Train DMC Agents
@@ -84,6 +85,12 @@ if __name__ == '__main__':
         type=int,
         help='The number of actors for each simulation device',
     )
+    parser.add_argument(
+        '--seed',
+        default=None,
+        type=int,
+        help='Seed of the run, every actor derives its own random stream from it',
+    )
     parser.add_argument(
         '--training_device',
         default="0",
@@ -1,11 +1,6 @@
-import subprocess
-import sys
-from distutils.version import LooseVersion
+from rlcard.utils.utils import is_torch_available
 
-reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-
-if 'torch' in installed_packages:
+if is_torch_available():
     from rlcard.agents.dqn_agent import DQNAgent as DQNAgent
     from rlcard.agents.nfsp_agent import NFSPAgent as NFSPAgent
 
@@ -16,3 +11,10 @@ from rlcard.agents.human_agents.leduc_holdem_human_agent import HumanAgent as Le
 from rlcard.agents.human_agents.blackjack_human_agent import HumanAgent as BlackjackHumanAgent
 from rlcard.agents.human_agents.uno_human_agent import HumanAgent as UnoHumanAgent
 from rlcard.agents.random_agent import RandomAgent
+
+def __getattr__(name):
+    # PIMCAgent loads the ctpinochle game, so it is only imported when asked for
+    if name == 'PIMCAgent':
+        from rlcard.agents.pimc_agent import PIMCAgent
+        return PIMCAgent
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
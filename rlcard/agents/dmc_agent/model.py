@@ -56,12 +56,14 @@ class DMCAgent:
         self.net = DMCNet(state_shape, action_shape, mlp_layers).to(self.device)
         self.exp_epsilon = exp_epsilon
         self.action_shape = action_shape
+        # The exploration stream, the actors seed it with seed_agents
+        self.np_random = np.random.RandomState()
 
     def step(self, state):
         action_keys, values = self.predict(state)
 
-        if self.exp_epsilon > 0 and np.random.rand() < self.exp_epsilon:
-            action = np.random.choice(action_keys)
+        if self.exp_epsilon > 0 and self.np_random.rand() < self.exp_epsilon:
+            action = self.np_random.choice(action_keys)
         else:
             action_idx = np.argmax(values)
             action = action_keys[action_idx]
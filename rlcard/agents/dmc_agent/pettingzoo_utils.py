@@ -3,8 +3,8 @@ import traceback
 import numpy as np
 import torch
 
-from .utils import log
-from rlcard.utils import run_game_pettingzoo
+from .utils import log, seed_agents
+from rlcard.utils import run_game_pettingzoo, seeding
 
 def create_buffers_pettingzoo(
     T,
@@ -48,10 +48,16 @@ def act_pettingzoo(
     full_queue,
     model,
     buffers,
-    env
+    env,
+    seed
 ):
     log.info('Device %s Actor %i started.', str(device), i)
     try:
+        # As in seed_actor. PettingZoo environments take an int seed on reset, and the later
+        # resets continue its stream
+        env.reset(seed=int(seeding.child_seed_sequence(seed, 0).generate_state(1)[0]))
+        seed_agents(model.get_agents(), seeding.child_seed_sequence(seed, 1))
+
         done_buf = [[] for _ in range(env.num_agents)]
         episode_return_buf = [[] for _ in range(env.num_agents)]
         target_buf = [[] for _ in range(env.num_agents)]
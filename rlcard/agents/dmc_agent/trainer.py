@@ -24,6 +24,8 @@ import torch
 from torch import multiprocessing as mp
 from torch import nn
 
+from rlcard.utils import seeding
+
 from .file_writer import FileWriter
 from .model import DMCModel
 from .pettingzoo_model import DMCModelPettingZoo
@@ -104,6 +106,9 @@ class DMCTrainer:
         alpha (float): RMSProp smoothing constant
         momentum (float): RMSProp momentum
         epsilon (float): RMSProp epsilon
+        seed (int): Seed of the run, None for a random one. Actor i of the d-th
+            simulation device plays with the stream seeding.seed_sequence(seed, d, i),
+            which seeds both its games and the exploration of its agents, see seed_actor
     """
     def __init__(
         self,
@@ -127,9 +132,11 @@ class DMCTrainer:
         learning_rate=0.0001,
         alpha=0.99,
         momentum=0,
-        epsilon=0.00001
+        epsilon=0.00001,
+        seed=None
     ):
         self.env = env
+        self.seed_sequence = seeding.seed_sequence(seed)
 
         self.plogger = FileWriter(
             xpid=xpid,
@@ -266,12 +273,14 @@ class DMCTrainer:
 
 
         # Starting actor processes
-        for device in self.device_iterator:
+        for device_index, device in enumerate(self.device_iterator):
             num_actors = self.num_actors
             for i in range(self.num_actors):
+                # Independent streams for every actor of every device
+                actor_seed = seeding.seed_sequence(self.seed_sequence.entropy, device_index, i)
                 actor = ctx.Process(
                     target=act_pettingzoo if self.is_pettingzoo_env else act,
-                    args=(i, device, self.T, free_queue[device], full_queue[device], models[device], buffers[device], self.env))
+                    args=(i, device, self.T, free_queue[device], full_queue[device], models[device], buffers[device], self.env, actor_seed))
                 actor.start()
                 actor_processes.append(actor)
 
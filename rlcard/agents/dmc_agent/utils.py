@@ -19,6 +19,8 @@ import traceback
 import numpy as np
 import torch
 
+from rlcard.utils import seeding
+
 shandle = logging.StreamHandler()
 shandle.setFormatter(
     logging.Formatter(
@@ -94,6 +96,28 @@ def create_optimizers(
         optimizers.append(optimizer)
     return optimizers
 
+def seed_agents(agents, seed):
+    ''' Give every agent its own exploration stream
+
+    Args:
+        agents (list): The DMC agents
+        seed (numpy.random.SeedSequence): Agent j explores with the j-th child of seed
+    '''
+    for agent_id, agent in enumerate(agents):
+        agent.np_random = seeding.np_random_from_seed_sequence(seeding.child_seed_sequence(seed, agent_id))
+
+def seed_actor(env, agents, seed):
+    ''' Seed the games and the exploration of an actor, so that actors with the same
+        seed choose the same actions
+
+    Args:
+        env (Env): The environment of the actor, seeded with the first child of seed
+        agents (list): The DMC agents, seeded with the children of the second child of seed
+        seed (numpy.random.SeedSequence): The stream of the actor
+    '''
+    env.seed(seeding.child_seed_sequence(seed, 0))
+    seed_agents(agents, seeding.child_seed_sequence(seed, 1))
+
 def act(
     i,
     device,
@@ -102,13 +126,14 @@ def act(
     full_queue,
     model,
     buffers,
-    env
+    env,
+    seed
 ):
     try:
         log.info('Device %s Actor %i started.', str(device), i)
 
         # Configure environment
-        env.seed(i)
+        seed_actor(env, model.get_agents(), seed)
         env.set_agents(model.get_agents())
 
         done_buf = [[] for _ in range(env.num_players)]
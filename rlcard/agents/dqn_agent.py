@@ -33,7 +33,7 @@ import torch.nn as nn
 from collections import namedtuple
 from copy import deepcopy
 
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import remove_illegal, get_state_legal_mask
 
 Transition = namedtuple('Transition', ['state', 'action', 'reward', 'next_state', 'done', 'legal_actions'])
 
@@ -134,6 +134,37 @@ class DQNAgent(object):
         '''
         (state, action, reward, next_state, done) = tuple(ts)
         self.feed_memory(state['obs'], action, reward, next_state['obs'], list(next_state['legal_actions'].keys()), done)
+        self._count_fed_transition()
+
+    def feed_transitions(self, transitions):
+        ''' Store the columns of transitions recorded by a TrajectoryRecorder, see feed
+
+        Args:
+            transitions (Transitions): The transitions of one player
+        '''
+        # The recorder reuses its columns, so the memory keeps copies
+        obs = transitions.obs.copy()
+        next_obs = transitions.next_obs.copy()
+        legal_actions = [np.flatnonzero(legal_mask).tolist() for legal_mask in transitions.next_legal_mask]
+        num_transitions = len(transitions.actions)
+        start = 0
+        while start < num_transitions:
+            # Save the transitions up to the next training step at once, so that
+            # the agent trains on the same memory as with one feed per transition
+            if self.total_t < self.replay_memory_init_size:
+                next_train_t = self.replay_memory_init_size
+            else:
+                next_train_t = self.total_t + self.train_every - (self.total_t - self.replay_memory_init_size) % self.train_every
+            end = min(start + next_train_t - self.total_t, num_transitions)
+            self.memory.save_batch(obs[start:end], transitions.actions[start:end].tolist(),
+                                   transitions.rewards[start:end].tolist(), next_obs[start:end],
+                                   legal_actions[start:end], transitions.dones[start:end].tolist())
+            self.total_t += end - start
+            start = end
+            if self.total_t == next_train_t:
+                self.train()
+
+    def _count_fed_transition(self):
         self.total_t += 1
         tmp = self.total_t - self.replay_memory_init_size
         if tmp>=0 and tmp%self.train_every == 0:
@@ -150,14 +181,28 @@ class DQNAgent(object):
             action (int): an action id
         '''
         q_values = self.predict(state)
+        return self._epsilon_greedy(state, q_values)
+
+    def step_batch(self, states):
+        ''' Predict the actions of several states for genrating training data,
+            with a single forward pass of the network
+
+        Args:
+            states (list): current states
+
+        Returns:
+            actions (list): one action id per state
+        '''
+        q_values = self.predict_batch(states)
+        return [self._epsilon_greedy(state, state_q_values) for state, state_q_values in zip(states, q_values)]
+
+    def _epsilon_greedy(self, state, q_values):
         epsilon = self.epsilons[min(self.total_t, self.epsilon_decay_steps-1)]
-        legal_actions = list(state['legal_actions'].keys())
-        probs = np.ones(len(legal_actions), dtype=float) * epsilon / len(legal_actions)
-        best_action_idx = legal_actions.index(np.argmax(q_values))
-        probs[best_action_idx] += (1.0 - epsilon)
-        action_idx = np.random.choice(np.arange(len(probs)), p=probs)
+        legal_mask = get_state_legal_mask(state, self.num_actions)
+        probs = legal_mask * (epsilon / np.count_nonzero(legal_mask))
+        probs[np.argmax(q_values)] += (1.0 - epsilon)
 
-        return legal_actions[action_idx]
+        return np.random.choice(self.num_actions, p=probs)
 
     def eval_step(self, state):
         ''' Predict the action for evaluation purpose.
@@ -170,6 +215,24 @@ class DQNAgent(object):
             info (dict): A dictionary containing information
         '''
         q_values = self.predict(state)
+        return self._greedy(state, q_values)
+
+    def eval_step_batch(self, states):
+        ''' Predict the actions of several states for evaluation purpose,
+            with a single forward pass of the network
+
+        Args:
+            states (list): current states
+
+        Returns:
+            actions (list): one action id per state
+            infos (list): one info dictionary per state
+        '''
+        q_values = self.predict_batch(states)
+        results = [self._greedy(state, state_q_values) for state, state_q_values in zip(states, q_values)]
+        return [action for action, _ in results], [info for _, info in results]
+
+    def _greedy(self, state, q_values):
         best_action = np.argmax(q_values)
 
         info = {}
@@ -186,13 +249,21 @@ class DQNAgent(object):
         Returns:
             q_values (numpy.array): a 1-d array where each entry represents a Q value
         '''
-        
-        q_values = self.q_estimator.predict_nograd(np.expand_dims(state['obs'], 0))[0]
-        masked_q_values = -np.inf * np.ones(self.num_actions, dtype=float)
-        legal_actions = list(state['legal_actions'].keys())
-        masked_q_values[legal_actions] = q_values[legal_actions]
+        return self.predict_batch([state])[0]
+
+    def predict_batch(self, states):
+        ''' Predict the masked Q-values of several states with a single forward pass
+
+        Args:
+            states (list): current states
 
-        return masked_q_values
+        Returns:
+            q_values (numpy.array): a 2-d array with one row of Q values per state
+        '''
+        q_values = self.q_estimator.predict_nograd(np.stack([state['obs'] for state in states]))
+        legal_masks = np.stack([get_state_legal_mask(state, self.num_actions) for state in states])
+
+        return np.where(legal_masks, q_values, -np.inf)
 
     def train(self):
         ''' Train the network
@@ -522,6 +593,21 @@ class Memory(object):
         transition = Transition(state, action, reward, next_state, done, legal_actions)
         self.memory.append(transition)
 
+    def save_batch(self, states, actions, rewards, next_states, legal_actions, dones):
+        ''' Save several transitions into memory, see save
+
+        Args:
+            states (numpy.array): the current states, one row per transition
+            actions (list): the performed action IDs
+            rewards (list): the rewards received
+            next_states (numpy.array): the next states after performing the actions
+            legal_actions (list): the legal actions of every next state
+            dones (list): whether the episode is finished after every transition
+        '''
+        self.memory.extend(map(Transition, states, actions, rewards, next_states, dones, legal_actions))
+        if len(self.memory) > self.memory_size:
+            del self.memory[:len(self.memory) - self.memory_size]
+
     def sample(self):
         ''' Sample a minibatch from the replay memory
 
@@ -29,7 +29,7 @@ import torch.nn as nn
 import torch.nn.functional as F
 
 from rlcard.agents.dqn_agent import DQNAgent
-from rlcard.utils.utils import remove_illegal
+from rlcard.utils.utils import remove_illegal, get_state_legal_mask
 
 Transition = collections.namedtuple('Transition', 'info_state action_probs')
 
@@ -174,7 +174,6 @@ class NFSPAgent(object):
             action (int): An action id
         '''
         obs = state['obs']
-        legal_actions = list(state['legal_actions'].keys())
         if self._mode == 'best_response':
             action = self._rl_agent.step(state)
             one_hot = np.zeros(self._num_actions)
@@ -183,11 +182,37 @@ class NFSPAgent(object):
 
         elif self._mode == 'average_policy':
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, get_state_legal_mask(state, self._num_actions))
             action = np.random.choice(len(probs), p=probs)
 
         return action
 
+    def step_batch(self, states):
+        ''' Returns the actions to be taken in several states, with a single
+            forward pass of the network
+
+        Args:
+            states (list): The current states
+
+        Returns:
+            actions (list): One action id per state
+        '''
+        if self._mode == 'best_response':
+            actions = self._rl_agent.step_batch(states)
+            for state, action in zip(states, actions):
+                one_hot = np.zeros(self._num_actions)
+                one_hot[action] = 1
+                self._add_transition(state['obs'], one_hot)
+
+        elif self._mode == 'average_policy':
+            all_probs = self._act_batch(np.stack([state['obs'] for state in states]))
+            actions = []
+            for state, probs in zip(states, all_probs):
+                probs = remove_illegal(probs, get_state_legal_mask(state, self._num_actions))
+                actions.append(np.random.choice(len(probs), p=probs))
+
+        return actions
+
     def eval_step(self, state):
         ''' Use the average policy for evaluation purpose
 
@@ -204,14 +229,41 @@ class NFSPAgent(object):
             obs = state['obs']
             legal_actions = list(state['legal_actions'].keys())
             probs = self._act(obs)
-            probs = remove_illegal(probs, legal_actions)
+            probs = remove_illegal(probs, get_state_legal_mask(state, self._num_actions))
             action = np.random.choice(len(probs), p=probs)
             info = {}
-            info['probs'] = {state['raw_legal_actions'][i]: float(probs[list(state['legal_actions'].keys())[i]]) for i in range(len(state['legal_actions']))}
+            info['probs'] = {state['raw_legal_actions'][i]: float(probs[legal_actions[i]]) for i in range(len(legal_actions))}
         else:
             raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
         return action, info
 
+    def eval_step_batch(self, states):
+        ''' Use the average policy to evaluate several states, with a single
+            forward pass of the network
+
+        Args:
+            states (list): The current states.
+
+        Returns:
+            actions (list): One action id per state.
+            infos (list): One info dictionary per state
+        '''
+        if self.evaluate_with == 'best_response':
+            return self._rl_agent.eval_step_batch(states)
+        elif self.evaluate_with == 'average_policy':
+            all_probs = self._act_batch(np.stack([state['obs'] for state in states]))
+            actions, infos = [], []
+            for state, probs in zip(states, all_probs):
+                legal_actions = list(state['legal_actions'].keys())
+                probs = remove_illegal(probs, get_state_legal_mask(state, self._num_actions))
+                actions.append(np.random.choice(len(probs), p=probs))
+                info = {}
+                info['probs'] = {state['raw_legal_actions'][i]: float(probs[legal_actions[i]]) for i in range(len(legal_actions))}
+                infos.append(info)
+        else:
+            raise ValueError("'evaluate_with' should be either 'average_policy' or 'best_response'.")
+        return actions, infos
+
     def sample_episode_policy(self):
         ''' Sample average/best_response policy
         '''
@@ -229,15 +281,23 @@ class NFSPAgent(object):
         Returns:
             action_probs (numpy.array): The predicted action probability.
         '''
-        info_state = np.expand_dims(info_state, axis=0)
-        info_state = torch.from_numpy(info_state).float().to(self.device)
+        return self._act_batch(np.expand_dims(info_state, axis=0))[0]
 
-        with torch.no_grad():
-            log_action_probs = self.policy_network(info_state).cpu().numpy()
+    def _act_batch(self, info_states):
+        ''' Predict action probabilities of a batch of observations
+            Not connected to computation graph
+        Args:
+            info_states (numpy.array): Obervations, one per row.
+
+        Returns:
+            action_probs (numpy.array): The predicted action probabilities, one row per observation.
+        '''
+        info_states = torch.from_numpy(info_states).float().to(self.device)
 
-        action_probs = np.exp(log_action_probs)[0]
+        with torch.no_grad():
+            log_action_probs = self.policy_network(info_states).cpu().numpy()
 
-        return action_probs
+        return np.exp(log_action_probs)
 
     def _add_transition(self, state, probs):
         ''' Adds the new transition to the reservoir buffer.
@@ -0,0 +1,196 @@
+''' Perfect information Monte Carlo (PIMC) agent for cutthroat pinochle
+'''
+import copy
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from rlcard.games.ctpinochle.utils.action_event import ActionEvent, PassBid, SelectTrumpAction
+from rlcard.games.ctpinochle.utils.ctpinochle_card import CTPinochleCard
+from rlcard.games.ctpinochle.utils.determinization import sample_determinizations
+from rlcard.games.ctpinochle.utils.meld_calculator import calculate_meld_points
+
+
+class PIMCAgent(object):
+    ''' A search agent for CTPinochleEnv that needs no training.
+
+    For every decision it samples deals of the hidden cards that are consistent
+    with what the player has seen, plays every legal action followed by fast
+    rollouts to the end of the round in each deal, and picks the action with the
+    best average round score for the player.
+    '''
+
+    def __init__(self, env, num_determinizations=20, rollouts_per_action=1, time_budget=None, num_workers=1, batch_size=5, seed=None):
+        ''' Initilize the PIMC agent
+
+        Args:
+            env (Env): The CTPinochleEnv the agent plays in. Decisions are made for the current state of env.game
+            num_determinizations (int): Maximum number of sampled deals per decision
+            rollouts_per_action (int): Rollouts for every legal action in every deal
+            time_budget (float): Optional number of seconds per decision. Sampling stops once it is used up
+            num_workers (int): Number of worker processes. 1 runs the rollouts in this process
+            batch_size (int): Number of deals evaluated per worker task
+            seed (int): Seed for sampling deals and rollouts
+        '''
+        self.use_raw = False
+        self.env = env
+        self.num_determinizations = num_determinizations
+        self.rollouts_per_action = rollouts_per_action
+        self.time_budget = time_budget
+        self.num_workers = num_workers
+        self.batch_size = batch_size
+        self.np_random = np.random.RandomState(seed)
+        self._executor = None
+
+    def step(self, state):
+        ''' Predict the action given the current state in generating training data.
+
+        Args:
+            state (dict): An dictionary that represents the current state
+
+        Returns:
+            action (int): The action chosen by the search
+        '''
+        return self.eval_step(state)[0]
+
+    def eval_step(self, state):
+        ''' Predict the action given the current state for evaluation.
+
+        Args:
+            state (dict): An dictionary that represents the current state
+
+        Returns:
+            action (int): The action chosen by the search
+            info (dict): A dictionary containing the average value of every legal action
+        '''
+        legal_actions = list(state['legal_actions'].keys())
+        if len(legal_actions) == 1:
+            return legal_actions[0], {'values': {legal_actions[0]: 0.0}}
+
+        values = self.evaluate_actions(legal_actions)
+        action = legal_actions[int(np.argmax(values))]
+
+        info = {}
+        info['values'] = {legal_actions[i]: float(values[i]) for i in range(len(legal_actions))}
+        return action, info
+
+    def evaluate_actions(self, legal_actions):
+        ''' Average rollout value of each legal action for the current player of env.game
+
+        Args:
+            legal_actions (list): The legal action ids
+
+        Returns:
+            (numpy.array): The value of each action, in the order of legal_actions
+        '''
+        game = self.env.game
+        player_id = game.get_player_id()
+        start_time = time.time()
+        value_sums = np.zeros(len(legal_actions))
+        num_evaluated = 0
+
+        # Send a single copy of the game per batch of deals, workers only swap the hidden hands
+        futures = []
+        while num_evaluated < self.num_determinizations:
+            if self.time_budget is not None and num_evaluated > 0 and time.time() - start_time > self.time_budget:
+                break
+            batch_size = min(self.batch_size, self.num_determinizations - num_evaluated)
+            owners = sample_determinizations(game, player_id, batch_size, np_random=self.np_random)
+            seed = self.np_random.randint(2 ** 31)
+            if self.num_workers > 1:
+                futures.append(self._get_executor().submit(
+                    evaluate_determinizations, game, player_id, legal_actions, owners, self.rollouts_per_action, seed))
+                if len(futures) >= self.num_workers:
+                    value_sums += futures.pop(0).result()
+            else:
+                value_sums += evaluate_determinizations(game, player_id, legal_actions, owners, self.rollouts_per_action, seed)
+            num_evaluated += batch_size
+        for future in futures:
+            value_sums += future.result()
+
+        return value_sums / (num_evaluated * self.rollouts_per_action)
+
+    def close(self):
+        ''' Shut down the worker processes
+        '''
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+        return self._executor
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        return state
+
+
+def evaluate_determinizations(game, player_id, legal_actions, owners, rollouts_per_action, seed):
+    ''' Sum of rollout values of each legal action over a batch of sampled deals
+
+    Args:
+        game (CTPinochleGame): The game at the decision point. It is copied, not modified
+        player_id (int): The player to move
+        legal_actions (list): The legal action ids
+        owners (numpy.array): Sampled deals from sample_determinizations, shape (N, 48)
+        rollouts_per_action (int): Rollouts per action and deal
+        seed (int): Seed for the rollout policy
+
+    Returns:
+        (numpy.array): Summed value of each action
+    '''
+    np_random = np.random.RandomState(seed)
+    game = copy.deepcopy(game)
+    game.allow_step_back = True
+    game.undo_log = []
+    game.np_random = np_random
+    value_sums = np.zeros(len(legal_actions))
+    for deal in owners:
+        _set_hands(game, deal)
+        for action_index, action_id in enumerate(legal_actions):
+            for _ in range(rollouts_per_action):
+                value_sums[action_index] += _rollout(game, player_id, ActionEvent.from_action_id(action_id), np_random)
+    return value_sums
+
+
+def _set_hands(game, owners):
+    ''' Give every player the cards the sampled deal assigns to them '''
+    for player in game.round.players:
+        player.hand = []
+        player.hand_mask = 0
+        player.card_counts[:] = 0
+        for card_id in np.flatnonzero(owners == player.player_id):
+            player.add_card_to_hand(CTPinochleCard.card(card_id))
+    game.state_version += 1
+
+
+def _rollout(game, player_id, action, np_random):
+    ''' Play action then the rollout policy until the round ends, undo everything and return the player's round score '''
+    start_round = game.round
+    start_score = game.total_scores[player_id]
+    num_steps = 0
+    game.step(action)
+    num_steps += 1
+    while game.round is start_round and not game.is_over():
+        game.step(_rollout_policy(game, np_random))
+        num_steps += 1
+    value = game.total_scores[player_id] - start_score
+    for _ in range(num_steps):
+        game.step_back()
+    return value
+
+
+def _rollout_policy(game, np_random):
+    ''' Fast default policy: pass when bidding, pick the trump with the most meld, play a random legal card '''
+    legal_actions = game.judger.get_legal_actions()
+    first_action = legal_actions[0]
+    if isinstance(first_action, PassBid):
+        return first_action
+    if isinstance(first_action, SelectTrumpAction):
+        card_counts = game.round.get_current_player().card_counts
+        return max(legal_actions, key=lambda action: calculate_meld_points(card_counts, action.trump_suit))
+    return legal_actions[np_random.randint(len(legal_actions))]
@@ -1,18 +1,4 @@
 import numpy as np
-import logging
-
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-
-file_handler = logging.FileHandler("random_agent_test.txt")
-file_handler.setLevel(logging.INFO)
-
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(message)s"
-)
-file_handler.setFormatter(formatter)
-
-logger.addHandler(file_handler)
 
 
 class RandomAgent(object):
@@ -52,13 +38,34 @@ class RandomAgent(object):
             probs (list): The list of action probabilities
         '''
         probs = [0 for _ in range(self.num_actions)]
-        # State is from env/ctpinochle.py
         for i in state['legal_actions']:
-            #logger.info(f'i-val: {i} | probs[i]: {1/len(state['legal_actions'])}')
             probs[i] = 1/len(state['legal_actions'])
-        #logger.info(f'Spacebreak\n')
 
         info = {}
         info['probs'] = {state['raw_legal_actions'][i]: probs[list(state['legal_actions'].keys())[i]] for i in range(len(state['legal_actions']))}
 
         return self.step(state), info
+
+    def step_batch(self, states):
+        ''' Predict the actions of several states in generating training data.
+
+        Args:
+            states (list): The states, see step
+
+        Returns:
+            actions (list): One action per state
+        '''
+        return [self.step(state) for state in states]
+
+    def eval_step_batch(self, states):
+        ''' Predict the actions of several states for evaluation.
+
+        Args:
+            states (list): The states, see eval_step
+
+        Returns:
+            actions (list): One action per state
+            infos (list): One info dict per state
+        '''
+        results = [self.eval_step(state) for state in states]
+        return [action for action, _ in results], [info for _, info in results]
@@ -0,0 +1,3 @@
+from rlcard.benchmarks.env_benchmarks import get_env_ids, benchmark_env
+from rlcard.benchmarks.micro_benchmarks import MICRO_BENCHMARKS, run_micro_benchmark
+from rlcard.benchmarks.compare import compare_results
@@ -0,0 +1,117 @@
+''' Run the benchmarks, e.g.
+
+    python -m rlcard.benchmarks --output baseline.json
+    python -m rlcard.benchmarks --baseline baseline.json
+
+The second run exits with status 1 if a metric regressed by more than the tolerance.
+'''
+import argparse
+import json
+import platform
+import sys
+
+import numpy as np
+
+import rlcard
+from rlcard.benchmarks import (
+    MICRO_BENCHMARKS,
+    benchmark_env,
+    compare_results,
+    get_env_ids,
+    run_micro_benchmark,
+)
+
+def run_benchmarks(args):
+    results = {
+        'rlcard': rlcard.__version__,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'min_time': args.min_time,
+        'seed': args.seed,
+        'envs': {},
+        'micro': {},
+    }
+    if not args.skip_envs:
+        for env_id in args.envs or get_env_ids():
+            results['envs'][env_id] = benchmark_env(env_id, min_time=args.min_time, seed=args.seed)
+            print('{:<34} {:>12.1f} steps/s {:>10.1f} games/s {:>10.1f} us/reset {:>10.1f} KB'.format(
+                env_id,
+                results['envs'][env_id]['steps_per_sec'],
+                results['envs'][env_id]['games_per_sec'],
+                results['envs'][env_id]['reset_latency_us'],
+                results['envs'][env_id]['peak_memory_kb']), file=sys.stderr)
+    if not args.skip_micro:
+        for name in args.micro or list(MICRO_BENCHMARKS):
+            results['micro'][name] = run_micro_benchmark(name, min_time=args.min_time, seed=args.seed)
+            print('{:<34} {:>12.1f} ops/s {:>10.2f} us/op'.format(
+                name,
+                results['micro'][name]['ops_per_sec'],
+                results['micro'][name]['mean_us']), file=sys.stderr)
+    return results
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser("Throughput benchmarks of RLCard")
+    parser.add_argument(
+        '--envs',
+        nargs='+',
+        help='Environment ids to benchmark, all the registered ones by default',
+    )
+    parser.add_argument(
+        '--micro',
+        nargs='+',
+        choices=list(MICRO_BENCHMARKS),
+        help='Microbenchmarks to run, all of them by default',
+    )
+    parser.add_argument(
+        '--skip-envs',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--skip-micro',
+        action='store_true',
+    )
+    parser.add_argument(
+        '--min-time',
+        type=float,
+        default=1.0,
+        help='Seconds to run every benchmark for',
+    )
+    parser.add_argument(
+        '--seed',
+        type=int,
+        default=0,
+    )
+    parser.add_argument(
+        '--output',
+        type=str,
+        help='Write the results to this JSON file instead of stdout',
+    )
+    parser.add_argument(
+        '--baseline',
+        type=str,
+        help='JSON results of an earlier run to compare against',
+    )
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.2,
+        help='Allowed relative regression against the baseline',
+    )
+    args = parser.parse_args()
+
+    results = run_benchmarks(args)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    else:
+        print(json.dumps(results, indent=2, sort_keys=True))
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        for regression in regressions:
+            print('REGRESSION {group}/{name} {metric}: {baseline:.2f} -> {value:.2f} ({change:+.1%})'.format(**regression), file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print('No regression against {}'.format(args.baseline), file=sys.stderr)
@@ -0,0 +1,47 @@
+''' Comparison of benchmark results against a stored baseline
+'''
+
+# Metrics where a larger value is better, the others are timings and sizes
+HIGHER_IS_BETTER = ('steps_per_sec', 'games_per_sec', 'ops_per_sec')
+LOWER_IS_BETTER = ('reset_latency_us', 'peak_memory_kb', 'mean_us')
+
+def compare_results(results, baseline, tolerance=0.2):
+    ''' Find the metrics that got worse than the baseline by more than the tolerance
+
+    Args:
+        results (dict): The results, {'envs': {name: metrics}, 'micro': {name: metrics}}
+        baseline (dict): Results of an earlier run in the same format. Benchmarks
+            missing from either side are skipped
+        tolerance (float): The allowed relative slowdown, 0.2 for 20%
+
+    Returns:
+        (list): One dict per metric with group, name, metric, baseline, value and
+            change, the relative change where a negative value is worse, worst first
+    '''
+    regressions = []
+    for group in ('envs', 'micro'):
+        baseline_group = baseline.get(group, {})
+        for name, metrics in results.get(group, {}).items():
+            if name not in baseline_group:
+                continue
+            for metric, value in metrics.items():
+                base = baseline_group[name].get(metric)
+                if not base:
+                    continue
+                if metric in HIGHER_IS_BETTER:
+                    change = value / base - 1.0
+                elif metric in LOWER_IS_BETTER:
+                    change = base / value - 1.0 if value else 0.0
+                else:
+                    continue
+                if change < -tolerance:
+                    regressions.append({
+                        'group': group,
+                        'name': name,
+                        'metric': metric,
+                        'baseline': base,
+                        'value': value,
+                        'change': change,
+                    })
+    regressions.sort(key=lambda regression: regression['change'])
+    return regressions
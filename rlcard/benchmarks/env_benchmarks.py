@@ -0,0 +1,77 @@
+''' Throughput of the registered environments under random agents
+'''
+import time
+import tracemalloc
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.envs.registration import registry
+from rlcard.utils.utils import set_seed
+
+def get_env_ids():
+    ''' Get the ids of the registered environments
+
+    Returns:
+        (list): The environment ids, in registration order
+    '''
+    return list(registry.env_specs)
+
+def benchmark_env(env_id, min_time=1.0, min_games=3, seed=0):
+    ''' Measure an environment played by random agents
+
+    Args:
+        env_id (string): The id of the environment
+        min_time (float): Play games for at least this many seconds
+        min_games (int): Play at least this many games
+        seed (int): The seed of the environment and the agents
+
+    Returns:
+        (dict): steps_per_sec and games_per_sec of whole games, reset_latency_us
+            the mean time of Env.reset, and peak_memory_kb the peak memory
+            allocated by Python while playing one game
+    '''
+    set_seed(seed)
+    env = rlcard.make(env_id, config={'seed': seed})
+    agents = [RandomAgent(num_actions=env.num_actions) for _ in range(env.num_players)]
+    env.set_agents(agents)
+
+    # Warm up, so that the tables some games build on first use are not timed
+    env.run(is_training=True)
+
+    # Games, with agent.step since eval_step of the random agent builds full probability vectors
+    num_games = 0
+    num_steps = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while num_games < min_games or elapsed < min_time:
+        timestep = env.timestep
+        env.run(is_training=True)
+        num_steps += env.timestep - timestep
+        num_games += 1
+        elapsed = time.perf_counter() - start
+
+    num_resets = 0
+    start = time.perf_counter()
+    reset_time = 0.0
+    while num_resets < min_games or reset_time < min_time / 4:
+        env.reset()
+        num_resets += 1
+        reset_time = time.perf_counter() - start
+
+    # Separately, tracemalloc slows everything down. Seeded again so that it is always the same game
+    set_seed(seed)
+    env.seed(seed)
+    tracemalloc.start()
+    try:
+        env.run(is_training=True)
+        _, peak_memory = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'steps_per_sec': num_steps / elapsed,
+        'games_per_sec': num_games / elapsed,
+        'reset_latency_us': reset_time / num_resets * 1e6,
+        'peak_memory_kb': peak_memory / 1024,
+        'num_games': num_games,
+    }
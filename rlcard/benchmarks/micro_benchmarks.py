@@ -0,0 +1,106 @@
+''' Microbenchmarks of the hot components of the games
+
+Every benchmark builds its inputs from seeded deals or games first, then
+only the component itself is timed.
+'''
+import copy
+import time
+
+import numpy as np
+
+import rlcard
+from rlcard.utils.utils import init_standard_deck
+
+def _holdem_compare_hands(np_random, num_inputs):
+    from rlcard.games.limitholdem.utils import compare_hands
+
+    deck = [card.get_index() for card in init_standard_deck()]
+    inputs = []
+    for _ in range(num_inputs):
+        cards = [deck[index] for index in np_random.choice(len(deck), 9, replace=False)]
+        public_cards = cards[4:]
+        inputs.append(([cards[0:2] + public_cards, cards[2:4] + public_cards],))
+    return compare_hands, inputs
+
+def _doudizhu_playable_cards(np_random, num_inputs):
+    from rlcard.games.doudizhu.judger import DoudizhuJudger
+    from rlcard.games.doudizhu.utils import cards2str
+
+    env = rlcard.make('doudizhu', config={'seed': int(np_random.randint(2 ** 31))})
+    inputs = []
+    while len(inputs) < num_inputs:
+        env.reset()
+        inputs.extend((cards2str(player.current_hand),) for player in env.game.players)
+    return DoudizhuJudger.playable_cards_from_hand, inputs[:num_inputs]
+
+def _mahjong_judge_hu(np_random, num_inputs):
+    env = rlcard.make('mahjong', config={'seed': int(np_random.randint(2 ** 31))})
+    players = []
+    while len(players) < num_inputs:
+        state, _ = env.reset()
+        while not env.is_over() and len(players) < num_inputs:
+            players.append(copy.deepcopy(env.game.players[env.get_player_id()]))
+            state, _ = env.step(np_random.choice(list(state['legal_actions'])))
+    return env.game.judger.judge_hu, [(player,) for player in players]
+
+def _gin_rummy_meld_clusters(np_random, num_inputs):
+    from rlcard.games.gin_rummy.utils.melding import get_meld_clusters
+    from rlcard.games.gin_rummy.utils.utils import get_deck
+
+    deck = get_deck()
+    inputs = []
+    for _ in range(num_inputs):
+        inputs.append(([deck[index] for index in np_random.choice(len(deck), 11, replace=False)],))
+    return get_meld_clusters, inputs
+
+def _ctpinochle_meld(np_random, num_inputs):
+    from rlcard.games.ctpinochle.utils.meld_calculator import calculate_meld_points
+
+    env = rlcard.make('ctpinochle', config={'seed': int(np_random.randint(2 ** 31))})
+    inputs = []
+    while len(inputs) < num_inputs:
+        env.reset()
+        for player in env.game.round.players:
+            inputs.append((player.card_counts.copy(), 'CDHS'[np_random.randint(4)]))
+    return calculate_meld_points, inputs[:num_inputs]
+
+# Name of the benchmark -> function building (component, list of argument tuples)
+MICRO_BENCHMARKS = {
+    'holdem.compare_hands': _holdem_compare_hands,
+    'doudizhu.playable_cards_from_hand': _doudizhu_playable_cards,
+    'mahjong.judge_hu': _mahjong_judge_hu,
+    'gin_rummy.get_meld_clusters': _gin_rummy_meld_clusters,
+    'ctpinochle.calculate_meld_points': _ctpinochle_meld,
+}
+
+def run_micro_benchmark(name, min_time=1.0, num_inputs=200, seed=0):
+    ''' Time one component over seeded inputs
+
+    Args:
+        name (string): A key of MICRO_BENCHMARKS
+        min_time (float): Call the component for at least this many seconds
+        num_inputs (int): The number of distinct inputs, cycled through
+        seed (int): The seed of the inputs
+
+    Returns:
+        (dict): ops_per_sec and mean_us, the mean time of one call
+    '''
+    if name not in MICRO_BENCHMARKS:
+        raise ValueError('Unknown micro benchmark: {}'.format(name))
+    function, inputs = MICRO_BENCHMARKS[name](np.random.RandomState(seed), num_inputs)
+    # Lookup tables and caches are built on the first call
+    function(*inputs[0])
+
+    num_calls = 0
+    start = time.perf_counter()
+    elapsed = 0.0
+    while elapsed < min_time or num_calls == 0:
+        for args in inputs:
+            function(*args)
+        num_calls += len(inputs)
+        elapsed = time.perf_counter() - start
+
+    return {
+        'ops_per_sec': num_calls / elapsed,
+        'mean_us': elapsed / num_calls * 1e6,
+    }
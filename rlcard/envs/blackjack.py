@@ -2,6 +2,7 @@ import numpy as np
 from collections import OrderedDict
 
 from rlcard.envs import Env
+from rlcard.utils.utils import get_legal_mask
 from rlcard.games.blackjack import Game
 
 DEFAULT_GAME_CONFIG = {
@@ -53,7 +54,7 @@ class BlackjackEnv(Env):
         obs = np.array([my_score, dealer_score])
 
         legal_actions = OrderedDict({i: None for i in range(len(self.actions))})
-        extracted_state = {'obs': obs, 'legal_actions': legal_actions}
+        extracted_state = {'obs': obs, 'legal_actions': legal_actions, 'legal_mask': get_legal_mask(legal_actions, self.num_actions)}
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in self.actions]
         extracted_state['action_record'] = self.action_recorder
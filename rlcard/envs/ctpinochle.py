@@ -12,8 +12,9 @@ from rlcard.envs import Env
 from rlcard.games.ctpinochle import Game
 
 from rlcard.games.ctpinochle.game import CTPinochleGame
+from rlcard.games.ctpinochle.batched_game import BatchedCTPinochleGame
 from rlcard.games.ctpinochle.utils.action_event import ActionEvent
-from rlcard.games.ctpinochle.utils.ctpinochle_card import CTPinochleCard
+from rlcard.games.ctpinochle.utils.ctpinochle_card import CTPinochleCard, hand_mask_to_array
 from rlcard.games.ctpinochle.utils.move import MakeBidMove, MakePassBidMove, PlayCardMove
 
 
@@ -29,6 +30,9 @@ class CTPinochleEnv(Env):
         state_shape_size = self.pinochleStateExtractor.get_state_shape_size()
         self.state_shape = [[1, state_shape_size] for _ in range(self.num_players)]
         self.action_shape = [None for _ in range(self.num_players)]
+        # If set, a float32 array of shape (state_shape_size,) the observations are encoded
+        # into instead of new arrays, e.g. a row of the observation matrix of VectorEnv
+        self.obs_buffer = None
 
     def get_payoffs(self):
         ''' Get the payoffs of players.
@@ -55,7 +59,7 @@ class CTPinochleEnv(Env):
         Returns:
             (numpy.array): The extracted state
         '''
-        return self.pinochleStateExtractor.extract_state(game=self.game)
+        return self.pinochleStateExtractor.extract_state(game=self.game, out=self.obs_buffer)
 
     def _decode_action(self, action_id):
         ''' Decode Action id to the action in the game.
@@ -161,42 +165,52 @@ class PinochleStateExtractor(object):  # interface
         Returns:
             (OrderedDict): A OrderedDict of legal actions' id.
         '''
-        legal_actions = game.judger.get_legal_actions()
-        legal_actions_ids = {action_event.action_id: None for action_event in legal_actions}
-        return OrderedDict(legal_actions_ids)
+        legal_actions_ids = game.judger.get_legal_action_ids()
+        return OrderedDict.fromkeys(legal_actions_ids)
 
 
 class DefaultPinochleStateExtractor(PinochleStateExtractor):
 
-    def __init__(self):
+    def __init__(self, dtype=np.float32):
         super().__init__()
         self.max_bidding_rep_index = 15  # Max ~15 bidding moves (3 players, up to 5 rounds)
         self.last_bid_rep_size = 1 + 30  # pass + (bid 21-50)
+        self.dtype = dtype
+
+        # Each rep is written at a fixed offset of the observation, in this order
+        rep_sizes = [
+            ('hands_rep', 3 * 48),  # hands_rep_size (3 players, 48 cards)
+            ('trick_pile_rep', 3 * 48),  # trick_rep_size (3 players, 48 cards)
+            ('hidden_cards_rep', 48),  # hidden_cards_rep_size
+            ('dealer_rep', 3),  # dealer_rep_size
+            ('current_player_rep', 3),  # current_player_rep_size
+            ('players_passed_rep', 3),  # players_passed_rep_size
+            ('is_bidding_rep', 1),  # is_bidding_rep_size
+            ('bidding_rep', self.max_bidding_rep_index),  # bidding_rep_size
+            ('last_bid_rep', self.last_bid_rep_size),  # last_bid_rep_size
+            ('current_bid_rep', 30),  # current_bid_rep_size (21-50)
+            ('trump_suit_rep', 4),  # trump_suit_rep_size (C, D, H, S)
+            ('meld_shown_rep', 1),  # meld_shown_rep_size
+            ('player_melds_rep', 3),  # player_melds_rep (normalized meld scores)
+            ('tricks_won_rep', 3),  # tricks_won_rep
+            ('trick_points_rep', 3),  # trick_points_rep (normalized)
+        ]
+        self.rep_offsets = {}
+        offset = 0
+        for rep_name, rep_size in rep_sizes:
+            self.rep_offsets[rep_name] = offset
+            offset += rep_size
+        self.state_shape_size = offset
 
     def get_state_shape_size(self) -> int:
-        state_shape_size = 0
-        state_shape_size += 3 * 48  # hands_rep_size (3 players, 48 cards)
-        state_shape_size += 3 * 48  # trick_rep_size (3 players, 48 cards)
-        state_shape_size += 48  # hidden_cards_rep_size
-        state_shape_size += 3  # dealer_rep_size
-        state_shape_size += 3  # current_player_rep_size
-        state_shape_size += 3  # players_passed_rep_size
-        state_shape_size += 1  # is_bidding_rep_size
-        state_shape_size += self.max_bidding_rep_index  # bidding_rep_size
-        state_shape_size += self.last_bid_rep_size  # last_bid_rep_size
-        state_shape_size += 30  # current_bid_rep_size (21-50)
-        state_shape_size += 4  # trump_suit_rep_size (C, D, H, S)
-        state_shape_size += 1  # meld_shown_rep_size
-        state_shape_size += 3  # player_melds_rep (normalized meld scores)
-        state_shape_size += 3  # tricks_won_rep
-        state_shape_size += 3  # trick_points_rep (normalized)
-        return state_shape_size
+        return self.state_shape_size
 
-    def extract_state(self, game: CTPinochleGame):
+    def extract_state(self, game: CTPinochleGame, out: np.ndarray = None):
         ''' Extract useful information from state for RL.
 
         Args:
             game (CTPinochleGame): The game
+            out (numpy.array): Optional buffer the observation is written into, see encode_obs
 
         Returns:
             (numpy.array): The extracted state
@@ -204,114 +218,195 @@ class DefaultPinochleStateExtractor(PinochleStateExtractor):
         extracted_state = {}
         legal_actions: OrderedDict = self.get_legal_actions(game=game)
         raw_legal_actions = list(legal_actions.keys())
-        current_player = game.round.get_current_player()
-        current_player_id = current_player.player_id
 
-        # construct hands_rep of hands of players (3 players, 48 cards each)
-        hands_rep = [np.zeros(48, dtype=int) for _ in range(3)]
-        if not game.is_over():
-            for card in game.round.players[current_player_id].hand:
-                hands_rep[current_player_id][card.card_id] = 1
-
-        # construct trick_pile_rep (current trick being played)
-        trick_pile_rep = [np.zeros(48, dtype=int) for _ in range(3)]
-        if game.round.meld_shown and not game.is_over():
-            trick_moves = game.round.get_trick_moves()
-            for move in trick_moves:
-                player = move.player
-                card = move.card
-                trick_pile_rep[player.player_id][card.card_id] = 1
-
-        # construct hidden_card_rep (cards in other players' hands)
-        hidden_cards_rep = np.zeros(48, dtype=int)
-        if not game.is_over():
-            for player in game.round.players:
-                if player.player_id != current_player_id:
-                    for card in player.hand:
-                        hidden_cards_rep[card.card_id] = 1
+        obs = self.encode_obs(game=game, out=out)
+        extracted_state['obs'] = obs
+        extracted_state['legal_actions'] = legal_actions
+        extracted_state['legal_mask'] = game.judger.get_legal_action_mask()
+        extracted_state['raw_legal_actions'] = raw_legal_actions
+        extracted_state['raw_obs'] = obs
+        return extracted_state
 
-        # construct dealer_rep
-        dealer_rep = np.zeros(3, dtype=int)
-        dealer_rep[game.round.dealer_id] = 1
+    def encode_obs(self, game: CTPinochleGame, out: np.ndarray = None) -> np.ndarray:
+        ''' Write the observation of the current player into a flat buffer.
 
-        # construct current_player_rep
-        current_player_rep = np.zeros(3, dtype=int)
-        current_player_rep[current_player_id] = 1
+        Every rep is written in place at its offset in rep_offsets, so filling a
+        row of a preallocated (num_envs, state_shape_size) matrix allocates nothing.
 
-        # construct players_passed_rep
-        players_passed_rep = np.array(game.round.player_pass, dtype=int)
+        Args:
+            game (CTPinochleGame): The game
+            out (numpy.array): Buffer of shape (state_shape_size,). It is cleared
+                before writing. A new array of self.dtype is allocated if None.
 
-        # construct is_bidding_rep
-        is_bidding_rep = np.array([0] if game.round.is_bidding_over() else [1])
+        Returns:
+            (numpy.array): out, holding the observation
+        '''
+        if out is None:
+            out = np.zeros(self.state_shape_size, dtype=self.dtype)
+        else:
+            if out.shape != (self.state_shape_size,):
+                raise ValueError(f'encode_obs: out must have shape ({self.state_shape_size},), got {out.shape}')
+            out.fill(0)
+        offsets = self.rep_offsets
+        game_round = game.round
+        is_over = game.is_over()
+        current_player = game_round.get_current_player()
+        current_player_id = current_player.player_id
 
-        # construct bidding_rep
-        bidding_rep = np.zeros(self.max_bidding_rep_index, dtype=int)
+        # hands_rep of hands of players (3 players, 48 cards each), only the current player's is visible
+        # hidden_cards_rep (cards in other players' hands)
+        if not is_over:
+            hands_offset = offsets['hands_rep'] + 48 * current_player_id
+            hidden_cards_offset = offsets['hidden_cards_rep']
+            hidden_cards_mask = 0
+            for player in game_round.players:
+                if player.player_id != current_player_id:
+                    hidden_cards_mask |= player.hand_mask
+            out[hands_offset:hands_offset + 48] = hand_mask_to_array(current_player.hand_mask)
+            out[hidden_cards_offset:hidden_cards_offset + 48] = hand_mask_to_array(hidden_cards_mask)
+
+        # trick_pile_rep (current trick being played)
+        if game_round.meld_shown and not is_over:
+            trick_pile_offset = offsets['trick_pile_rep']
+            for move in game_round.get_trick_moves():
+                out[trick_pile_offset + 48 * move.player.player_id + move.card.card_id] = 1
+
+        # dealer_rep
+        out[offsets['dealer_rep'] + game_round.dealer_id] = 1
+
+        # current_player_rep
+        out[offsets['current_player_rep'] + current_player_id] = 1
+
+        # players_passed_rep
+        players_passed_offset = offsets['players_passed_rep']
+        for player_id, player_passed in enumerate(game_round.player_pass):
+            if player_passed:
+                out[players_passed_offset + player_id] = 1
+
+        # is_bidding_rep
+        is_bidding_over = game_round.is_bidding_over()
+        if not is_bidding_over:
+            out[offsets['is_bidding_rep']] = 1
+
+        # bidding_rep
+        bidding_offset = offsets['bidding_rep']
         bidding_rep_index = 0
-        for move in game.round.move_sheet:
+        for move in game_round.move_sheet:
             if bidding_rep_index >= self.max_bidding_rep_index:
                 break
             elif isinstance(move, PlayCardMove):
                 break
             elif isinstance(move, (MakeBidMove, MakePassBidMove)):
-                bidding_rep[bidding_rep_index] = move.action.action_id
+                out[bidding_offset + bidding_rep_index] = move.action.action_id
                 bidding_rep_index += 1
 
         # last_bid_rep (last bidding action)
-        last_bid_rep = np.zeros(self.last_bid_rep_size, dtype=int)
-        if not game.round.is_bidding_over():
-            last_move = game.round.move_sheet[-1]
+        if not is_bidding_over:
+            last_move = game_round.move_sheet[-1]
             if isinstance(last_move, (MakeBidMove, MakePassBidMove)):
-                last_bid_rep[last_move.action.action_id] = 1
+                out[offsets['last_bid_rep'] + last_move.action.action_id] = 1
 
         # current_bid_rep (21-50)
-        current_bid_rep = np.zeros(30, dtype=int)
-        if game.round.current_bid > 0:
-            bid_index = game.round.current_bid - 21
+        if game_round.current_bid > 0:
+            bid_index = game_round.current_bid - 21
             if 0 <= bid_index < 30:
-                current_bid_rep[bid_index] = 1
+                out[offsets['current_bid_rep'] + bid_index] = 1
 
         # trump_suit_rep
-        trump_suit_rep = np.zeros(4, dtype=int)
-        if game.round.trump_suit:
-            trump_suit_index = CTPinochleCard.suits.index(game.round.trump_suit)
-            trump_suit_rep[trump_suit_index] = 1
+        if game_round.trump_suit:
+            trump_suit_index = CTPinochleCard.suits.index(game_round.trump_suit)
+            out[offsets['trump_suit_rep'] + trump_suit_index] = 1
 
         # meld_shown_rep
-        meld_shown_rep = np.array([1] if game.round.meld_shown else [0])
+        if game_round.meld_shown:
+            out[offsets['meld_shown_rep']] = 1
 
         # player_melds_rep (normalized by dividing by 200)
-        player_melds_rep = np.array(game.round.player_meld_points, dtype=float) / 200.0
-
         # tricks_won_rep
-        tricks_won_rep = np.array(game.round.tricks_won, dtype=int)
-
         # trick_points_rep (normalized by dividing by 25)
-        trick_points_rep = np.array(game.round.trick_points, dtype=float) / 25.0
-
-        rep = []
-        rep += hands_rep
-        rep += trick_pile_rep
-        rep.append(hidden_cards_rep)
-        rep.append(dealer_rep)
-        rep.append(current_player_rep)
-        rep.append(players_passed_rep)
-        rep.append(is_bidding_rep)
-        rep.append(bidding_rep)
-        rep.append(last_bid_rep)
-        rep.append(current_bid_rep)
-        rep.append(trump_suit_rep)
-        rep.append(meld_shown_rep)
-        rep.append(player_melds_rep)
-        rep.append(tricks_won_rep)
-        rep.append(trick_points_rep)
-        # Add cards in current trick
-
-        obs = np.concatenate(rep)
-        extracted_state['obs'] = obs
-        extracted_state['legal_actions'] = legal_actions
-        extracted_state['raw_legal_actions'] = raw_legal_actions
-        extracted_state['raw_obs'] = obs
-        return extracted_state
+        player_melds_offset = offsets['player_melds_rep']
+        tricks_won_offset = offsets['tricks_won_rep']
+        trick_points_offset = offsets['trick_points_rep']
+        for player_id in range(3):
+            out[player_melds_offset + player_id] = game_round.player_meld_points[player_id] / 200.0
+            out[tricks_won_offset + player_id] = game_round.tricks_won[player_id]
+            out[trick_points_offset + player_id] = game_round.trick_points[player_id] / 25.0
+
+        return out
+
+    def encode_obs_batch(self, game: BatchedCTPinochleGame, out: np.ndarray = None) -> np.ndarray:
+        ''' Observations of the current players of every game of a BatchedCTPinochleGame.
+
+        Row i holds the same observation encode_obs writes for a CTPinochleGame in the state of game i.
+
+        Args:
+            game (BatchedCTPinochleGame): The batched game
+            out (numpy.array): Buffer of shape (num_games, state_shape_size). It is cleared
+                before writing. A new array of self.dtype is allocated if None.
+
+        Returns:
+            (numpy.array): out, holding one observation per row
+        '''
+        num_games = game.num_games
+        if out is None:
+            out = np.zeros((num_games, self.state_shape_size), dtype=self.dtype)
+        else:
+            if out.shape != (num_games, self.state_shape_size):
+                raise ValueError(f'encode_obs_batch: out must have shape ({num_games}, {self.state_shape_size}), got {out.shape}')
+            out.fill(0)
+        offsets = self.rep_offsets
+        rows = np.arange(num_games)
+        is_not_over = ~game.game_over
+        current_player_id = game.current_player_id
+
+        # hands_rep (only the current player's hand) and hidden_cards_rep
+        hands_offset = offsets['hands_rep']
+        hands_rep = out[:, hands_offset:hands_offset + 3 * 48].reshape(num_games, 3, 48)
+        current_hands = game.hands[rows, current_player_id] & is_not_over[:, np.newaxis]
+        hands_rep[rows, current_player_id] = current_hands
+        hidden_cards_offset = offsets['hidden_cards_rep']
+        out[:, hidden_cards_offset:hidden_cards_offset + 48] = game.hands.any(axis=1) & ~current_hands & is_not_over[:, np.newaxis]
+
+        # trick_pile_rep
+        trick_game_ids, trick_positions = np.nonzero((game.trick_card_ids >= 0) & (game.meld_shown & is_not_over)[:, np.newaxis])
+        trick_columns = offsets['trick_pile_rep'] + 48 * game.trick_player_ids[trick_game_ids, trick_positions] \
+            + game.trick_card_ids[trick_game_ids, trick_positions]
+        out[trick_game_ids, trick_columns] = 1
+
+        # dealer_rep, current_player_rep, players_passed_rep, is_bidding_rep
+        out[rows, offsets['dealer_rep'] + game.dealer_id] = 1
+        out[rows, offsets['current_player_rep'] + current_player_id] = 1
+        players_passed_offset = offsets['players_passed_rep']
+        out[:, players_passed_offset:players_passed_offset + 3] = game.player_pass
+        is_bidding = ~game.is_bidding_over()
+        out[:, offsets['is_bidding_rep']] = is_bidding
+
+        # bidding_rep
+        bidding_offset = offsets['bidding_rep']
+        out[:, bidding_offset:bidding_offset + self.max_bidding_rep_index] = game.bid_action_ids[:, :self.max_bidding_rep_index]
+
+        # last_bid_rep
+        last_bid_game_ids = np.flatnonzero(is_bidding & (game.last_bid_action_id >= 0))
+        out[last_bid_game_ids, offsets['last_bid_rep'] + game.last_bid_action_id[last_bid_game_ids]] = 1
+
+        # current_bid_rep (21-50)
+        current_bid_game_ids = np.flatnonzero((game.current_bid >= 21) & (game.current_bid <= 50))
+        out[current_bid_game_ids, offsets['current_bid_rep'] + game.current_bid[current_bid_game_ids] - 21] = 1
+
+        # trump_suit_rep, meld_shown_rep
+        trump_game_ids = np.flatnonzero(game.trump_suit_index >= 0)
+        out[trump_game_ids, offsets['trump_suit_rep'] + game.trump_suit_index[trump_game_ids]] = 1
+        out[:, offsets['meld_shown_rep']] = game.meld_shown
+
+        # player_melds_rep, tricks_won_rep, trick_points_rep
+        player_melds_offset = offsets['player_melds_rep']
+        tricks_won_offset = offsets['tricks_won_rep']
+        trick_points_offset = offsets['trick_points_rep']
+        out[:, player_melds_offset:player_melds_offset + 3] = game.player_meld_points / 200.0
+        out[:, tricks_won_offset:tricks_won_offset + 3] = game.tricks_won
+        out[:, trick_points_offset:trick_points_offset + 3] = game.trick_points / 25.0
+
+        return out
 
     def reset(self):
         ''' Start a new game
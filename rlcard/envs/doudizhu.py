@@ -1,7 +1,9 @@
-from collections import Counter, OrderedDict
+from collections import Counter
 import numpy as np
 
 from rlcard.envs import Env
+from rlcard.envs.lazy_state import LazyState, LazyFeatureDict
+from rlcard.utils.utils import get_legal_mask
 
 
 class DoudizhuEnv(Env):
@@ -84,9 +86,10 @@ class DoudizhuEnv(Env):
                                   landlord_num_cards_left,
                                   teammate_num_cards_left))
 
-        extracted_state = OrderedDict({'obs': obs, 'legal_actions': self._get_legal_actions()})
+        legal_actions = self._get_legal_actions()
+        extracted_state = LazyState({'obs': obs, 'legal_actions': legal_actions, 'legal_mask': get_legal_mask(legal_actions, self.num_actions)})
         extracted_state['raw_obs'] = state
-        extracted_state['raw_legal_actions'] = [a for a in state['actions']]
+        extracted_state.set_lazy('raw_legal_actions', list, state['actions'])
         extracted_state['action_record'] = self.action_recorder
         return extracted_state
             
@@ -113,11 +116,10 @@ class DoudizhuEnv(Env):
         ''' Get all legal actions for current state
 
         Returns:
-            legal_actions (list): a list of legal actions' id
+            legal_actions (LazyFeatureDict): legal actions' id -> action feature, computed on first access
         '''
         legal_actions = self.game.state['actions']
-        legal_actions = {self._ACTION_2_ID[action]: _cards2array(action) for action in legal_actions}
-        return legal_actions
+        return LazyFeatureDict([self._ACTION_2_ID[action] for action in legal_actions], legal_actions, _cards2array)
 
     def get_perfect_information(self):
         ''' Get the perfect information of the current state
@@ -1,4 +1,5 @@
 from rlcard.utils import *
+from rlcard.utils.profiling import Profiler
 
 class Env(object):
     '''
@@ -12,9 +13,12 @@ class Env(object):
         Args:
             config (dict): A config dictionary. All the fields are
                 optional. Currently, the dictionary includes:
-                'seed' (int) - A environment local random seed.
+                'seed' (int) - A environment local random seed. It can
+                 also be a numpy.random.SeedSequence, see seed.
                 'allow_step_back' (boolean) - True if allowing
                  step_back.
+                'profile' (boolean) - True to time the phases of the
+                 game loop, see enable_profiling.
                 There can be some game specific configurations, e.g., the
                 number of players in the game. These fields should start with
                 'game_', e.g., 'game_num_players' which specify the number of
@@ -48,6 +52,10 @@ class Env(object):
         # Set random seed, default is None
         self.seed(config['seed'])
 
+        self.profiler = None
+        if config.get('profile', False):
+            self.enable_profiling()
+
 
     def reset(self):
         ''' Start a new game
@@ -58,6 +66,11 @@ class Env(object):
                 (numpy.array): The begining state of the game
                 (int): The begining player
         '''
+        if self.seed_sequence is not None:
+            # Every game gets its own stream, derived from the episode counter
+            episode_seed = seeding.child_seed_sequence(self.seed_sequence, self.episode_id)
+            self.np_random.set_state(np.random.PCG64(episode_seed).state)
+            self.episode_id += 1
         state, player_id = self.game.init_game()
         self.action_recorder = []
         return self._extract_state(state), player_id
@@ -107,6 +120,37 @@ class Env(object):
 
         return state, player_id
 
+    def clone_state(self):
+        ''' Take a snapshot of the current game to branch from. Unlike step_back,
+            it does not need allow_step_back and can be restored many times.
+
+        Returns:
+            (tuple): The snapshot, to be passed to restore_state
+        '''
+        return self.game.clone_state(), self.timestep, tuple(self.action_recorder)
+
+    def restore_state(self, snapshot):
+        ''' Return to the game state of a snapshot from clone_state. Replaying the
+            same actions after a restore gives the same states, including the random ones.
+
+        Args:
+            snapshot (tuple): A snapshot from clone_state of this environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (dict): The state of the snapshot
+                (int): The ID of the current player
+        '''
+        game_snapshot, self.timestep, action_recorder = snapshot
+        self.game.restore_state(game_snapshot)
+        self.action_recorder = list(action_recorder)
+
+        player_id = self.get_player_id()
+        state = self.get_state(player_id)
+
+        return state, player_id
+
     def set_agents(self, agents):
         '''
         Set the agents that will interact with the environment.
@@ -116,23 +160,91 @@ class Env(object):
             agents (list): List of Agent classes
         '''
         self.agents = agents
+        if self.profiler is not None:
+            self._original_agents = agents
+            self.agents = self.profiler.profile_agents(agents)
+
+    def enable_profiling(self):
+        ''' Time the phases of the game loop separately: game.init_game, game.step,
+            game.get_legal_actions and the legal action methods of the judger,
+            env.extract_state (which includes the legal actions of most environments),
+            env.get_legal_actions, env.decode_action, and the step and eval_step of
+            the agents run by run. Read them with perf_stats.
+
+            The methods of this environment and its game are shadowed by timed wrappers
+            on the instances, and self.agents holds timed wrappers of the agents. Nothing
+            is changed while profiling is off, so it costs nothing then. Deep copies and
+            pickles of the environment or its game time themselves, into their own stats.
+        '''
+        if self.profiler is not None:
+            return
+        self.profiler = Profiler()
+        for method_name, phase in [('init_game', 'game.init_game'),
+                                   ('step', 'game.step'),
+                                   ('get_legal_actions', 'game.get_legal_actions')]:
+            self.profiler.instrument(self.game, method_name, phase)
+        # Judgers that live as long as the game, the others have no legal action methods
+        for judger in [getattr(self.game, 'judger', None), getattr(self.game, 'judge', None)]:
+            if judger is not None:
+                for method_name in ['get_legal_actions', 'get_legal_action_ids', 'get_legal_action_mask']:
+                    self.profiler.instrument(judger, method_name, 'judger.' + method_name)
+        for method_name, phase in [('_extract_state', 'env.extract_state'),
+                                   ('_get_legal_actions', 'env.get_legal_actions'),
+                                   ('_decode_action', 'env.decode_action')]:
+            self.profiler.instrument(self, method_name, phase)
+        if hasattr(self, 'agents'):
+            self.set_agents(self.agents)
+
+    def disable_profiling(self):
+        ''' Stop timing and restore the original methods and agents. The stats are dropped
+        '''
+        if self.profiler is None:
+            return
+        self.profiler.uninstrument()
+        if hasattr(self, '_original_agents'):
+            self.agents = self._original_agents
+            del self._original_agents
+        self.profiler = None
 
-    def run(self, is_training=False):
+    def perf_stats(self, reset=False):
+        ''' Timing stats of the phases, see enable_profiling
+
+        Args:
+            reset (boolean): True to start counting again after reading the stats
+
+        Returns:
+            (dict): For every phase that ran, a dict with its count, total_s, and the
+                mean_us, p50_us, p90_us, p99_us and max_us durations in microseconds.
+                Empty if profiling is off
+        '''
+        if self.profiler is None:
+            return {}
+        stats = self.profiler.get_stats()
+        if reset:
+            self.profiler.reset()
+        return stats
+
+    def run(self, is_training=False, recorder=None):
         '''
         Run a complete game, either for evaluation or training RL agent.
 
         Args:
             is_training (boolean): True if for training purpose.
+            recorder (TrajectoryRecorder): If given, it is reset and the game is recorded into
+                its columns instead of building the trajectory lists.
 
         Returns:
             (tuple) Tuple containing:
 
-                (list): A list of trajectories generated from the environment.
+                (list): A list of trajectories generated from the environment, or the recorder if given.
                 (list): A list payoffs. Each entry corresponds to one player.
 
         Note: The trajectories are 3-dimension list. The first dimension is for different players.
               The second dimension is for different transitions. The third dimension is for the contents of each transiton
         '''
+        if recorder is not None:
+            return self._run_recorded(recorder, is_training)
+
         trajectories = [[] for _ in range(self.num_players)]
         state, player_id = self.reset()
 
@@ -168,6 +280,40 @@ class Env(object):
 
         return trajectories, payoffs
 
+    def _run_recorded(self, recorder, is_training):
+        ''' Run a complete game like run, recording it into a TrajectoryRecorder
+        '''
+        recorder.reset()
+        state, player_id = self.reset()
+        recorder.record_state(player_id, state)
+        while not self.is_over():
+            if not is_training:
+                action, _ = self.agents[player_id].eval_step(state)
+            else:
+                action = self.agents[player_id].step(state)
+
+            # Raw actions are recorded by their id, raw_legal_actions and legal_actions are in the same order
+            if self.agents[player_id].use_raw:
+                action_id = list(state['legal_actions'])[state['raw_legal_actions'].index(action)]
+            else:
+                action_id = action
+            recorder.record_action(player_id, action_id)
+            next_state, next_player_id = self.step(action, self.agents[player_id].use_raw)
+
+            state = next_state
+            player_id = next_player_id
+            if not self.game.is_over():
+                recorder.record_state(player_id, state)
+
+        # Add a final state to all the players
+        for player_id in range(self.num_players):
+            recorder.record_state(player_id, self.get_state(player_id))
+
+        payoffs = self.get_payoffs()
+        recorder.set_payoffs(payoffs)
+
+        return recorder, payoffs
+
     def is_over(self):
         ''' Check whether the curent game is over
 
@@ -226,7 +372,25 @@ class Env(object):
         return feature
 
     def seed(self, seed=None):
-        self.np_random, seed = seeding.np_random(seed)
+        ''' Seed the random generator of the game
+
+        Args:
+            seed (int or numpy.random.SeedSequence): An int (or None for a random seed)
+                seeds one stream that the games share one after the other. A SeedSequence,
+                e.g. from seeding.seed_sequence(run_seed, worker_id, env_id), gives the
+                n-th game after seeding the stream of its n-th child, so a game only
+                depends on the sequence and its episode number.
+
+        Returns:
+            (int or numpy.random.SeedSequence): The seed
+        '''
+        if isinstance(seed, np.random.SeedSequence):
+            self.seed_sequence = seed
+            self.episode_id = 0
+            self.np_random = seeding.np_random_from_seed_sequence(seed)
+        else:
+            self.seed_sequence = None
+            self.np_random, seed = seeding.np_random(seed)
         self.game.np_random = self.np_random
         return seed
 
@@ -7,6 +7,7 @@ import numpy as np
 from collections import OrderedDict
 
 from rlcard.envs import Env
+from rlcard.utils.utils import get_legal_mask
 
 class GinRummyEnv(Env):
     ''' GinRummy Environment
@@ -40,8 +41,9 @@ class GinRummyEnv(Env):
         '''
         if self.game.is_over():
             obs = np.array([self._utils.encode_cards([]) for _ in range(5)])
-            extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
-            extracted_state['raw_legal_actions'] = list(self._get_legal_actions().keys())
+            legal_actions = self._get_legal_actions()
+            extracted_state = {'obs': obs, 'legal_actions': legal_actions, 'legal_mask': get_legal_mask(legal_actions, self.num_actions)}
+            extracted_state['raw_legal_actions'] = list(legal_actions.keys())
             extracted_state['raw_obs'] = obs
         else:
             discard_pile = self.game.round.dealer.discard_pile
@@ -59,7 +61,9 @@ class GinRummyEnv(Env):
             unknown_cards_rep = self._utils.encode_cards(unknown_cards)
             rep = [hand_rep, top_discard_rep, dead_cards_rep, known_cards_rep, unknown_cards_rep]
             obs = np.array(rep)
-            extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions(), 'raw_legal_actions': list(self._get_legal_actions().keys())}
+            legal_actions = self._get_legal_actions()
+            extracted_state = {'obs': obs, 'legal_actions': legal_actions, 'raw_legal_actions': list(legal_actions.keys())}
+            extracted_state['legal_mask'] = get_legal_mask(legal_actions, self.num_actions)
             extracted_state['raw_obs'] = obs
         return extracted_state
 
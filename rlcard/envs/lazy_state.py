@@ -0,0 +1,119 @@
+from collections.abc import Mapping, MutableMapping
+
+class _LazyValue(object):
+    ''' A value that is computed by calling function(*args) on first access
+    '''
+    __slots__ = ('function', 'args')
+
+    def __init__(self, function, args):
+        self.function = function
+        self.args = args
+
+class LazyState(MutableMapping):
+    '''
+    Extracted state whose expensive fields are computed on first access and
+    then cached. It behaves like the dict returned by Env._extract_state:
+    keys, iteration order and values are the same.
+
+    The arguments of a lazy field must be captured when the state is
+    extracted, not read from the game later, since the game keeps moving.
+    Lazy fields are computed before the state is pickled or copied.
+    '''
+    def __init__(self, values=None):
+        ''' Initialize the state
+
+        Args:
+            values (dict): The fields that are already computed
+        '''
+        self._data = {} if values is None else dict(values)
+
+    def set_lazy(self, key, function, *args):
+        ''' Add a field computed as function(*args) on first access
+
+        Args:
+            key (string): The name of the field
+            function (callable): Computes the value of the field
+            args: The arguments of function
+        '''
+        self._data[key] = _LazyValue(function, args)
+
+    def is_computed(self, key):
+        ''' Check whether the value of a field exists already
+
+        Args:
+            key (string): The name of the field
+
+        Returns:
+            (boolean): False if the field is lazy and was never accessed
+        '''
+        return not isinstance(self._data[key], _LazyValue)
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, _LazyValue):
+            value = value.function(*value.args)
+            self._data[key] = value
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __getstate__(self):
+        return {'_data': {key: self[key] for key in self._data}}
+
+    def __setstate__(self, state):
+        self._data = state['_data']
+
+    def copy(self):
+        return LazyState(dict(self.items()))
+
+    def __repr__(self):
+        return 'LazyState({})'.format(', '.join(
+            '{}={}'.format(key, repr(value) if self.is_computed(key) else '<lazy>') for key, value in self._data.items()))
+
+class LazyFeatureDict(Mapping):
+    '''
+    Read-only mapping from legal action ids to action features, like the
+    legal_actions OrderedDict of DouDizhu. The ids are known up front, each
+    feature is computed by feature_function on first access and cached.
+    '''
+    def __init__(self, action_ids, feature_args, feature_function):
+        ''' Initialize the mapping
+
+        Args:
+            action_ids (list): The legal action ids, in order
+            feature_args (list): For each action id, the argument of feature_function
+            feature_function (callable): Computes the feature of an action from its argument
+        '''
+        self._feature_args = dict(zip(action_ids, feature_args))
+        self._features = {}
+        self._feature_function = feature_function
+
+    def __getitem__(self, action_id):
+        if action_id not in self._features:
+            self._features[action_id] = self._feature_function(self._feature_args[action_id])
+        return self._features[action_id]
+
+    def __iter__(self):
+        return iter(self._feature_args)
+
+    def __len__(self):
+        return len(self._feature_args)
+
+    def __contains__(self, action_id):
+        return action_id in self._feature_args
+
+    def __repr__(self):
+        return 'LazyFeatureDict({})'.format(list(self._feature_args))
@@ -53,6 +53,7 @@ class LeducholdemEnv(Env):
 
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
+        extracted_state['legal_mask'] = get_legal_mask(legal_actions, self.num_actions)
 
         public_card = state['public_card']
         hand = state['hand']
@@ -5,6 +5,7 @@ from collections import OrderedDict
 
 import rlcard
 from rlcard.envs import Env
+from rlcard.utils.utils import get_legal_mask
 from rlcard.games.limitholdem import Game
 
 DEFAULT_GAME_CONFIG = {
@@ -52,6 +53,7 @@ class LimitholdemEnv(Env):
 
         legal_actions = OrderedDict({self.actions.index(a): None for a in state['legal_actions']})
         extracted_state['legal_actions'] = legal_actions
+        extracted_state['legal_mask'] = get_legal_mask(legal_actions, self.num_actions)
 
         public_cards = state['public_cards']
         hand = state['hand']
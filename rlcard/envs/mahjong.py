@@ -2,6 +2,7 @@ import numpy as np
 from collections import OrderedDict
 
 from rlcard.envs import Env
+from rlcard.utils.utils import get_legal_mask
 from rlcard.games.mahjong import Game
 from rlcard.games.mahjong import Card
 from rlcard.games.mahjong.utils import card_encoding_dict, encode_cards, pile2list
@@ -43,7 +44,8 @@ class MahjongEnv(Env):
         rep.extend(piles_rep)
         obs = np.array(rep)
 
-        extracted_state = {'obs': obs, 'legal_actions': self._get_legal_actions()}
+        legal_actions = self._get_legal_actions()
+        extracted_state = {'obs': obs, 'legal_actions': legal_actions, 'legal_mask': get_legal_mask(legal_actions, self.num_actions)}
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in state['action_cards']]
         extracted_state['action_record'] = self.action_recorder
@@ -1,5 +1,9 @@
 import importlib
 
+from rlcard.envs.vec_env import VectorEnv
+from rlcard.envs.subproc_vec_env import SubprocVectorEnv
+from rlcard.utils import seeding
+
 # Default Config
 DEFAULT_CONFIG = {
         'allow_step_back': False,
@@ -18,8 +22,19 @@ class EnvSpec(object):
             entry_point (string): A string the indicates the location of the envronment class
         '''
         self.env_id = env_id
-        mod_name, class_name = entry_point.split(':')
-        self._entry_point = getattr(importlib.import_module(mod_name), class_name)
+        self._mod_name, self._class_name = entry_point.split(':')
+        # The module is imported on the first make, so importing rlcard does not import every game
+        self._entry_point = None
+
+    def load(self):
+        ''' Import the environment class, only once
+
+        Returns:
+            (class): The environment class
+        '''
+        if self._entry_point is None:
+            self._entry_point = getattr(importlib.import_module(self._mod_name), self._class_name)
+        return self._entry_point
 
     def make(self, config=DEFAULT_CONFIG):
         ''' Instantiates an instance of the environment
@@ -28,7 +43,7 @@ class EnvSpec(object):
             env (Env): An instance of the environemnt
             config (dict): A dictionary of the environment settings
         '''
-        env = self._entry_point(config)
+        env = self.load()(config)
         return env
 
 class EnvRegistry(object):
@@ -87,3 +102,27 @@ def make(env_id, config={}):
         _config[key] = config[key]
 
     return registry.make(env_id, _config)
+
+def make_vec(env_id, num_envs, config={}, num_workers=0):
+    ''' Create a vectorized environment with num_envs instances of the same environment
+
+    Args:
+        env_id (string): The name of the environment
+        num_envs (int): The number of environments
+        config (dict): A dictionary of the environment settings. If 'seed' is set,
+            environment i is seeded with the i-th child of its SeedSequence, see seeding.spawn_env_seeds
+        num_workers (int): If 0, the environments are stepped in this process (VectorEnv).
+            Otherwise they are split across num_workers processes (SubprocVectorEnv)
+    '''
+    if num_envs < 1:
+        raise ValueError('num_envs must be at least 1, got {}'.format(num_envs))
+    configs = []
+    env_seeds = seeding.spawn_env_seeds(config.get('seed'), 0, num_envs)
+    for env_seed in env_seeds:
+        env_config = DEFAULT_CONFIG.copy()
+        env_config.update(config)
+        env_config['seed'] = env_seed
+        configs.append(env_config)
+    if num_workers > 0:
+        return SubprocVectorEnv(env_id, configs, num_workers)
+    return VectorEnv([registry.make(env_id, env_config) for env_config in configs])
@@ -0,0 +1,196 @@
+import multiprocessing
+import traceback
+
+import numpy as np
+
+from rlcard.envs.vec_env import VectorEnv, get_obs_buffer_shape
+from rlcard.utils import seeding
+
+def _shared_array(context, shape, dtype):
+    ''' Allocate a zeroed array in shared memory that child processes inherit
+    '''
+    dtype = np.dtype(dtype)
+    raw = context.RawArray('b', max(1, int(np.prod(shape)) * dtype.itemsize))
+    return raw, _as_array(raw, shape, dtype)
+
+def _as_array(raw, shape, dtype):
+    dtype = np.dtype(dtype)
+    return np.frombuffer(raw, dtype=dtype, count=int(np.prod(shape))).reshape(shape)
+
+def _worker(remote, parent_remote, env_id, configs, env_slice, shared_buffers):
+    ''' Worker loop. The worker owns the environments of env_slice and writes
+    their states directly into its rows of the shared buffers.
+    '''
+    from rlcard.envs.registration import make
+
+    parent_remote.close()
+    buffers = {name: _as_array(raw, shape, dtype)[env_slice] for name, (raw, shape, dtype) in shared_buffers.items()}
+    vec_env = VectorEnv([make(env_id, config) for config in configs])
+    # VectorEnv writes states in place, so its arrays can be the shared rows
+    vec_env.obs = buffers['obs']
+    vec_env.legal_action_mask = buffers['legal_action_mask']
+    vec_env.player_ids = buffers['player_ids']
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == 'reset':
+                vec_env.reset()
+            elif command == 'step':
+                _, _, _, dones, payoffs = vec_env.step(buffers['actions'])
+                buffers['dones'][:] = dones
+                buffers['payoffs'][:] = payoffs
+            elif command == 'seed':
+                for env, env_seed in zip(vec_env.envs, data):
+                    env.seed(env_seed)
+            elif command == 'close':
+                remote.send(None)
+                break
+            else:
+                raise ValueError('Unknown command: {}'.format(command))
+            remote.send(None)
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        remote.send(traceback.format_exc())
+    finally:
+        remote.close()
+
+class SubprocVectorEnv(object):
+    '''
+    Vectorized environment whose games are split across worker processes.
+    Observations, legal action masks, player ids, done flags, payoffs and
+    actions live in shared memory, only short commands cross the pipes.
+    It has the same interface as VectorEnv, except that get_states is not
+    available since the state dicts stay in the workers.
+
+    The returned arrays are reused between calls, copy them to keep them.
+    '''
+    def __init__(self, env_id, configs, num_workers, start_method=None):
+        ''' Initialize the workers
+
+        Args:
+            env_id (string): The name of the environment
+            configs (list): One full environment config per environment
+            num_workers (int): The number of worker processes, at most len(configs)
+            start_method (string): The multiprocessing start method, default of the platform if None
+        '''
+        from rlcard.envs.registration import make
+
+        self.num_envs = len(configs)
+        if self.num_envs == 0:
+            raise ValueError('SubprocVectorEnv needs at least one environment')
+        if num_workers < 1:
+            raise ValueError('num_workers must be at least 1, got {}'.format(num_workers))
+        num_workers = min(num_workers, self.num_envs)
+
+        # Probe one environment for the shapes of the shared buffers. The observation
+        # buffer fits every player, see VectorEnv
+        env = make(env_id, configs[0])
+        self.num_players = env.num_players
+        self.num_actions = env.num_actions
+        self.state_shape = env.state_shape
+        self.action_shape = env.action_shape
+        state, _ = env.reset()
+        obs = np.asarray(state['obs'])
+
+        context = multiprocessing.get_context(start_method)
+        buffer_specs = {
+            'obs': ((self.num_envs,) + get_obs_buffer_shape(self.state_shape, obs.shape), obs.dtype),
+            'legal_action_mask': ((self.num_envs, self.num_actions), np.bool_),
+            'player_ids': ((self.num_envs,), np.int64),
+            'dones': ((self.num_envs,), np.bool_),
+            'payoffs': ((self.num_envs, self.num_players), np.float64),
+            'actions': ((self.num_envs,), np.int64),
+        }
+        # Only the workers play, do not keep the probed game alive in this process
+        del env, state, obs
+        shared_buffers = {}
+        for name, (shape, dtype) in buffer_specs.items():
+            raw, array = _shared_array(context, shape, dtype)
+            shared_buffers[name] = (raw, shape, np.dtype(dtype))
+            setattr(self, name, array)
+
+        # Contiguous slices of environments, one per worker
+        bounds = np.linspace(0, self.num_envs, num_workers + 1).astype(int)
+        self.env_slices = [slice(bounds[worker_index], bounds[worker_index + 1]) for worker_index in range(num_workers)]
+        self.remotes = []
+        self.processes = []
+        for env_slice in self.env_slices:
+            remote, worker_remote = context.Pipe()
+            process = context.Process(
+                target=_worker,
+                args=(worker_remote, remote, env_id, configs[env_slice], env_slice, shared_buffers),
+                daemon=True,
+            )
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+
+    def reset(self):
+        ''' Start a new game in every environment, see VectorEnv.reset
+        '''
+        self._run('reset')
+        return self.obs, self.legal_action_mask, self.player_ids
+
+    def step(self, actions):
+        ''' Take one action id in every environment, see VectorEnv.step
+
+        Args:
+            actions (list): One action id per environment
+
+        Returns:
+            (tuple): obs, legal_action_mask, player_ids, dones and payoffs as in VectorEnv.step
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('SubprocVectorEnv.step: expected {} actions, got {}'.format(self.num_envs, len(actions)))
+        self.actions[:] = actions
+        self._run('step')
+        return self.obs, self.legal_action_mask, self.player_ids, self.dones, self.payoffs
+
+    def seed(self, seed=None):
+        ''' Seed every environment, see VectorEnv.seed
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The base seed, or None for random seeds
+        '''
+        if self.closed:
+            raise Exception('SubprocVectorEnv is closed')
+        for remote, env_slice in zip(self.remotes, self.env_slices):
+            remote.send(('seed', seeding.spawn_env_seeds(seed, env_slice.start, env_slice.stop)))
+        self._wait()
+
+    def close(self):
+        ''' Stop the worker processes
+        '''
+        if self.closed:
+            return
+        for remote in self.remotes:
+            try:
+                remote.send(('close', None))
+                remote.recv()
+            except (OSError, EOFError):
+                # The worker already exited after an error
+                pass
+        for process in self.processes:
+            process.join()
+        self.closed = True
+
+    def __del__(self):
+        if not getattr(self, 'closed', True):
+            self.close()
+
+    def _run(self, command, data=None):
+        if self.closed:
+            raise Exception('SubprocVectorEnv is closed')
+        for remote in self.remotes:
+            remote.send((command, data))
+        self._wait()
+
+    def _wait(self):
+        errors = [remote.recv() for remote in self.remotes]
+        errors = [error for error in errors if error is not None]
+        if errors:
+            self.close()
+            raise Exception('SubprocVectorEnv worker failed:\n{}'.format(errors[0]))
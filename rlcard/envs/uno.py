@@ -2,6 +2,7 @@ import numpy as np
 from collections import OrderedDict
 
 from rlcard.envs import Env
+from rlcard.utils.utils import get_legal_mask
 from rlcard.games.uno import Game
 from rlcard.games.uno.utils import encode_hand, encode_target
 from rlcard.games.uno.utils import ACTION_SPACE, ACTION_LIST
@@ -26,7 +27,7 @@ class UnoEnv(Env):
         encode_hand(obs[:3], state['hand'])
         encode_target(obs[3], state['target'])
         legal_action_id = self._get_legal_actions()
-        extracted_state = {'obs': obs, 'legal_actions': legal_action_id}
+        extracted_state = {'obs': obs, 'legal_actions': legal_action_id, 'legal_mask': get_legal_mask(legal_action_id, self.num_actions)}
         extracted_state['raw_obs'] = state
         extracted_state['raw_legal_actions'] = [a for a in state['legal_actions']]
         extracted_state['action_record'] = self.action_recorder
@@ -0,0 +1,152 @@
+import numpy as np
+
+from rlcard.utils import seeding
+
+def has_ragged_obs(state_shape):
+    ''' Check whether the players of a game observe states of different shapes, like in doudizhu
+
+    Args:
+        state_shape (list): The state shape of every player
+
+    Returns:
+        (boolean): True if the shapes differ
+    '''
+    return len(set(tuple(shape) for shape in state_shape)) > 1
+
+def get_obs_buffer_shape(state_shape, obs_shape):
+    ''' Get the shape of one row of a buffer holding the observations of any player
+
+    Args:
+        state_shape (list): The state shape of every player
+        obs_shape (tuple): The shape of one observation
+
+    Returns:
+        (tuple): obs_shape, or the flat size of the largest state shape if the shapes differ
+    '''
+    if has_ragged_obs(state_shape):
+        return (max(int(np.prod(shape)) for shape in state_shape),)
+    return tuple(obs_shape)
+
+class VectorEnv(object):
+    '''
+    Steps several environments of the same game in lockstep inside the current
+    process. Finished games are reset automatically, so every call to step
+    returns one current state per environment and agents can batch their
+    inference across environments.
+
+    If the players observe states of different shapes, like in doudizhu, the
+    observations are flattened and zero padded to the largest state shape.
+    Environments with an obs_buffer attribute, like ctpinochle, encode their
+    observations directly into their row of the observation matrix, so the obs
+    of the states of get_states are views of that row.
+
+    The returned arrays are reused between calls, copy them to keep them.
+    '''
+    def __init__(self, envs):
+        ''' Initialize the vectorized environment
+
+        Args:
+            envs (list): List of Env instances of the same game
+        '''
+        if len(envs) == 0:
+            raise ValueError('VectorEnv needs at least one environment')
+        self.envs = envs
+        self.num_envs = len(envs)
+        self.num_players = envs[0].num_players
+        self.num_actions = envs[0].num_actions
+        self.state_shape = envs[0].state_shape
+        self.action_shape = envs[0].action_shape
+        self.pad_obs = has_ragged_obs(self.state_shape)
+
+        # The extracted state dict of the current player of each environment
+        self.states = [None for _ in range(self.num_envs)]
+        self.player_ids = np.zeros(self.num_envs, dtype=np.int64)
+        self.legal_action_mask = np.zeros((self.num_envs, self.num_actions), dtype=bool)
+        # Allocated on the first reset, once the observation shape and dtype are known
+        self.obs = None
+
+    def reset(self):
+        ''' Start a new game in every environment
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): Observations of the current players, shape (num_envs, ...)
+                (numpy.array): Legal action masks, bool array of shape (num_envs, num_actions)
+                (numpy.array): Current player ids, shape (num_envs,)
+        '''
+        for env_index, env in enumerate(self.envs):
+            state, player_id = env.reset()
+            self._set_state(env_index, state, player_id)
+        return self.obs, self.legal_action_mask, self.player_ids
+
+    def step(self, actions, raw_action=False):
+        ''' Take one action in every environment. Environments whose game ends
+        are reset, and the returned state of that environment is the first state
+        of the new game.
+
+        Args:
+            actions (list): One action per environment, taken by its current player
+            raw_action (boolean): True if the actions are raw actions
+
+        Returns:
+            (tuple): Tuple containing:
+
+                (numpy.array): Observations of the current players, shape (num_envs, ...)
+                (numpy.array): Legal action masks, bool array of shape (num_envs, num_actions)
+                (numpy.array): Current player ids, shape (num_envs,)
+                (numpy.array): Bool array of shape (num_envs,), True where the game ended in this step
+                (numpy.array): Payoffs of the ended games, shape (num_envs, num_players).
+                    Rows of games that did not end are zero
+        '''
+        if len(actions) != self.num_envs:
+            raise ValueError('VectorEnv.step: expected {} actions, got {}'.format(self.num_envs, len(actions)))
+        dones = np.zeros(self.num_envs, dtype=bool)
+        payoffs = np.zeros((self.num_envs, self.num_players))
+        for env_index, env in enumerate(self.envs):
+            action = actions[env_index]
+            if not raw_action:
+                action = int(action)
+            state, player_id = env.step(action, raw_action)
+            if env.is_over():
+                dones[env_index] = True
+                payoffs[env_index] = env.get_payoffs()
+                state, player_id = env.reset()
+            self._set_state(env_index, state, player_id)
+        return self.obs, self.legal_action_mask, self.player_ids, dones, payoffs
+
+    def get_states(self):
+        ''' Get the extracted state dicts of the current players, for agents working on single states
+
+        Returns:
+            (list): One extracted state per environment
+        '''
+        return self.states
+
+    def seed(self, seed=None):
+        ''' Seed every environment, environment i gets the i-th child of the SeedSequence of seed
+
+        Args:
+            seed (int or numpy.random.SeedSequence): The base seed, or None for random seeds
+        '''
+        for env, env_seed in zip(self.envs, seeding.spawn_env_seeds(seed, 0, self.num_envs)):
+            env.seed(env_seed)
+
+    def _set_state(self, env_index, state, player_id):
+        obs = np.asarray(state['obs'])
+        if self.obs is None:
+            self.obs = np.zeros((self.num_envs,) + get_obs_buffer_shape(self.state_shape, obs.shape), dtype=obs.dtype)
+            if not self.pad_obs:
+                for index, env in enumerate(self.envs):
+                    if hasattr(env, 'obs_buffer'):
+                        env.obs_buffer = self.obs[index]
+        # Environments with an obs_buffer wrote into their row already. Copy the others,
+        # some environments reuse their observation buffer between steps
+        if self.pad_obs:
+            self.obs[env_index, :obs.size] = obs.ravel()
+            self.obs[env_index, obs.size:] = 0
+        elif obs is not getattr(self.envs[env_index], 'obs_buffer', None):
+            self.obs[env_index] = obs
+        self.legal_action_mask[env_index] = state['legal_mask']
+        self.player_ids[env_index] = player_id
+        self.states[env_index] = state
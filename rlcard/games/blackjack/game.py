@@ -4,6 +4,7 @@ import numpy as np
 from rlcard.games.blackjack import Dealer
 from rlcard.games.blackjack import Player
 from rlcard.games.blackjack import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 class BlackjackGame:
 
@@ -134,6 +135,23 @@ class BlackjackGame:
             return True
         return False
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        return take_snapshot([self, self.dealer] + self.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_num_players(self):
         ''' Return the number of players in blackjack
 
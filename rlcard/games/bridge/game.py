@@ -8,6 +8,8 @@ from typing import List
 
 import numpy as np
 
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+
 from .judger import BridgeJudger
 from .round import BridgeRound
 from .utils.action_event import ActionEvent, CallActionEvent, PlayCardAction
@@ -54,6 +56,23 @@ class BridgeGame:
         next_state = self.get_state(player_id=next_player_id)
         return next_state, next_player_id
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        return take_snapshot([self, self.round, self.round.dealer] + self.round.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_num_players(self) -> int:
         ''' Return the number of players in the game
         '''
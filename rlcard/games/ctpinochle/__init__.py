@@ -1,2 +1,3 @@
 from rlcard.games.ctpinochle.game import CTPinochleGame as Game
+from rlcard.games.ctpinochle.batched_game import BatchedCTPinochleGame
 __all__ = ['']
\ No newline at end of file
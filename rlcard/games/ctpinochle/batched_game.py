@@ -0,0 +1,375 @@
+'''
+    File Name: ctpinochle/batched_game.py
+    Author: Nol Patterson
+    Date Created: 2/8/2026
+'''
+from typing import Optional
+import numpy as np
+
+from .game import WIN_SCORE
+from .utils.action_event import ActionEvent, BidAction
+from .utils.ctpinochle_card import CTPinochleCard
+from .utils.meld_calculator import calculate_meld_batch
+from .utils.trick_table import get_trick_winner_table
+
+# =========================================
+# Lockstep batched simulator
+#   Plays num_games independent games of cutthroat pinochle with the rules of
+#   CTPinochleGame, but every piece of state is a NumPy array whose first axis
+#   is the game index (struct-of-arrays), so one call to step advances every
+#   game at once. Actions are action_ids, hands are bool arrays indexed by
+#   (game, player_id, card_id) and there are no Card, Move or ActionEvent objects.
+#
+#   Differences from CTPinochleGame:
+#       - games share a single random state, so deals differ from the scalar engine for the same seed
+#       - games that are over stay over (their actions are ignored) until init_game resets them
+#       - there is no move_sheet, only the bidding history needed for observations is kept
+# =========================================
+
+NUM_PLAYERS = 3
+NUM_ACTIONS = ActionEvent.get_num_actions()
+MAX_BID_HISTORY = 15  # Same as DefaultPinochleStateExtractor.max_bidding_rep_index
+STUCK_BID_AMOUNT = ActionEvent.min_bid - 1
+STUCK_BID_ACTION_ID = BidAction(STUCK_BID_AMOUNT).action_id
+
+CARD_SUIT_INDICES = np.array([card.suit_index for card in CTPinochleCard.get_deck()], dtype=np.int64)
+CARD_RANK_INDICES = np.array([card.rank_index for card in CTPinochleCard.get_deck()], dtype=np.int64)
+CARD_VALUES = np.array([card.card_value for card in CTPinochleCard.get_deck()], dtype=np.int64)
+
+# The player receiving the k-th dealt card, cards are dealt in batches of 4 starting with player 0
+DEAL_PLAYER_IDS = (np.arange(48) // 4) % NUM_PLAYERS
+
+
+class BatchedCTPinochleGame:
+    '''
+    Advances num_games games of cutthroat pinochle in lockstep.
+
+    All public state attributes are arrays with the game index as first axis,
+    named after the matching CTPinochleRound / CTPinochleGame attribute.
+    Missing values (no bid winner, no trump, empty trick slot) are -1.
+    '''
+
+    def __init__(self, num_games: int, seed: Optional[int] = None):
+        if num_games < 1:
+            raise Exception(f'BatchedCTPinochleGame: invalid num_games={num_games}')
+        self.num_games: int = num_games
+        self.num_players: int = NUM_PLAYERS
+        self.np_random = np.random.RandomState(seed)
+
+        shape = (num_games,)
+        # Game state
+        self.total_scores = np.zeros(shape + (NUM_PLAYERS,), dtype=np.int64)
+        self.round_number = np.zeros(shape, dtype=np.int64)
+        self.dealer_id = np.zeros(shape, dtype=np.int64)
+        self.winner_id = np.full(shape, -1, dtype=np.int64)
+        self.game_over = np.ones(shape, dtype=bool)  # No game is running until init_game
+
+        # Round state
+        self.hands = np.zeros(shape + (NUM_PLAYERS, 48), dtype=bool)
+        self.current_player_id = np.zeros(shape, dtype=np.int64)
+        self.current_bid = np.zeros(shape, dtype=np.int64)
+        self.pass_count = np.zeros(shape, dtype=np.int64)
+        self.player_pass = np.zeros(shape + (NUM_PLAYERS,), dtype=bool)
+        self.bid_winner_id = np.full(shape, -1, dtype=np.int64)
+        self.trump_suit_index = np.full(shape, -1, dtype=np.int64)
+        self.meld_shown = np.zeros(shape, dtype=bool)
+        self.player_meld_points = np.zeros(shape + (NUM_PLAYERS,), dtype=np.int64)
+        self.play_card_count = np.zeros(shape, dtype=np.int64)
+        # Cards of the current trick in play order, the last completed trick is kept until the next card is led
+        self.trick_card_ids = np.full(shape + (3,), -1, dtype=np.int64)
+        self.trick_player_ids = np.full(shape + (3,), -1, dtype=np.int64)
+        self.trick_points = np.zeros(shape + (NUM_PLAYERS,), dtype=np.int64)
+        self.tricks_won = np.zeros(shape + (NUM_PLAYERS,), dtype=np.int64)
+
+        # Bidding history, the action_ids of the first MAX_BID_HISTORY bid and pass moves (the stuck dealer's bid of 20 is 0)
+        self.bid_action_ids = np.zeros(shape + (MAX_BID_HISTORY,), dtype=np.int64)
+        self.num_bid_moves = np.zeros(shape, dtype=np.int64)
+        self.last_bid_action_id = np.full(shape, -1, dtype=np.int64)  # -1 until the first call of the round
+
+        self._legal_action_mask: Optional[np.ndarray] = None
+
+    def init_game(self, game_ids=None) -> np.ndarray:
+        '''
+        Start new games
+
+        Args:
+            game_ids: Indices or bool mask of the games to restart, all games if None
+
+        Returns:
+            (np.ndarray): current_player_id of every game
+        '''
+        game_ids = self._to_game_ids(game_ids)
+        self.total_scores[game_ids] = 0
+        self.round_number[game_ids] = 0
+        self.winner_id[game_ids] = -1
+        self.game_over[game_ids] = False
+
+        # Pick a random starting dealer
+        self.dealer_id[game_ids] = self.np_random.randint(NUM_PLAYERS, size=len(game_ids))
+
+        self._start_new_round(game_ids)
+        return self.current_player_id.copy()
+
+    def step(self, action_ids) -> np.ndarray:
+        '''
+        Apply one action_id to every game that is not over. Rounds that finish are
+        tallied and, unless the game is over, a new round is dealt right away.
+
+        Args:
+            action_ids: Array-like of num_games action_ids, entries of finished games are ignored
+
+        Returns:
+            (np.ndarray): current_player_id of every game
+        '''
+        action_ids = np.asarray(action_ids, dtype=np.int64)
+        if action_ids.shape != (self.num_games,):
+            raise Exception(f'BatchedCTPinochleGame.step: expected {self.num_games} action_ids, got shape {action_ids.shape}')
+        active_game_ids = np.flatnonzero(~self.game_over)
+        active_action_ids = action_ids[active_game_ids]
+        if np.any((active_action_ids < 0) | (active_action_ids >= NUM_ACTIONS)):
+            raise Exception(f'BatchedCTPinochleGame.step: invalid action_ids={active_action_ids}')
+        is_legal = self.get_legal_action_mask()[active_game_ids, active_action_ids]
+        if not np.all(is_legal):
+            illegal_game_ids = active_game_ids[~is_legal]
+            raise Exception(f'BatchedCTPinochleGame.step: illegal actions {action_ids[illegal_game_ids]} in games {illegal_game_ids}')
+
+        is_play = active_action_ids >= ActionEvent.first_play_card_action_id
+        is_trump = active_action_ids >= ActionEvent.min_trump
+        is_play &= ~is_trump
+        is_call = ~(is_play | is_trump)
+
+        self._make_calls(active_game_ids[is_call], active_action_ids[is_call])
+        self._set_trumps(active_game_ids[is_trump], active_action_ids[is_trump] - ActionEvent.min_trump)
+        self._play_cards(active_game_ids[is_play], active_action_ids[is_play] - ActionEvent.first_play_card_action_id)
+
+        self._legal_action_mask = None
+        return self.current_player_id.copy()
+
+    def get_legal_action_mask(self) -> np.ndarray:
+        '''
+        Legal actions of the current player of every game, the same as
+        CTPinochleJudger.get_legal_action_mask for each game. Rows of games that
+        are over are all False. The array is read-only and cached until the next step.
+
+        Returns:
+            (np.ndarray): bool array of shape (num_games, 83)
+        '''
+        if self._legal_action_mask is None:
+            self._legal_action_mask = self._compute_legal_action_mask()
+            self._legal_action_mask.flags.writeable = False
+        return self._legal_action_mask
+
+    def is_over(self) -> np.ndarray:
+        return self.game_over.copy()
+
+    def get_payoffs(self) -> np.ndarray:
+        ''' Cumulative scores of shape (num_games, 3), as CTPinochleGame.get_payoffs '''
+        return self.total_scores.copy()
+
+    def get_num_players(self) -> int:
+        return self.num_players
+
+    @staticmethod
+    def get_num_actions() -> int:
+        return NUM_ACTIONS
+
+    def get_player_id(self) -> np.ndarray:
+        return self.current_player_id.copy()
+
+    def is_bidding_over(self) -> np.ndarray:
+        return self.pass_count >= 2
+
+    def get_card_counts(self) -> np.ndarray:
+        ''' Count vectors (see CTPinochlePlayer.card_counts) of every hand, shape (num_games, 3, 24) '''
+        return self.hands.reshape(self.num_games, NUM_PLAYERS, 24, 2).sum(axis=3, dtype=np.int8)
+
+    # ------------------------------------------------------------------
+    # Internal helpers
+    # ------------------------------------------------------------------
+
+    def _to_game_ids(self, game_ids) -> np.ndarray:
+        if game_ids is None:
+            return np.arange(self.num_games)
+        game_ids = np.asarray(game_ids)
+        if game_ids.dtype == bool:
+            return np.flatnonzero(game_ids)
+        return game_ids.astype(np.int64).reshape(-1)
+
+    def _start_new_round(self, game_ids: np.ndarray):
+        '''Shuffle, deal and reset the round state of game_ids. round_number and dealer_id must already be set.'''
+        self._legal_action_mask = None
+        num_games = len(game_ids)
+        self.round_number[game_ids] += 1
+
+        # One random permutation of the deck per game, dealt 4 cards at a time
+        shuffled_card_ids = np.argsort(self.np_random.random_sample((num_games, 48)), axis=1)
+        self.hands[game_ids] = False
+        self.hands[game_ids[:, np.newaxis], DEAL_PLAYER_IDS[np.newaxis, :], shuffled_card_ids] = True
+
+        self.current_player_id[game_ids] = (self.dealer_id[game_ids] + 1) % NUM_PLAYERS  # Player left of dealer bids first
+        self.current_bid[game_ids] = 0
+        self.pass_count[game_ids] = 0
+        self.player_pass[game_ids] = False
+        self.bid_winner_id[game_ids] = -1
+        self.trump_suit_index[game_ids] = -1
+        self.meld_shown[game_ids] = False
+        self.player_meld_points[game_ids] = 0
+        self.play_card_count[game_ids] = 0
+        self.trick_card_ids[game_ids] = -1
+        self.trick_player_ids[game_ids] = -1
+        self.trick_points[game_ids] = 0
+        self.tricks_won[game_ids] = 0
+        self.bid_action_ids[game_ids] = 0
+        self.num_bid_moves[game_ids] = 0
+        self.last_bid_action_id[game_ids] = -1
+
+    def _compute_legal_action_mask(self) -> np.ndarray:
+        legal_action_mask = np.zeros((self.num_games, NUM_ACTIONS), dtype=bool)
+        active = ~self.game_over
+        is_bidding = active & (self.pass_count < 2)
+        is_selecting_trump = active & ~is_bidding & (self.trump_suit_index < 0)
+        is_playing = active & self.meld_shown
+
+        # Bidding: pass (the current bidder has never passed) or any bid above the current bid, at least min_bid
+        bidding_game_ids = np.flatnonzero(is_bidding)
+        legal_action_mask[bidding_game_ids, ActionEvent.pass_bid_action_id] = \
+            ~self.player_pass[bidding_game_ids, self.current_player_id[bidding_game_ids]]
+        next_bid_amount = np.maximum(self.current_bid[bidding_game_ids] + 1, ActionEvent.min_bid)
+        bid_amounts = np.arange(ActionEvent.min_bid, ActionEvent.max_bid + 1)
+        legal_action_mask[bidding_game_ids, ActionEvent.first_bid_action_id:ActionEvent.first_play_card_action_id] = \
+            bid_amounts[np.newaxis, :] >= next_bid_amount[:, np.newaxis]
+
+        # Trump selection: the bid winner picks any suit
+        legal_action_mask[is_selecting_trump, ActionEvent.min_trump:ActionEvent.max_trump + 1] = True
+
+        # Card play: follow suit and beat the largest card of the trick if possible, else trump if possible
+        playing_game_ids = np.flatnonzero(is_playing)
+        hands = self.hands[playing_game_ids, self.current_player_id[playing_game_ids]]
+        is_leading = self.play_card_count[playing_game_ids] % 3 == 0
+        trick_card_ids = self.trick_card_ids[playing_game_ids]
+        led_suit_index = CARD_SUIT_INDICES[trick_card_ids[:, 0]]
+        largest_rank_index = np.where(trick_card_ids >= 0, CARD_RANK_INDICES[trick_card_ids], -1).max(axis=1)
+
+        led_suit_cards = hands & (CARD_SUIT_INDICES[np.newaxis, :] == led_suit_index[:, np.newaxis])
+        greater_rank_cards = led_suit_cards & (CARD_RANK_INDICES[np.newaxis, :] > largest_rank_index[:, np.newaxis])
+        trump_cards = hands & (CARD_SUIT_INDICES[np.newaxis, :] == self.trump_suit_index[playing_game_ids, np.newaxis])
+        following_cards = np.where(greater_rank_cards.any(axis=1, keepdims=True), greater_rank_cards, led_suit_cards)
+        not_following_cards = np.where(trump_cards.any(axis=1, keepdims=True), trump_cards, hands)
+        legal_cards = np.where(led_suit_cards.any(axis=1, keepdims=True), following_cards, not_following_cards)
+        legal_cards = np.where(is_leading[:, np.newaxis], hands, legal_cards)
+        legal_action_mask[playing_game_ids, ActionEvent.first_play_card_action_id:ActionEvent.min_trump] = legal_cards
+        return legal_action_mask
+
+    def _record_call(self, game_ids: np.ndarray, action_ids):
+        history_index = self.num_bid_moves[game_ids]
+        recorded = history_index < MAX_BID_HISTORY
+        self.bid_action_ids[game_ids[recorded], history_index[recorded]] = np.broadcast_to(action_ids, game_ids.shape)[recorded]
+        self.num_bid_moves[game_ids] += 1
+        self.last_bid_action_id[game_ids] = action_ids
+
+    def _make_calls(self, game_ids: np.ndarray, action_ids: np.ndarray):
+        '''Bids and passes, see CTPinochleRound.make_call'''
+        if len(game_ids) == 0:
+            return
+        current_player_id = self.current_player_id[game_ids]
+        is_pass = action_ids == ActionEvent.pass_bid_action_id
+        # If the first bidder passes the dealer is stuck at 20
+        is_stuck = is_pass & (self.current_bid[game_ids] == 0)
+
+        self.player_pass[game_ids[is_pass], current_player_id[is_pass]] = True
+        self.pass_count[game_ids[is_pass]] += 1
+        self._record_call(game_ids, action_ids)
+
+        bid_game_ids = game_ids[~is_pass]
+        self.current_bid[bid_game_ids] = action_ids[~is_pass] - ActionEvent.first_bid_action_id + ActionEvent.min_bid
+        self.bid_winner_id[bid_game_ids] = current_player_id[~is_pass]
+
+        stuck_game_ids = game_ids[is_stuck]
+        dealer_id = self.dealer_id[stuck_game_ids]
+        self.bid_winner_id[stuck_game_ids] = dealer_id
+        self.current_bid[stuck_game_ids] = STUCK_BID_AMOUNT
+        self._record_call(stuck_game_ids, STUCK_BID_ACTION_ID)
+        self.current_player_id[stuck_game_ids] = dealer_id
+
+        # Move to the next player who has not passed, or to the bid winner once bidding is over
+        game_ids = game_ids[~is_stuck]
+        current_player_id = current_player_id[~is_stuck]
+        next_player_id = (current_player_id + 1) % NUM_PLAYERS
+        next_player_id = np.where(self.player_pass[game_ids, next_player_id], (current_player_id + 2) % NUM_PLAYERS, next_player_id)
+        self.current_player_id[game_ids] = np.where(self.pass_count[game_ids] >= 2, self.bid_winner_id[game_ids], next_player_id)
+
+    def _set_trumps(self, game_ids: np.ndarray, trump_suit_index: np.ndarray):
+        '''Trump selection and meld, see CTPinochleRound.set_trump and show_meld'''
+        if len(game_ids) == 0:
+            return
+        self.trump_suit_index[game_ids] = trump_suit_index
+        card_counts = self.hands[game_ids].reshape(-1, 24, 2).sum(axis=2)
+        meld_points = calculate_meld_batch(card_counts).reshape(len(game_ids), NUM_PLAYERS, 4)
+        self.player_meld_points[game_ids] = meld_points[np.arange(len(game_ids)), :, trump_suit_index]
+        self.meld_shown[game_ids] = True
+        # Bid winner leads first trick
+        self.current_player_id[game_ids] = self.bid_winner_id[game_ids]
+
+    def _play_cards(self, game_ids: np.ndarray, card_ids: np.ndarray):
+        '''Card play and trick resolution, see CTPinochleRound.play_card'''
+        if len(game_ids) == 0:
+            return
+        current_player_id = self.current_player_id[game_ids]
+        self.hands[game_ids, current_player_id, card_ids] = False
+
+        trick_position = self.play_card_count[game_ids] % 3
+        leading_game_ids = game_ids[trick_position == 0]
+        self.trick_card_ids[leading_game_ids] = -1
+        self.trick_player_ids[leading_game_ids] = -1
+        self.trick_card_ids[game_ids, trick_position] = card_ids
+        self.trick_player_ids[game_ids, trick_position] = current_player_id
+        self.play_card_count[game_ids] += 1
+
+        is_complete = trick_position == 2
+        self.current_player_id[game_ids[~is_complete]] = (current_player_id[~is_complete] + 1) % NUM_PLAYERS
+
+        game_ids = game_ids[is_complete]
+        if len(game_ids) == 0:
+            return
+        trick_card_ids = self.trick_card_ids[game_ids]
+        trick_winner_id = self._determine_trick_winners(game_ids, trick_card_ids)
+        self.current_player_id[game_ids] = trick_winner_id
+        self.tricks_won[game_ids, trick_winner_id] += 1
+        # Bonus point for last trick
+        is_last_trick = self.play_card_count[game_ids] == 48
+        self.trick_points[game_ids, trick_winner_id] += CARD_VALUES[trick_card_ids].sum(axis=1) + is_last_trick
+
+        if np.any(is_last_trick):
+            self._end_rounds(game_ids[is_last_trick])
+
+    def _determine_trick_winners(self, game_ids: np.ndarray, trick_card_ids: np.ndarray) -> np.ndarray:
+        '''Player ids winning the complete tricks of game_ids, see CTPinochleRound._determine_trick_winner'''
+        winning_position = get_trick_winner_table()[
+            trick_card_ids[:, 0], trick_card_ids[:, 1], trick_card_ids[:, 2], self.trump_suit_index[game_ids]]
+        return self.trick_player_ids[game_ids, winning_position]
+
+    def _end_rounds(self, game_ids: np.ndarray):
+        '''Tally round scores, decide finished games and deal the next round of the rest, see CTPinochleGame._tally_round_scores'''
+        total_points = self.player_meld_points[game_ids] + self.trick_points[game_ids]
+        # If they took no tricks they lose meld and have 0 points from tricks
+        total_points[self.tricks_won[game_ids] == 0] = 0
+        # The bid winner scores their points if they made the bid and loses the bid otherwise
+        bid_winner_id = self.bid_winner_id[game_ids]
+        current_bid = self.current_bid[game_ids]
+        rows = np.arange(len(game_ids))
+        bid_winner_points = total_points[rows, bid_winner_id]
+        total_points[rows, bid_winner_id] = np.where(bid_winner_points >= current_bid, bid_winner_points, -current_bid)
+        total_scores = self.total_scores[game_ids] + total_points
+        self.total_scores[game_ids] = total_scores
+
+        has_winner = np.any(total_scores >= WIN_SCORE, axis=1)
+        is_over = has_winner | np.any(total_scores <= -200, axis=1)
+        bid_winner_won = total_scores[rows, bid_winner_id] >= WIN_SCORE
+        winner_id = np.where(bid_winner_won, bid_winner_id, np.argmax(total_scores, axis=1))
+        self.winner_id[game_ids[has_winner]] = winner_id[has_winner]
+        self.game_over[game_ids[is_over]] = True
+
+        # Rotate the dealer and begin next round
+        game_ids = game_ids[~is_over]
+        self.dealer_id[game_ids] = (self.dealer_id[game_ids] + 1) % NUM_PLAYERS
+        self._start_new_round(game_ids)
@@ -28,5 +28,5 @@ class CTPinochleDealer:
     def deal_cards(self, player: CTPinochlePlayer, num: int = 4):
         for __ in range(num):
             if self.to_be_dealt:
-                player.hand.append(self.to_be_dealt.pop())
+                player.add_card_to_hand(self.to_be_dealt.pop())
 
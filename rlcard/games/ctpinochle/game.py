@@ -6,9 +6,12 @@
 from typing import List, Optional
 import numpy as np
 
+from rlcard.utils.snapshot import GameSnapshot, take_snapshot, restore_snapshot
+
 from .judger import CTPinochleJudger
 from .round import CTPinochleRound
 from .utils.action_event import ActionEvent, CallActionEvent, PlayCardAction, SelectTrumpAction
+from .utils.tracer import CTPinochleTracer, tracer_from_env
 
 WIN_SCORE = 100  # First player to reach this wins the game
 
@@ -19,7 +22,7 @@ class CTPinochleGame:
     is the highest scorer. The dealer rotates left each round.
     '''
 
-    def __init__(self, allow_step_back: bool = False):
+    def __init__(self, allow_step_back: bool = False, tracer: Optional[CTPinochleTracer] = None):
         self.allow_step_back: bool = allow_step_back
         self.np_random = np.random.RandomState()
         self.judger: CTPinochleJudger = CTPinochleJudger(game=self)
@@ -39,18 +42,44 @@ class CTPinochleGame:
         # Set once the game is over so callers can inspect who won
         self.winner_id: Optional[int] = None
 
+        # Undo records for step_back, only kept when allow_step_back is set
+        self.undo_log: List[tuple] = []
+
+        # Bumped whenever the game state changes so the judger knows when its cached legal actions are stale
+        self.state_version: int = 0
+
+        # Optional tracer (see utils/tracer.py). is_tracing is decided per game so tracing can be sampled
+        self.tracer: Optional[CTPinochleTracer] = tracer if tracer is not None else tracer_from_env()
+        self.is_tracing: bool = False
+        self.trace_game_id: Optional[int] = None
+
+    def __getstate__(self):
+        # Tracers are process local, copies and pickled games (e.g. sent to worker processes) are not traced
+        state = self.__dict__.copy()
+        state['tracer'] = None
+        state['is_tracing'] = False
+        state['trace_game_id'] = None
+        return state
+
     def init_game(self):
         # Start a new game
         self.actions = []
+        self.undo_log = []
         self.round_number = 0
         self.total_scores = [0, 0, 0]
         self.winner_id = None
+        self.state_version += 1
 
         # Pick a random starting dealer
         self._current_dealer_id = int(self.np_random.choice([0, 1, 2]))
 
         self._start_new_round()
 
+        self.trace_game_id = self.tracer.sample_game() if self.tracer is not None else None
+        self.is_tracing = self.trace_game_id is not None
+        if self.is_tracing:
+            self.tracer.record('game_start', self.trace_game_id, dealer_id=self._current_dealer_id)
+
         current_player_id = self.round.current_player_id
         state = self.get_state(player_id=current_player_id)
         return state, current_player_id
@@ -61,6 +90,12 @@ class CTPinochleGame:
         tallied and — unless someone has won the game — a new round begins
         automatically. Returns (next_state, next_player_id).
         '''
+        if self.allow_step_back:
+            round_undo_record = self.round.get_undo_record(action)
+            game_undo_record = (self.round, self.round_number, self._current_dealer_id, tuple(self.total_scores), self.winner_id)
+        if self.is_tracing:
+            phase_before = self.round.roundphase
+
         if isinstance(action, CallActionEvent):
             self.round.make_call(action=action)
         elif isinstance(action, SelectTrumpAction):
@@ -72,9 +107,18 @@ class CTPinochleGame:
             raise Exception(f'CTPinochleGame.step: unknown action type={action}')
 
         self.actions.append(action)
+        self.state_version += 1
 
         # If the round just finished, score it and potentially start a new one
-        if self.round.is_over():
+        round_over = self.round.is_over()
+        if self.allow_step_back:
+            # Game level state only changes when a round finishes
+            self.undo_log.append((round_undo_record, game_undo_record if round_over else None))
+
+        if self.is_tracing:
+            self._trace_step(action, phase_before)
+
+        if round_over:
             self._tally_round_scores()
 
             if not self.is_over():
@@ -86,6 +130,39 @@ class CTPinochleGame:
         next_state = self.get_state(player_id=next_player_id)
         return next_state, next_player_id
 
+    def step_back(self) -> bool:
+        '''
+        Undo the last action using the undo log, including any round rollover
+        and score tally it caused. Returns False if there is nothing to undo.
+        '''
+        if not self.undo_log:
+            return False
+        round_undo_record, game_undo_record = self.undo_log.pop()
+        if game_undo_record is not None:
+            self.round, self.round_number, self._current_dealer_id, total_scores, self.winner_id = game_undo_record
+            self.total_scores = list(total_scores)
+        self.round.restore_undo_record(round_undo_record)
+        self.actions.pop()
+        self.state_version += 1
+        return True
+
+    def clone_state(self) -> GameSnapshot:
+        '''
+        Take a compact snapshot of the game to branch from, see restore_state.
+        Only the containers of the game objects are copied, the cards are shared.
+        '''
+        return take_snapshot([self, self.round, self.round.dealer] + self.round.players, self.np_random)
+
+    def restore_state(self, snapshot: GameSnapshot):
+        '''
+        Return the game to a snapshot from clone_state. The snapshot can be restored
+        any number of times. The state version keeps increasing so that nothing
+        cached for a state reached after the snapshot is reused.
+        '''
+        state_version = self.state_version
+        restore_snapshot(snapshot)
+        self.state_version = state_version + 1
+
     def is_over(self) -> bool:
         '''
         The game is over when:
@@ -143,6 +220,23 @@ class CTPinochleGame:
         # Note: CTPinochleRound.__init__ already deals all 48 cards in batches of 4.
         # Do NOT deal again here — that was the source of the double-deal bug.
 
+    def _trace_step(self, action: ActionEvent, phase_before: str):
+        '''Record trick outcomes and phase transitions caused by action.'''
+        phase_after = self.round.roundphase
+        if isinstance(action, PlayCardAction) and self.round.play_card_count % 3 == 0:
+            trick_moves = self.round.move_sheet[-3:]
+            self.tracer.record('trick', self.trace_game_id,
+                               round_number=self.round_number,
+                               player_ids=[move.player.player_id for move in trick_moves],
+                               card_ids=[move.card.card_id for move in trick_moves],
+                               winner_id=self.round.current_player_id,
+                               trick_points=list(self.round.trick_points))
+        if phase_after != phase_before:
+            record = {'round_number': self.round_number, 'from_phase': phase_before, 'to_phase': phase_after}
+            if phase_after == 'round over':
+                record['round_scores'] = self.round.calculate_scores()
+            self.tracer.record('phase', self.trace_game_id, **record)
+
     def _tally_round_scores(self):
         '''Add this round's scores to the running totals and record the winner if done.'''
         round_scores = self.round.calculate_scores()
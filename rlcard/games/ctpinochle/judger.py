@@ -10,33 +10,59 @@ from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from .game import CTPinochleGame
 
-from .utils.action_event import PlayCardAction, SelectTrumpAction
-from .utils.action_event import ActionEvent, BidAction, PassBid
-from .utils.move import MakeBidMove
-from .utils.ctpinochle_card import CTPinochleCard
+import numpy as np
 
-import logging
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
+from .utils.action_event import ActionEvent
+from .utils.ctpinochle_card import CTPinochleCard, SUIT_MASKS, RANK_ABOVE_MASKS
 
-file_handler = logging.FileHandler("legal_moves.txt")
-file_handler.setLevel(logging.INFO)
-
-formatter = logging.Formatter(
-    "%(asctime)s - %(levelname)s - %(message)s"
-)
-file_handler.setFormatter(formatter)
-
-logger.addHandler(file_handler)
 
 class CTPinochleJudger:
     '''
         Judger decides legal actions for current player
+
+        Legal actions are computed once per game state and cached until the game
+        advances (tracked through CTPinochleGame.state_version). The returned
+        ActionEvent objects are the shared instances from ActionEvent.from_action_id.
     '''
     def __init__(self, game: 'CTPinochleGame'):
         self.game: CTPinochleGame = game
+        self._cached_state_version = None
+        self._legal_actions: List[ActionEvent] = []
+        self._legal_action_ids: List[int] = []
+        self._legal_action_mask: np.ndarray = np.zeros(ActionEvent.get_num_actions(), dtype=bool)
 
     def get_legal_actions(self) -> List[ActionEvent]:
+        self._update_legal_actions()
+        return list(self._legal_actions)
+
+    def get_legal_action_ids(self) -> List[int]:
+        self._update_legal_actions()
+        return list(self._legal_action_ids)
+
+    def get_legal_action_mask(self) -> np.ndarray:
+        ''' Boolean mask of length ActionEvent.get_num_actions() (83). The array is read-only and shared until the game advances '''
+        self._update_legal_actions()
+        return self._legal_action_mask
+
+    def _update_legal_actions(self):
+        if self._cached_state_version == self.game.state_version:
+            return
+        legal_actions = self._compute_legal_actions()
+        legal_action_ids = [action.action_id for action in legal_actions]
+        legal_action_mask = np.zeros(ActionEvent.get_num_actions(), dtype=bool)
+        legal_action_mask[legal_action_ids] = True
+        legal_action_mask.flags.writeable = False
+        self._legal_actions = legal_actions
+        self._legal_action_ids = legal_action_ids
+        self._legal_action_mask = legal_action_mask
+        self._cached_state_version = self.game.state_version
+        if self.game.is_tracing:
+            self.game.tracer.record('legal_actions', self.game.trace_game_id,
+                                    round_number=self.game.round_number,
+                                    player_id=self.game.round.current_player_id,
+                                    action_ids=legal_action_ids)
+
+    def _compute_legal_actions(self) -> List[ActionEvent]:
         legal_actions: List[ActionEvent] = []
         if not self.game.is_over():
             current_player = self.game.round.get_current_player()
@@ -45,78 +71,64 @@ class CTPinochleJudger:
             if not self.game.round.is_bidding_over():
                 # Player can only pass if they haven't already passed
                 if not self.game.round.player_pass[current_player.player_id]:
-                    legal_actions.append(PassBid())
-                    #logger.info(f'Pass is legal: {legal_actions}')
+                    legal_actions.append(_pass_bid_action)
                 
-                # Find the last bid to determine minimum next bid
-                last_make_bid_move: MakeBidMove or None = None
-                for move in reversed(self.game.round.move_sheet):
-                    if isinstance(move, MakeBidMove):
-                        last_make_bid_move = move
-                        break
-                
-                # Determine the next valid bid amount
-                if last_make_bid_move:
-                    # Must bid higher than current bid
-                    next_bid_amount = last_make_bid_move.action.bid_amount + 1
-                else:
-                    # First bid must be at least min_bid (21)
-                    next_bid_amount = ActionEvent.min_bid
+                # Must bid higher than current bid, first bid must be at least min_bid (21)
+                # current_bid always equals the amount of the last MakeBidMove in the move_sheet
+                next_bid_amount = max(self.game.round.current_bid + 1, ActionEvent.min_bid)
                 
                 # Add all valid bid actions from next_bid_amount to max_bid
-                for bid_amount in range(next_bid_amount, ActionEvent.max_bid + 1):
-                    action = BidAction(bid_amount)
-                    legal_actions.append(action)
-                    #logger.info(f'Legal Bids: {legal_actions}')
+                legal_actions += _bid_actions[next_bid_amount - ActionEvent.min_bid:]
             
             # Trump selection phase
             elif self.game.round.trump_suit is None:
                 # Only bid winner selects trump
                 if current_player.player_id == self.game.round.bid_winner_id:
-                    for suit in ['C', 'D', 'H', 'S']:
-                        legal_actions.append(SelectTrumpAction(suit))
+                    legal_actions += _select_trump_actions
 
             # During card play phase
             else:
                 trick_moves = self.game.round.get_trick_moves()
-                hand = self.game.round.players[current_player.player_id].hand
-                legal_cards = []
-                
+                hand = current_player.hand
+                hand_mask = current_player.hand_mask
+
                 # First card of trick - can play anything
                 if not trick_moves or len(trick_moves) == 3:
-                    #logger.info('Entered not trick_moves')
-                    legal_cards = hand
+                    legal_mask = hand_mask
                 else:
                     # Must follow suit if possible
                     led_card: CTPinochleCard = trick_moves[0].card
                     largest_rank_index: int = max(trick_move.card.rank_index for trick_move in trick_moves)
-                    #logger.info(f'led_card: {led_card} | Current trick: {trick_moves}')
-                    cards_of_led_suit = [card for card in hand if card.suit == led_card.suit]
-                    #logger.info(f'Cards of Led: {cards_of_led_suit} | Led Suit: {led_card.suit}')
+                    cards_of_led_suit_mask = hand_mask & SUIT_MASKS[led_card.suit_index]
 
-                    if cards_of_led_suit:
+                    if cards_of_led_suit_mask:
                         # Must follow suit
-                        cards_of_greater_rank = [card for card in cards_of_led_suit if card.rank_index > largest_rank_index]
-                        #logger.info(f'>= cards: {cards_of_greater_rank}\n')
-                        if cards_of_greater_rank: legal_cards = cards_of_greater_rank
-                        else: legal_cards = cards_of_led_suit
+                        cards_of_greater_rank_mask = cards_of_led_suit_mask & RANK_ABOVE_MASKS[largest_rank_index]
+                        if cards_of_greater_rank_mask: legal_mask = cards_of_greater_rank_mask
+                        else: legal_mask = cards_of_led_suit_mask
                     else:
                         # Cannot follow suit - must play trump if have it
-                        trump_suit = self.game.round.trump_suit
-                        trump_cards = [card for card in hand if card.suit == trump_suit]
-                        
-                        if trump_cards:
+                        trump_suit_index = CTPinochleCard.suits.index(self.game.round.trump_suit)
+                        trump_cards_mask = hand_mask & SUIT_MASKS[trump_suit_index]
+
+                        if trump_cards_mask:
                             # Must play trump
-                            legal_cards = trump_cards
+                            legal_mask = trump_cards_mask
                         else:
                             # No suit and no trump - can play anything
-                            legal_cards = hand
-                
+                            legal_mask = hand_mask
+
+                # Keep hand order so legal actions are listed as before
+                legal_cards = hand if legal_mask == hand_mask else [card for card in hand if legal_mask >> card.card_id & 1]
+
                 # Create PlayCardAction for each legal card
-                for card in legal_cards:
-                    action = PlayCardAction(card=card)
-                    legal_actions.append(action)
-                    #logger.info(f'Cards in hand: {legal_actions}')
+                legal_actions += [_play_card_actions[card.card_id] for card in legal_cards]
         
-        #logger.info(f'Final Action Set: {legal_actions}\n\n')
-        return legal_actions
\ No newline at end of file
+        return legal_actions
+
+
+# Shared action instances used when building legal actions
+_pass_bid_action = ActionEvent.from_action_id(ActionEvent.pass_bid_action_id)
+_bid_actions = [ActionEvent.from_action_id(action_id) for action_id in range(ActionEvent.first_bid_action_id, ActionEvent.first_play_card_action_id)]
+_play_card_actions = [ActionEvent.from_action_id(ActionEvent.first_play_card_action_id + card_id) for card_id in range(48)]
+_select_trump_actions = [ActionEvent.from_action_id(action_id) for action_id in range(ActionEvent.min_trump, ActionEvent.max_trump + 1)]
@@ -5,6 +5,8 @@
 '''
 
 from typing import List
+import numpy as np
+
 from .utils.ctpinochle_card import CTPinochleCard
 
 class CTPinochlePlayer:
@@ -15,9 +17,30 @@ class CTPinochlePlayer:
         self.player_id: int = player_id 
         self.hand: List[CTPinochleCard] = []
 
+        # Integer-backed copies of hand, kept in sync by add/remove_card_from_hand
+        self.hand_mask: int = 0 # bit card_id set for each card held
+        self.card_counts: np.ndarray = np.zeros(24, dtype=np.int8) # count of each card_index held
+
+    def add_card_to_hand(self, card: CTPinochleCard, index: int = None):
+        if index is None:
+            self.hand.append(card)
+        else:
+            self.hand.insert(index, card)
+        self.hand_mask |= 1 << card.card_id
+        self.card_counts[card.card_index] += 1
+
     def remove_card_from_hand(self, card: CTPinochleCard):
-        self.hand.remove(card)
+        removed_card = self.hand.pop(self.get_hand_index(card))
+        self.hand_mask &= ~(1 << removed_card.card_id)
+        self.card_counts[removed_card.card_index] -= 1
     
+    def get_hand_index(self, card: CTPinochleCard) -> int:
+        # Cards compare equal by rank and suit, so look for the exact copy first to keep card_ids in sync
+        for index, held_card in enumerate(self.hand):
+            if held_card is card:
+                return index
+        return self.hand.index(card)
+
     def get_player_id(self):
         return self.player_id
 
@@ -9,7 +9,9 @@ from .player import CTPinochlePlayer
 
 from .utils.action_event import CallActionEvent, PassBid, BidAction, PlayCardAction 
 from .utils.move import CTPinochleMove, DealHandMove, PlayCardMove, MakeBidMove, MakePassBidMove, CallMove
-from .utils.meld_calculator import calculate_meld
+from .utils.ctpinochle_card import CTPinochleCard
+from .utils.meld_calculator import calculate_meld_points, get_meld_card_counts
+from .utils.trick_table import get_trick_winner_table
 
 class CTPinochleRound:    
     def __init__(self, num_players: int, dealer_id: int, np_random):
@@ -51,7 +53,7 @@ class CTPinochleRound:
         self.trump_suit: str or None = None 
         self.meld_shown: bool = False 
         self.player_meld_points: List[int] = [0, 0, 0] # Meld Points for each player
-        self.player_meld_cards: List[List] = [[], [], []] # What cards have been shown for each player
+        self.player_meld_cards: List = [None, None, None] # Count vector (see get_meld_card_counts) of the cards each player shows, set with trump
 
         # Trick State 
         self.play_card_count: int = 0
@@ -149,8 +151,9 @@ class CTPinochleRound:
 
         # Calculate meld for all players
         for player in self.players:
-            meld_points, _ = calculate_meld(player.hand, self.trump_suit)
+            meld_points = calculate_meld_points(player.card_counts, self.trump_suit)
             self.player_meld_points[player.player_id] = meld_points
+            self.player_meld_cards[player.player_id] = get_meld_card_counts(player.card_counts, self.trump_suit)
     
     def show_meld(self):
         # Mark that meld has been shown
@@ -178,7 +181,7 @@ class CTPinochleRound:
             self.tricks_won[trick_winner.player_id] += 1
             
             # Calculate trick points
-            trick_points = sum(1 for move in self.trick_moves if move.card.rank in ['A', '10', 'K'])
+            trick_points = sum(move.card.card_value for move in self.trick_moves)
             
             # Bonus point for last trick
             if self.play_card_count == 48:
@@ -193,30 +196,12 @@ class CTPinochleRound:
         
     # FLAG where are legal moves checked before this
     def _determine_trick_winner(self, trick_moves: List[PlayCardMove]) -> CTPinochlePlayer:
-        lead_suit = trick_moves[0].card.suit 
-        winning_card = trick_moves[0].card
-        trick_winner = trick_moves[0].player
+        # Trump beats non-trump, otherwise the highest card of the led suit wins (see utils/trick_table.py)
+        trump_suit_index = CTPinochleCard.suits.index(self.trump_suit)
+        winning_position = get_trick_winner_table()[
+            trick_moves[0].card.card_id, trick_moves[1].card.card_id, trick_moves[2].card.card_id, trump_suit_index]
+        return trick_moves[winning_position].player
 
-        rank_order = {'9': 0, 'J': 1, 'Q': 2, 'K': 3, '10': 4, 'A': 5}
-
-        for move in trick_moves[1:]:
-            card = move.card
-            player = move.player
-
-            # Trump beats non-trump
-            if card.suit == self.trump_suit and winning_card.suit != self.trump_suit:
-                winning_card = card
-                trick_winner = player
-            # Both same suit
-            elif card.suit == winning_card.suit:
-                # If two cards of same rank and suit are played in the same trick
-                # Whoever played the first one wins hence this is not >=
-                if rank_order[card.rank] > rank_order[winning_card.rank]:
-                    winning_card = card 
-                    trick_winner = player
-            
-        return trick_winner 
-    
     # Calculate final scores for the round
     def calculate_scores(self) -> List[int]:
         scores = [0, 0, 0]
@@ -242,6 +227,38 @@ class CTPinochleRound:
         
         return scores
 
+    def get_undo_record(self, action) -> tuple:
+        ''' Compact record of the round state that the next action will change, see restore_undo_record '''
+        hand_record = None
+        if isinstance(action, PlayCardAction):
+            current_player = self.players[self.current_player_id]
+            removed_card_index = current_player.get_hand_index(action.card)
+            hand_record = (current_player, removed_card_index, current_player.hand[removed_card_index])
+        return (
+            self.current_player_id, len(self.move_sheet),
+            self.current_bid, self.pass_count, tuple(self.player_pass), self.bid_winner_id, self.winning_bid_move,
+            self.trump_suit, self.meld_shown, tuple(self.player_meld_points), tuple(self.player_meld_cards),
+            self.play_card_count, self.trick_moves, tuple(self.trick_points), tuple(self.tricks_won),
+            hand_record,
+        )
+
+    def restore_undo_record(self, undo_record: tuple):
+        ''' Undo one action using the record taken by get_undo_record just before it was applied '''
+        (self.current_player_id, move_count,
+         self.current_bid, self.pass_count, player_pass, self.bid_winner_id, self.winning_bid_move,
+         self.trump_suit, self.meld_shown, player_meld_points, player_meld_cards,
+         self.play_card_count, self.trick_moves, trick_points, tricks_won,
+         hand_record) = undo_record
+        del self.move_sheet[move_count:]
+        self.player_pass = list(player_pass)
+        self.player_meld_points = list(player_meld_points)
+        self.player_meld_cards = list(player_meld_cards)
+        self.trick_points = list(trick_points)
+        self.tricks_won = list(tricks_won)
+        if hand_record is not None:
+            player, removed_card_index, removed_card = hand_record
+            player.add_card_to_hand(removed_card, index=removed_card_index)
+
     def get_perfect_information(self):
         # Get Complete Game State
         state = {}
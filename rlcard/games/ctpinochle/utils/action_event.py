@@ -41,6 +41,13 @@ class ActionEvent(object):
     
     @staticmethod 
     def from_action_id(action_id: int):
+        # Actions are immutable so every caller shares the cached instance for an action_id
+        if not 0 <= action_id < len(_action_events):
+            raise Exception(f'ActionEvent form_action_id: invalid action_id={action_id}')
+        return _action_events[action_id]
+
+    @staticmethod 
+    def _build_from_action_id(action_id: int):
         if action_id == ActionEvent.pass_bid_action_id:
             return PassBid()
         elif ActionEvent.first_bid_action_id <= action_id <= 30:
@@ -112,4 +119,8 @@ class SelectTrumpAction(ActionEvent):
         return f'{self.trump_suit}'
     
     def __repr__(self):
-        return f'{self.trump_suit}'
\ No newline at end of file
+        return f'{self.trump_suit}'
+
+
+# Flyweight ActionEvent instances indexed by action_id (see ActionEvent.from_action_id)
+_action_events = [ActionEvent._build_from_action_id(action_id) for action_id in range(ActionEvent.get_num_actions())]
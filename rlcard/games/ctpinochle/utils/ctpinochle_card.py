@@ -4,6 +4,8 @@
     Date created: 2/8/2026
 '''
 
+import numpy as np
+
 from rlcard.games.base import Card 
 
 class CTPinochleCard(Card):
@@ -22,6 +24,10 @@ class CTPinochleCard(Card):
         super().__init__(suit=suit, rank=rank)
         self.suit_index = CTPinochleCard.suits.index(self.suit)
         self.rank_index = CTPinochleCard.ranks.index(self.rank)
+
+        # Both copies of a card share the same card_index
+        # card_index ranges from 0-23 and is the slot used by count vectors
+        self.card_index = 6 * self.suit_index + self.rank_index
         
         # Each card appears twice in the deck
         # card_id ranges from 0-47 (48 total cards)
@@ -49,4 +55,30 @@ for suit in CTPinochleCard.suits:
             card = CTPinochleCard(suit=suit, rank=rank)
             card.card_id = card_id
             _deck.append(card)
-            card_id += 1
\ No newline at end of file
+            card_id += 1
+
+# =========================================
+# Integer-backed hand representation
+#   hand_mask: 48-bit int, bit card_id is set if that copy is held
+#   card_counts: 24-slot count vector indexed by card_index (0, 1 or 2 of each card)
+# =========================================
+
+# All bits for the 12 cards of a suit, indexed by suit_index
+SUIT_MASKS = [((1 << 12) - 1) << (12 * suit_index) for suit_index in range(4)]
+
+# All bits for cards ranking strictly above rank_index (in every suit), indexed by rank_index
+RANK_ABOVE_MASKS = []
+for rank_index in range(6):
+    rank_above_mask = 0
+    for card in _deck:
+        if card.rank_index > rank_index:
+            rank_above_mask |= 1 << card.card_id
+    RANK_ABOVE_MASKS.append(rank_above_mask)
+
+FULL_HAND_MASK = (1 << 48) - 1
+
+
+def hand_mask_to_array(hand_mask: int) -> np.ndarray:
+    ''' Unpack a 48-bit hand mask into a 0/1 array indexed by card_id '''
+    mask_bytes = np.frombuffer(hand_mask.to_bytes(6, 'little'), dtype=np.uint8)
+    return np.unpackbits(mask_bytes, bitorder='little')
\ No newline at end of file
@@ -0,0 +1,150 @@
+'''
+    File Name: ctpinochle/utils/determinization.py
+    Author: Nol Patterson
+    Date Created: 2/8/2026
+'''
+
+from typing import TYPE_CHECKING, List, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..game import CTPinochleGame
+
+from .ctpinochle_card import CTPinochleCard
+from .move import PlayCardMove
+
+# =========================================
+# Information set determinization
+#   A determinization assigns every card_id to the player holding it, as seen
+#   from one player's point of view. Only information that player has is used:
+#       - their own hand
+#       - cards already played this round
+#       - meld shown by the opponents (they still hold shown cards they have not played)
+#       - void / can't-beat inferences from the follow, beat and trump rules of the judger
+#   Samples are returned as an int8 owners array of shape (num_samples, 48) where
+#   owners[i, card_id] is the player_id holding card_id or -1 if it has been played.
+# =========================================
+
+PLAYED = -1
+
+
+def get_information_set_constraints(game: 'CTPinochleGame', player_id: int) -> Tuple[np.ndarray, np.ndarray, List[int]]:
+    '''
+    Collect what player_id knows about the hidden cards of the current round
+
+    Returns:
+        (tuple) containing:
+            owners (np.ndarray): int8 array of 48 with the owner of every known card_id
+                (player_id for own cards, PLAYED for played cards) and -2 for hidden cards
+            forbidden (np.ndarray): bool array of shape (3, 24), True if the player can not hold that card_index
+            hand_sizes (list): number of cards held by each player
+    '''
+    game_round = game.round
+    owners = np.full(48, -2, dtype=np.int8)
+    for card in game_round.players[player_id].hand:
+        owners[card.card_id] = player_id
+
+    forbidden = np.zeros((3, 24), dtype=bool)
+    play_card_moves = [move for move in game_round.move_sheet if isinstance(move, PlayCardMove)]
+    trump_suit_index = CTPinochleCard.suits.index(game_round.trump_suit) if game_round.trump_suit else None
+    for trick_start in range(0, len(play_card_moves), 3):
+        trick_moves = play_card_moves[trick_start:trick_start + 3]
+        led_card = trick_moves[0].card
+        owners[led_card.card_id] = PLAYED
+        for position in range(1, len(trick_moves)):
+            move = trick_moves[position]
+            card = move.card
+            owners[card.card_id] = PLAYED
+            largest_rank_index = max(trick_move.card.rank_index for trick_move in trick_moves[:position])
+            player_forbidden = forbidden[move.player.player_id]
+            led_suit_base = 6 * led_card.suit_index
+            if card.suit_index == led_card.suit_index:
+                # Followed suit without beating the trick, so held no higher card of the led suit
+                if card.rank_index <= largest_rank_index:
+                    player_forbidden[led_suit_base + largest_rank_index + 1:led_suit_base + 6] = True
+            else:
+                # Could not follow suit
+                player_forbidden[led_suit_base:led_suit_base + 6] = True
+                if card.suit_index != trump_suit_index:
+                    # ... and could not trump either
+                    player_forbidden[6 * trump_suit_index:6 * trump_suit_index + 6] = True
+
+    hand_sizes = [len(player.hand) for player in game_round.players]
+    return owners, forbidden, hand_sizes
+
+
+def sample_determinizations(game: 'CTPinochleGame', player_id: int, num_samples: int, np_random=None) -> np.ndarray:
+    '''
+    Sample hidden card assignments consistent with what player_id knows
+
+    Every consistent assignment is equally likely. Since there are only two
+    opponents, every hidden card is either forced to one of them by the shown
+    meld or the void inferences, or free, and the free cards are split by a
+    single vectorized random permutation per sample.
+
+    Args:
+        game (CTPinochleGame): The game, only public information and player_id's hand are read
+        player_id (int): The player whose point of view is sampled
+        num_samples (int): Number of determinizations
+        np_random (np.random.RandomState): Random state, defaults to game.np_random
+
+    Returns:
+        (np.ndarray): int8 owners array of shape (num_samples, 48)
+    '''
+    if np_random is None:
+        np_random = game.np_random
+    game_round = game.round
+    owners, forbidden, hand_sizes = get_information_set_constraints(game, player_id)
+    opponent_ids = [(player_id + 1) % 3, (player_id + 2) % 3]
+    hidden_card_ids = np.flatnonzero(owners == -2)
+
+    # Shown meld cards that have not been played yet are still in the opponent's hand
+    if game_round.meld_shown:
+        hidden_by_card_index = [[] for _ in range(24)]
+        for card_id in hidden_card_ids:
+            hidden_by_card_index[CTPinochleCard.card(card_id).card_index].append(card_id)
+        for opponent_id in opponent_ids:
+            required_counts = game_round.player_meld_cards[opponent_id].astype(int)
+            for move in game_round.move_sheet:
+                if isinstance(move, PlayCardMove) and move.player.player_id == opponent_id:
+                    required_counts[move.card.card_index] -= 1
+            for card_index in np.flatnonzero(required_counts > 0):
+                for _ in range(required_counts[card_index]):
+                    if not hidden_by_card_index[card_index]:
+                        raise Exception(f'sample_determinizations: shown meld of player {opponent_id} is inconsistent')
+                    owners[hidden_by_card_index[card_index].pop()] = opponent_id
+        hidden_card_ids = np.flatnonzero(owners == -2)
+
+    # Cards one opponent can not hold must be held by the other
+    first_opponent_id, second_opponent_id = opponent_ids
+    hidden_card_indices = hidden_card_ids // 2
+    first_forbidden = forbidden[first_opponent_id][hidden_card_indices]
+    second_forbidden = forbidden[second_opponent_id][hidden_card_indices]
+    if np.any(first_forbidden & second_forbidden):
+        raise Exception('sample_determinizations: no opponent can hold a hidden card')
+    owners[hidden_card_ids[first_forbidden]] = second_opponent_id
+    owners[hidden_card_ids[second_forbidden]] = first_opponent_id
+
+    free_card_ids = np.flatnonzero(owners == -2)
+    num_first_free = hand_sizes[first_opponent_id] - int(np.count_nonzero(owners == first_opponent_id))
+    if not 0 <= num_first_free <= len(free_card_ids):
+        raise Exception('sample_determinizations: constraints are inconsistent with hand sizes')
+
+    samples = np.repeat(owners[np.newaxis, :], num_samples, axis=0)
+    permutations = np.argsort(np_random.random_sample((num_samples, len(free_card_ids))), axis=1)
+    shuffled_free_card_ids = free_card_ids[permutations]
+    rows = np.arange(num_samples)[:, np.newaxis]
+    samples[rows, shuffled_free_card_ids[:, :num_first_free]] = first_opponent_id
+    samples[rows, shuffled_free_card_ids[:, num_first_free:]] = second_opponent_id
+    return samples
+
+
+def owners_to_card_counts(owners: np.ndarray) -> np.ndarray:
+    ''' Convert owners arrays of shape (N, 48) into count vectors of shape (N, 3, 24) '''
+    owners = np.asarray(owners).reshape(-1, 48)
+    card_counts = np.zeros((owners.shape[0], 3, 24), dtype=np.int8)
+    for player_id in range(3):
+        held = (owners == player_id).reshape(-1, 24, 2)
+        card_counts[:, player_id, :] = held.sum(axis=2)
+    return card_counts
@@ -4,9 +4,27 @@
     Date created: 2/8/2026
 '''
 
-from collections import Counter
 from typing import List, Tuple
 
+import numpy as np
+
+from rlcard.games.ctpinochle.utils.ctpinochle_card import CTPinochleCard
+
+# card_index of each rank within a suit (see CTPinochleCard.card_index)
+NINE, JACK, QUEEN, KING, TEN, ACE = range(6)
+SUITS = ['C', 'D', 'H', 'S']
+
+
+def get_card_counts(hand: List) -> np.ndarray:
+    """
+    Build the 24-slot count vector for a list of CTPinochleCard objects
+    """
+    card_counts = np.zeros(24, dtype=np.int8)
+    for card in hand:
+        card_counts[card.card_index] += 1
+    return card_counts
+
+
 def calculate_meld(hand: List, trump_suit: str) -> Tuple[int, List[str]]:
     """
     Calculate meld points for a hand given trump suit
@@ -41,89 +59,86 @@ def calculate_meld(hand: List, trump_suit: str) -> Tuple[int, List[str]]:
     - Double marriages have no bonus (just base points for each)
     - Two 9s of trump are worth 1 point each (no bonus)
     """
-    
+    return calculate_meld_from_counts(get_card_counts(hand), trump_suit)
+
+
+def calculate_meld_from_counts(card_counts, trump_suit: str) -> Tuple[int, List[str]]:
+    """
+    Calculate meld points from a 24-slot count vector (e.g. CTPinochlePlayer.card_counts)
+
+    Args:
+        card_counts: Count of each card held, indexed by card_index (6 * suit_index + rank_index)
+        trump_suit: Trump suit ('C', 'D', 'H', 'S')
+
+    Returns:
+        Tuple of (total_meld_points, list_of_meld_descriptions). See calculate_meld for scoring
+    """
     meld_points = 0
     meld_breakdown = []
-    
-    # Convert hand to card strings and count them
-    # Each card (rank+suit combination) needs to be counted
-    card_strings = []
-    for card in hand:
-        card_strings.append(f'{card.rank}{card.suit}')
-    
-    # Count cards by rank+suit
-    hand_counter = Counter(card_strings)
-    
+
+    counts = [int(count) for count in card_counts]
+    trump_base = 6 * SUITS.index(trump_suit)
+
     # Check for double run in trump
-    trump_run = [f'A{trump_suit}', f'10{trump_suit}', f'K{trump_suit}', 
-                 f'Q{trump_suit}', f'J{trump_suit}']
-    
+    run_count = min(counts[trump_base + rank] for rank in (JACK, QUEEN, KING, TEN, ACE))
+
     has_run = False
-    double_run = False
-    
-    if all(hand_counter[card] >= 2 for card in trump_run):
+
+    if run_count >= 2:
         meld_points += 150
         meld_breakdown.append("Double Run in trump: 150")
         has_run = True
-        double_run = True
-    elif all(hand_counter[card] >= 1 for card in trump_run):
+    elif run_count >= 1:
         meld_points += 15
         meld_breakdown.append("Run in trump: 15")
         has_run = True
     
     # Check for marriages (only count if NOT in a run)
     if not has_run:
-        for suit in ['C', 'D', 'H', 'S']:
-            king = f'K{suit}'
-            queen = f'Q{suit}'
-            num_marriages = min(hand_counter[king], hand_counter[queen])
+        for suit_index, suit in enumerate(SUITS):
+            num_marriages = min(counts[6 * suit_index + KING], counts[6 * suit_index + QUEEN])
             
             if num_marriages > 0:
                 if suit == trump_suit:
                     points = num_marriages * 4
-                    meld_points += points
-                    if num_marriages == 1:
-                        meld_breakdown.append(f"Marriage in {suit}: {points}")
-                    else:
-                        meld_breakdown.append(f"Marriage in {suit} (×{num_marriages}): {points}")
                 else:
                     points = num_marriages * 2
-                    meld_points += points
-                    if num_marriages == 1:
-                        meld_breakdown.append(f"Marriage in {suit}: {points}")
-                    else:
-                        meld_breakdown.append(f"Marriage in {suit} (×{num_marriages}): {points}")
+                meld_points += points
+                if num_marriages == 1:
+                    meld_breakdown.append(f"Marriage in {suit}: {points}")
+                else:
+                    meld_breakdown.append(f"Marriage in {suit} (×{num_marriages}): {points}")
     
     # Check for 9s of trump
-    nine_trump = f'9{trump_suit}'
-    if hand_counter[nine_trump] > 0:
-        points = hand_counter[nine_trump]
-        meld_points += points
-        if hand_counter[nine_trump] == 1:
+    nine_trump_count = counts[trump_base + NINE]
+    if nine_trump_count > 0:
+        meld_points += nine_trump_count
+        if nine_trump_count == 1:
             meld_breakdown.append(f"9 of trump: 1")
         else:
-            meld_breakdown.append(f"9 of trump (×{hand_counter[nine_trump]}): {points}")
+            meld_breakdown.append(f"9 of trump (×{nine_trump_count}): {nine_trump_count}")
     
     # Check for double pinochle (both Q♠ and both J♦)
-    if hand_counter['QS'] == 2 and hand_counter['JD'] == 2:
+    queen_spades_count = counts[6 * SUITS.index('S') + QUEEN]
+    jack_diamonds_count = counts[6 * SUITS.index('D') + JACK]
+    if queen_spades_count == 2 and jack_diamonds_count == 2:
         meld_points += 30
         meld_breakdown.append("Double Pinochle: 30")
     # Check for single pinochle
-    elif hand_counter['QS'] >= 1 and hand_counter['JD'] >= 1:
+    elif queen_spades_count >= 1 and jack_diamonds_count >= 1:
         meld_points += 4
         meld_breakdown.append("Pinochle: 4")
     
     # Check for rounds (Aces, Kings, Queens, Jacks)
     round_checks = [
-        ('A', 10, "Round of Aces", 100),
-        ('K', 8, "Round of Kings", 80),
-        ('Q', 6, "Round of Queens", 60),
-        ('J', 4, "Round of Jacks", 40)
+        (ACE, 10, "Round of Aces", 100),
+        (KING, 8, "Round of Kings", 80),
+        (QUEEN, 6, "Round of Queens", 60),
+        (JACK, 4, "Round of Jacks", 40)
     ]
     
     for rank, base_points, name, double_points in round_checks:
-        round_cards = [f'{rank}{suit}' for suit in ['C', 'D', 'H', 'S']]
-        min_count = min(hand_counter[card] for card in round_cards)
+        min_count = min(counts[6 * suit_index + rank] for suit_index in range(4))
         
         if min_count >= 2:
             meld_points += double_points
@@ -135,6 +150,46 @@ def calculate_meld(hand: List, trump_suit: str) -> Tuple[int, List[str]]:
     return meld_points, meld_breakdown
 
 
+def get_meld_card_counts(card_counts, trump_suit: str) -> np.ndarray:
+    """
+    Cards a player lays down to show their meld
+
+    Args:
+        card_counts: Count of each card held, indexed by card_index
+        trump_suit: Trump suit ('C', 'D', 'H', 'S')
+
+    Returns:
+        24-slot count vector of the cards used by at least one meld. Cards reused
+        by several melds are counted once per copy (element-wise max over melds)
+    """
+    counts = np.asarray(card_counts, dtype=np.int8)
+    meld_cards = np.zeros(24, dtype=np.int8)
+    trump_base = 6 * SUITS.index(trump_suit)
+
+    run_ranks = [trump_base + rank for rank in (JACK, QUEEN, KING, TEN, ACE)]
+    run_count = min(2, int(counts[run_ranks].min()))
+    if run_count > 0:
+        meld_cards[run_ranks] = np.maximum(meld_cards[run_ranks], run_count)
+    else:
+        for suit_index in range(4):
+            marriage_cards = [6 * suit_index + KING, 6 * suit_index + QUEEN]
+            num_marriages = int(counts[marriage_cards].min())
+            meld_cards[marriage_cards] = np.maximum(meld_cards[marriage_cards], num_marriages)
+
+    meld_cards[trump_base + NINE] = max(meld_cards[trump_base + NINE], counts[trump_base + NINE])
+
+    pinochle_cards = [QUEEN_SPADES_INDEX, JACK_DIAMONDS_INDEX]
+    pinochle_count = int(counts[pinochle_cards].min())
+    meld_cards[pinochle_cards] = np.maximum(meld_cards[pinochle_cards], pinochle_count)
+
+    for rank in (ACE, KING, QUEEN, JACK):
+        round_cards = [6 * suit_index + rank for suit_index in range(4)]
+        round_count = int(counts[round_cards].min())
+        meld_cards[round_cards] = np.maximum(meld_cards[round_cards], round_count)
+
+    return meld_cards
+
+
 def format_meld_display(hand: List, trump_suit: str) -> str:
     """
     Format meld calculation for display
@@ -156,4 +211,125 @@ def format_meld_display(hand: List, trump_suit: str) -> str:
         output += f"  - {item}\n"
     output += f"\nTotal Meld: {meld_points} points"
     
-    return output
\ No newline at end of file
+    return output
+
+# =========================================
+# Table-driven meld scoring
+#   Each suit of a hand is encoded as sum(count[rank] * 3 ** rank) over the 6 ranks
+#   (counts are 0, 1 or 2) giving a suit_code in range(729). The tables below hold
+#   that suit's contribution so a hand scores with a handful of lookups.
+# =========================================
+
+_SUIT_CODE_WEIGHTS = np.array([3 ** rank for rank in range(6)], dtype=np.int64)
+
+
+def _build_suit_tables():
+    trump_points = np.zeros(729, dtype=np.int64)  # run or trump marriages, plus 9s of trump
+    has_run = np.zeros(729, dtype=bool)
+    plain_marriage_points = np.zeros(729, dtype=np.int64)  # marriages when suit is not trump
+    for suit_code in range(729):
+        counts = [(suit_code // 3 ** rank) % 3 for rank in range(6)]
+        run_count = min(counts[rank] for rank in (JACK, QUEEN, KING, TEN, ACE))
+        num_marriages = min(counts[KING], counts[QUEEN])
+        if run_count >= 2:
+            trump_points[suit_code] = 150
+        elif run_count >= 1:
+            trump_points[suit_code] = 15
+        else:
+            trump_points[suit_code] = num_marriages * 4
+        trump_points[suit_code] += counts[NINE]
+        has_run[suit_code] = run_count >= 1
+        plain_marriage_points[suit_code] = num_marriages * 2
+    return trump_points, has_run, plain_marriage_points
+
+
+TRUMP_SUIT_POINTS, TRUMP_SUIT_HAS_RUN, PLAIN_SUIT_MARRIAGE_POINTS = _build_suit_tables()
+
+# ROUND_POINTS[rank][min count of that rank across the 4 suits]
+ROUND_POINTS = np.zeros((6, 3), dtype=np.int64)
+ROUND_POINTS[ACE] = [0, 10, 100]
+ROUND_POINTS[KING] = [0, 8, 80]
+ROUND_POINTS[QUEEN] = [0, 6, 60]
+ROUND_POINTS[JACK] = [0, 4, 40]
+
+# PINOCHLE_POINTS[count of QS][count of JD]
+PINOCHLE_POINTS = np.array([[0, 0, 0], [0, 4, 4], [0, 4, 30]], dtype=np.int64)
+QUEEN_SPADES_INDEX = 6 * SUITS.index('S') + QUEEN
+JACK_DIAMONDS_INDEX = 6 * SUITS.index('D') + JACK
+
+# Python list copies for the scalar path, where list indexing beats numpy scalar access
+_trump_suit_points = TRUMP_SUIT_POINTS.tolist()
+_trump_suit_has_run = TRUMP_SUIT_HAS_RUN.tolist()
+_plain_suit_marriage_points = PLAIN_SUIT_MARRIAGE_POINTS.tolist()
+_round_points = ROUND_POINTS.tolist()
+_suit_code_weights = _SUIT_CODE_WEIGHTS.tolist()
+_pinochle_points = PINOCHLE_POINTS.tolist()
+
+
+def calculate_meld_points(card_counts, trump_suit: str) -> int:
+    """
+    Table-driven meld total for a 24-slot count vector (no breakdown)
+
+    Args:
+        card_counts: Count of each card held, indexed by card_index
+        trump_suit: Trump suit ('C', 'D', 'H', 'S')
+
+    Returns:
+        Total meld points, the same as calculate_meld_from_counts(card_counts, trump_suit)[0]
+    """
+    counts = card_counts.tolist() if isinstance(card_counts, np.ndarray) else list(card_counts)
+    suit_codes = [
+        sum(count * weight for count, weight in zip(counts[6 * suit_index:6 * suit_index + 6], _suit_code_weights))
+        for suit_index in range(4)
+    ]
+    trump_suit_index = SUITS.index(trump_suit)
+    trump_code = suit_codes[trump_suit_index]
+
+    meld_points = _trump_suit_points[trump_code]
+    if not _trump_suit_has_run[trump_code]:
+        for suit_index in range(4):
+            if suit_index != trump_suit_index:
+                meld_points += _plain_suit_marriage_points[suit_codes[suit_index]]
+    meld_points += _pinochle_points[counts[QUEEN_SPADES_INDEX]][counts[JACK_DIAMONDS_INDEX]]
+    for rank in (JACK, QUEEN, KING, ACE):
+        meld_points += _round_points[rank][min(counts[rank], counts[6 + rank], counts[12 + rank], counts[18 + rank])]
+    return meld_points
+
+
+def calculate_meld_batch(hands, trumps=None) -> np.ndarray:
+    """
+    Score many hands at once with NumPy
+
+    Args:
+        hands: Array-like of shape (N, 24) of count vectors (see get_card_counts),
+            or a sequence of N hands given as sequences of CTPinochleCard objects
+        trumps: None to score every hand under all four trumps, otherwise an
+            array-like of N trump suits given as suit letters or suit indices
+
+    Returns:
+        np.ndarray of meld points with shape (N, 4) (columns ordered C, D, H, S)
+        when trumps is None, otherwise shape (N,)
+    """
+    if len(hands) and not isinstance(hands, np.ndarray) and len(hands[0]) and isinstance(hands[0][0], CTPinochleCard):
+        hands = [get_card_counts(hand) for hand in hands]
+    card_counts = np.asarray(hands, dtype=np.int64).reshape(-1, 4, 6)
+    num_hands = card_counts.shape[0]
+
+    suit_codes = card_counts @ _SUIT_CODE_WEIGHTS  # (N, 4)
+    trump_points = TRUMP_SUIT_POINTS[suit_codes]
+    has_run = TRUMP_SUIT_HAS_RUN[suit_codes]
+    marriage_points = PLAIN_SUIT_MARRIAGE_POINTS[suit_codes]
+
+    # Marriages in the other three suits only count when trump has no run
+    other_marriage_points = marriage_points.sum(axis=1, keepdims=True) - marriage_points
+    meld_points = trump_points + np.where(has_run, 0, other_marriage_points)
+
+    flat_counts = card_counts.reshape(num_hands, 24)
+    pinochle_points = PINOCHLE_POINTS[flat_counts[:, QUEEN_SPADES_INDEX], flat_counts[:, JACK_DIAMONDS_INDEX]]
+    round_points = ROUND_POINTS[np.arange(6), card_counts.min(axis=1)].sum(axis=1)
+    meld_points += (pinochle_points + round_points)[:, None]
+
+    if trumps is None:
+        return meld_points
+    trump_indices = np.array([SUITS.index(trump) if isinstance(trump, str) else trump for trump in trumps], dtype=np.int64)
+    return meld_points[np.arange(num_hands), trump_indices]
@@ -0,0 +1,118 @@
+'''
+    File Name: ctpinochle/utils/tracer.py
+    Author: Nol Patterson
+    Date Created: 2/8/2026
+'''
+
+import atexit
+import json
+import os
+import pickle
+from typing import List, Optional
+
+import numpy as np
+
+# =========================================
+# Opt-in structured tracing for the pinochle engine
+#   Records legal action sets, phase transitions and trick outcomes.
+#   Nothing is opened or written unless a tracer is attached to a game,
+#   either explicitly (CTPinochleGame(tracer=...)) or through the
+#   RLCARD_CTPINOCHLE_TRACE environment variable, which makes it easy to
+#   turn on for spawned DMC actors.
+#
+#   RLCARD_CTPINOCHLE_TRACE: path of the trace file (a .pkl suffix selects the binary format)
+#   RLCARD_CTPINOCHLE_TRACE_SAMPLE: fraction of games to trace (default 1.0)
+# =========================================
+
+TRACE_PATH_ENV_VAR = 'RLCARD_CTPINOCHLE_TRACE'
+TRACE_SAMPLE_ENV_VAR = 'RLCARD_CTPINOCHLE_TRACE_SAMPLE'
+
+
+class CTPinochleTracer(object):
+    '''
+        Buffers trace records in memory and appends them to a file in batches.
+        Records are plain dicts. The jsonl format writes one JSON object per line,
+        the pickle format appends one pickled list of records per batch.
+    '''
+
+    def __init__(self, path: str, sample_rate: float = 1.0, batch_size: int = 1024, fmt: Optional[str] = None, seed: Optional[int] = None):
+        if not 0.0 <= sample_rate <= 1.0:
+            raise Exception(f'CTPinochleTracer: invalid sample_rate={sample_rate}')
+        if fmt is None:
+            fmt = 'pickle' if path.endswith('.pkl') else 'jsonl'
+        if fmt not in ['jsonl', 'pickle']:
+            raise Exception(f'CTPinochleTracer: invalid fmt={fmt}')
+        self.path = path
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.fmt = fmt
+        # Separate random state so sampling never perturbs the game's np_random
+        self.np_random = np.random.RandomState(seed)
+        self.num_games = 0
+        self._records: List[dict] = []
+        atexit.register(self.flush)
+
+    def sample_game(self) -> Optional[int]:
+        ''' Decide whether the game that is starting should be traced, returning its trace game_id if so '''
+        self.num_games += 1
+        if self.sample_rate >= 1.0 or self.np_random.random_sample() < self.sample_rate:
+            return self.num_games
+        return None
+
+    def record(self, event: str, game_id: int, **fields):
+        fields['event'] = event
+        fields['pid'] = os.getpid()
+        fields['game_id'] = game_id
+        self._records.append(fields)
+        if len(self._records) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._records:
+            return
+        if self.fmt == 'jsonl':
+            with open(self.path, 'a') as trace_file:
+                for record in self._records:
+                    trace_file.write(json.dumps(record) + '\n')
+        else:
+            with open(self.path, 'ab') as trace_file:
+                pickle.dump(self._records, trace_file)
+        self._records = []
+
+    def close(self):
+        self.flush()
+        atexit.unregister(self.flush)
+
+
+_env_tracer: Optional[CTPinochleTracer] = None
+
+
+def tracer_from_env() -> Optional[CTPinochleTracer]:
+    ''' Process wide tracer configured by RLCARD_CTPINOCHLE_TRACE(_SAMPLE), or None when tracing is not requested '''
+    global _env_tracer
+    path = os.environ.get(TRACE_PATH_ENV_VAR)
+    if not path:
+        return None
+    if _env_tracer is None or _env_tracer.path != path:
+        sample_rate = float(os.environ.get(TRACE_SAMPLE_ENV_VAR, 1.0))
+        _env_tracer = CTPinochleTracer(path=path, sample_rate=sample_rate)
+    return _env_tracer
+
+
+def read_trace(path: str, fmt: Optional[str] = None) -> List[dict]:
+    ''' Load every record written to a trace file '''
+    if fmt is None:
+        fmt = 'pickle' if path.endswith('.pkl') else 'jsonl'
+    records = []
+    if fmt == 'jsonl':
+        with open(path) as trace_file:
+            for line in trace_file:
+                records.append(json.loads(line))
+    else:
+        with open(path, 'rb') as trace_file:
+            while True:
+                try:
+                    records += pickle.load(trace_file)
+                except EOFError:
+                    break
+    return records
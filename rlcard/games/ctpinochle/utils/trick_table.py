@@ -0,0 +1,96 @@
+'''
+    File name: ctpinochle/utils/trick_table.py
+    Author: Nol Patterson
+    Date created: 2/8/2026
+'''
+
+import os
+
+import numpy as np
+
+from .ctpinochle_card import CTPinochleCard
+
+# =========================================
+# Trick winner lookup table
+#   TRICK_WINNER_TABLE[first_card_id, second_card_id, third_card_id, trump_suit_index]
+#   is the play position (0, 1 or 2) of the card winning the trick.
+#   The table is int8 of shape (48, 48, 48, 4), about 430 KB. It is built on first
+#   use and cached to trick_winner_table.npy next to this file when possible.
+# =========================================
+
+TRICK_WINNER_TABLE_SHAPE = (48, 48, 48, 4)
+TRICK_WINNER_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'trick_winner_table.npy')
+
+_trick_winner_table = None
+
+
+def build_trick_winner_table() -> np.ndarray:
+    ''' Compute the trick winner table (see get_trick_winner_table) without touching the disk cache '''
+    deck = CTPinochleCard.get_deck()
+    suit_indices = np.array([card.suit_index for card in deck], dtype=np.int8)
+    rank_indices = np.array([card.rank_index for card in deck], dtype=np.int8)
+
+    card_ids = np.arange(48)
+    trick_card_ids = [
+        card_ids[:, np.newaxis, np.newaxis, np.newaxis],
+        card_ids[np.newaxis, :, np.newaxis, np.newaxis],
+        card_ids[np.newaxis, np.newaxis, :, np.newaxis],
+    ]
+    trump_suit_index = np.arange(4)[np.newaxis, np.newaxis, np.newaxis, :]
+
+    winning_suit_index = np.broadcast_to(suit_indices[trick_card_ids[0]], TRICK_WINNER_TABLE_SHAPE)
+    winning_rank_index = np.broadcast_to(rank_indices[trick_card_ids[0]], TRICK_WINNER_TABLE_SHAPE)
+    winning_position = np.zeros(TRICK_WINNER_TABLE_SHAPE, dtype=np.int8)
+    for position in range(1, 3):
+        card_suit_index = suit_indices[trick_card_ids[position]]
+        card_rank_index = rank_indices[trick_card_ids[position]]
+        # Trump beats non-trump, otherwise only a higher card of the same suit wins (the first of two equal cards wins)
+        is_trumping = (card_suit_index == trump_suit_index) & (winning_suit_index != trump_suit_index)
+        is_higher = (card_suit_index == winning_suit_index) & (card_rank_index > winning_rank_index)
+        is_winning = is_trumping | is_higher
+        winning_suit_index = np.where(is_winning, card_suit_index, winning_suit_index)
+        winning_rank_index = np.where(is_winning, card_rank_index, winning_rank_index)
+        winning_position[is_winning] = position
+    return winning_position
+
+
+def _load_trick_winner_table():
+    try:
+        table = np.load(TRICK_WINNER_TABLE_PATH)
+    except (OSError, ValueError):
+        return None
+    if table.shape != TRICK_WINNER_TABLE_SHAPE or table.dtype != np.int8:
+        return None
+    return table
+
+
+def _save_trick_winner_table(table: np.ndarray):
+    # Write to a temporary file first so a concurrent reader never sees a partial table
+    temp_path = f'{TRICK_WINNER_TABLE_PATH}.{os.getpid()}.tmp'
+    try:
+        with open(temp_path, 'wb') as file:
+            np.save(file, table)
+        os.replace(temp_path, TRICK_WINNER_TABLE_PATH)
+    except OSError:
+        # Read-only install, keep the table in memory only
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def get_trick_winner_table() -> np.ndarray:
+    '''
+    Get the read-only trick winner table, loading it from the disk cache or building it on first use
+
+    Returns:
+        (np.ndarray): int8 array of shape (48, 48, 48, 4). Entry [first_card_id, second_card_id,
+            third_card_id, trump_suit_index] is the play position of the winning card
+    '''
+    global _trick_winner_table
+    if _trick_winner_table is None:
+        table = _load_trick_winner_table()
+        if table is None:
+            table = build_trick_winner_table()
+            _save_trick_winner_table(table)
+        table.flags.writeable = False
+        _trick_winner_table = table
+    return _trick_winner_table
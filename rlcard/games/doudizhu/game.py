@@ -9,6 +9,7 @@ from rlcard.games.doudizhu.utils import cards2str, doudizhu_sort_card, CARD_RANK
 from rlcard.games.doudizhu import Player
 from rlcard.games.doudizhu import Round
 from rlcard.games.doudizhu import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 
 class DoudizhuGame:
@@ -107,6 +108,23 @@ class DoudizhuGame:
         self.state = self.get_state(self.round.current_player)
         return True
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        return take_snapshot([self, self.round, self.judger] + self.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_state(self, player_id):
         ''' Return player's state
 
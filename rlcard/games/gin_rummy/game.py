@@ -6,6 +6,8 @@
 
 import numpy as np
 
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
+
 from .player import GinRummyPlayer
 from .round import GinRummyRound
 from .judge import GinRummyJudge
@@ -78,6 +80,23 @@ class GinRummyGame:
         '''
         raise NotImplementedError
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        return take_snapshot([self, self.round, self.round.dealer] + self.round.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_num_players(self):
         ''' Return the number of players in the game
         '''
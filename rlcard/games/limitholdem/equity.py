@@ -0,0 +1,165 @@
+''' Monte Carlo equity of holdem hands
+
+estimate_equity samples the unknown public cards and the hands of the
+opponents many times at once and scores all of them with
+evaluate_hands_batch.
+
+Before the flop, the equity only depends on the class of the hand: a pair,
+or two ranks suited or offsuit, 169 classes. Their equities are kept in a
+table built on first use for a number of opponents, and cached next to this
+file when possible, in preflop_equity_<num_opponents>_<num_samples>_<seed>.npy
+so that changing the sampling never loads a stale table.
+'''
+import os
+
+import numpy as np
+
+from rlcard.games.limitholdem.evaluator import RANK_LOOKUP, evaluate_hands_batch
+
+# Card string -> card id of card2index.json
+CARD_IDS = {suit + rank: 13 * suit_index + rank_index
+            for suit_index, suit in enumerate('SHDC')
+            for rank_index, rank in enumerate('A23456789TJQK')}
+
+NUM_PREFLOP_CLASSES = 169
+PREFLOP_NUM_SAMPLES = 10000
+PREFLOP_SEED = 0
+PREFLOP_EQUITY_TABLE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Bounds the memory of the samples drawn at once
+_CHUNK_SIZE = 8192
+
+_preflop_equity_tables = {}
+
+def estimate_equity(hand, public_cards=None, num_opponents=1, num_samples=10000, np_random=None):
+    ''' Estimate the probabilities to win and to tie at the showdown against random hands
+
+    Args:
+        hand (list): The two hand cards, e.g. ['SA', 'HK']
+        public_cards (list): The 0 to 5 public cards known so far
+        num_opponents (int): The number of opponents, each with two random cards
+        num_samples (int): The number of sampled showdowns
+        np_random (numpy.random.RandomState): The random generator, a new one by default
+
+    Returns:
+        (tuple): The probability to win, and to share the best hand with at least one opponent
+    '''
+    public_cards = list(public_cards) if public_cards else []
+    if len(hand) != 2:
+        raise ValueError('A hand has 2 cards, not {}'.format(len(hand)))
+    if len(public_cards) > 5:
+        raise ValueError('There are at most 5 public cards, not {}'.format(len(public_cards)))
+    known_cards = [CARD_IDS[card] for card in list(hand) + public_cards]
+    if len(set(known_cards)) != len(known_cards):
+        raise ValueError('A card is both in the hand and the public cards, or twice in one of them')
+    num_board_draws = 5 - len(public_cards)
+    num_draws = num_board_draws + 2 * num_opponents
+    if num_opponents < 1 or num_draws > 52 - len(known_cards):
+        raise ValueError('Not enough cards for {} opponents'.format(num_opponents))
+    if np_random is None:
+        np_random = np.random.RandomState()
+
+    remaining_cards = np.setdiff1d(np.arange(52), known_cards)
+    num_wins = 0
+    num_ties = 0
+    for start in range(0, num_samples, _CHUNK_SIZE):
+        chunk_size = min(_CHUNK_SIZE, num_samples - start)
+        # The first num_draws cards of random permutations of the remaining cards
+        order = np.argsort(np_random.rand(chunk_size, len(remaining_cards)), axis=1)[:, :num_draws]
+        draws = remaining_cards[order]
+        board = np.hstack([np.broadcast_to(known_cards[2:], (chunk_size, len(public_cards))),
+                           draws[:, :num_board_draws]]).astype(np.int64)
+        strength = evaluate_hands_batch(np.hstack([np.broadcast_to(known_cards[:2], (chunk_size, 2)), board]))
+        opponent_hands = draws[:, num_board_draws:].reshape(chunk_size, num_opponents, 2)
+        opponent_cards = np.concatenate([opponent_hands, np.broadcast_to(board[:, np.newaxis, :], (chunk_size, num_opponents, 5))], axis=2)
+        best_opponent_strength = evaluate_hands_batch(opponent_cards.reshape(-1, 7)).reshape(chunk_size, num_opponents).max(axis=1)
+        num_wins += int(np.count_nonzero(strength > best_opponent_strength))
+        num_ties += int(np.count_nonzero(strength == best_opponent_strength))
+    return num_wins / num_samples, num_ties / num_samples
+
+def get_preflop_class(hand):
+    ''' Get the class of two hand cards, its row in the preflop equity table
+
+    Args:
+        hand (list): The two hand cards, e.g. ['SA', 'HK']
+
+    Returns:
+        (int): 13 * rank + rank for a pair, 13 * high + low for suited and 13 * low + high for
+            offsuit cards, where 0 is the rank 2 and 12 the ace
+    '''
+    first_rank, second_rank = RANK_LOOKUP.index(hand[0][1]), RANK_LOOKUP.index(hand[1][1])
+    high, low = max(first_rank, second_rank), min(first_rank, second_rank)
+    if hand[0][0] == hand[1][0]:
+        return 13 * high + low
+    return 13 * low + high
+
+def build_preflop_equity_table(num_opponents=1, num_samples=PREFLOP_NUM_SAMPLES, seed=PREFLOP_SEED):
+    ''' Estimate the preflop equity of every class (see get_preflop_equity_table) without touching the disk cache '''
+    np_random = np.random.RandomState(seed)
+    table = np.zeros((NUM_PREFLOP_CLASSES, 2))
+    for high in range(13):
+        for low in range(high + 1):
+            # The suited class of two ranks is also the class of the pair
+            hands = [['S' + RANK_LOOKUP[high], 'S' + RANK_LOOKUP[low]], ['S' + RANK_LOOKUP[high], 'H' + RANK_LOOKUP[low]]]
+            for hand in hands[1:] if high == low else hands:
+                table[get_preflop_class(hand)] = estimate_equity(hand, num_opponents=num_opponents,
+                                                                 num_samples=num_samples, np_random=np_random)
+    return table
+
+def _preflop_equity_table_path(num_opponents, num_samples, seed):
+    return os.path.join(PREFLOP_EQUITY_TABLE_DIR, 'preflop_equity_{}_{}_{}.npy'.format(num_opponents, num_samples, seed))
+
+def _load_preflop_equity_table(path):
+    try:
+        table = np.load(path)
+    except (OSError, ValueError):
+        return None
+    if table.shape != (NUM_PREFLOP_CLASSES, 2) or table.dtype != np.float64:
+        return None
+    return table
+
+def _save_preflop_equity_table(path, table):
+    # Write to a temporary file first so a concurrent reader never sees a partial table
+    temp_path = '{}.{}.tmp'.format(path, os.getpid())
+    try:
+        with open(temp_path, 'wb') as file:
+            np.save(file, table)
+        os.replace(temp_path, path)
+    except OSError:
+        # Read-only install, keep the table in memory only
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def get_preflop_equity_table(num_opponents=1):
+    '''
+    Get the read-only preflop equity table, loading it from the disk cache or building it on first use
+
+    Args:
+        num_opponents (int): The number of opponents
+
+    Returns:
+        (numpy.array): float64 array of shape (169, 2). Row get_preflop_class(hand) is the
+            probability to win and to tie of the hand before the flop
+    '''
+    if num_opponents not in _preflop_equity_tables:
+        path = _preflop_equity_table_path(num_opponents, PREFLOP_NUM_SAMPLES, PREFLOP_SEED)
+        table = _load_preflop_equity_table(path)
+        if table is None:
+            table = build_preflop_equity_table(num_opponents, PREFLOP_NUM_SAMPLES, PREFLOP_SEED)
+            _save_preflop_equity_table(path, table)
+        table.flags.writeable = False
+        _preflop_equity_tables[num_opponents] = table
+    return _preflop_equity_tables[num_opponents]
+
+def get_preflop_equity(hand, num_opponents=1):
+    ''' Get the probabilities to win and to tie of two hand cards before the flop, from the table
+
+    Args:
+        hand (list): The two hand cards, e.g. ['SA', 'HK']
+        num_opponents (int): The number of opponents
+
+    Returns:
+        (tuple): The probability to win, and to share the best hand with at least one opponent
+    '''
+    win, tie = get_preflop_equity_table(num_opponents)[get_preflop_class(hand)]
+    return float(win), float(tie)
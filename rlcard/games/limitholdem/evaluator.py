@@ -0,0 +1,222 @@
+''' Table driven evaluation of holdem hands
+
+A hand of 5 to 7 cards is mapped to one integer, its strength, so that
+comparing two hands is comparing two integers. The category of the hand
+(1: High Card, ..., 9: Straight Flush, as in Hand.category) is in the bits
+from CATEGORY_SHIFT up, and the ranks that break ties within the category
+are packed below it, 4 bits each, the most significant first.
+
+evaluate_hand takes card strings, evaluate_hands_batch scores arrays of card
+ids, the index of the card in card2index.json, with one NumPy call.
+
+Two tables are built on first use:
+    the flush table maps the 13 bit mask of the ranks of one suit to the
+    strength of the best flush or straight flush in it,
+    the rank table maps the multiset of the ranks, as the sum of
+    5 ** rank over the cards, to the strength of the best hand without flush.
+'''
+from itertools import combinations_with_replacement
+
+import numpy as np
+
+RANK_LOOKUP = '23456789TJQKA'
+SUIT_LOOKUP = 'SCDH'
+CATEGORY_SHIFT = 20
+
+_FLUSH_TABLE = None
+_RANK_TABLE = None
+# The same tables as arrays for evaluate_hands_batch, the rank table as sorted keys
+_FLUSH_STRENGTHS = None
+_RANK_KEYS = None
+_RANK_STRENGTHS = None
+
+class _CardInfo(dict):
+    ''' Card string -> (5 ** rank, suit, 1 << rank). Suits outside SUIT_LOOKUP
+        go to the extra suit 4, which never makes a flush
+    '''
+    def __missing__(self, card):
+        rank = RANK_LOOKUP.index(card[1])
+        suit = SUIT_LOOKUP.find(card[0])
+        info = (5 ** rank, suit if suit >= 0 else 4, 1 << rank)
+        self[card] = info
+        return info
+
+_CARD_INFO = _CardInfo()
+
+def evaluate_hand(cards):
+    ''' Get the strength of the best five cards of a hand
+
+    Args:
+        cards (list): 5 to 7 card strings, e.g. ['SA', 'HT', 'D2', 'C5', 'S9', 'ST', 'H4']
+
+    Returns:
+        (int): The strength, a greater strength is a better hand and equal strengths are a draw
+    '''
+    if not 5 <= len(cards) <= 7:
+        raise ValueError('A hand has 5 to 7 cards, not {}'.format(len(cards)))
+    if _RANK_TABLE is None:
+        _build_tables()
+
+    rank_key = 0
+    suit_masks = [0, 0, 0, 0, 0]
+    for card in cards:
+        key, suit, bit = _CARD_INFO[card]
+        rank_key += key
+        suit_masks[suit] |= bit
+    flush_table = _FLUSH_TABLE
+    return max(_RANK_TABLE[rank_key],
+               flush_table[suit_masks[0]],
+               flush_table[suit_masks[1]],
+               flush_table[suit_masks[2]],
+               flush_table[suit_masks[3]])
+
+def evaluate_hands_batch(cards):
+    ''' Get the strengths of many hands at once
+
+    Args:
+        cards (numpy.array): Card ids of shape (N, 5) to (N, 7), a row is the distinct cards
+            of one hand. A card id is its index in card2index.json, 13 * suit + rank with the
+            suits S, H, D, C and the ranks A, 2, ..., K
+
+    Returns:
+        (numpy.array): int32 array of shape (N,), the strengths of evaluate_hand
+    '''
+    cards = np.asarray(cards)
+    if cards.ndim != 2 or not 5 <= cards.shape[1] <= 7:
+        raise ValueError('Expected card ids of shape (N, 5) to (N, 7), got {}'.format(cards.shape))
+    if not np.issubdtype(cards.dtype, np.integer):
+        raise ValueError('Card ids are integers, not {}'.format(cards.dtype))
+    cards = cards.astype(np.int64)
+    if cards.size and (cards.min() < 0 or cards.max() > 51):
+        raise ValueError('Card ids are between 0 and 51')
+    if np.any(np.diff(np.sort(cards, axis=1), axis=1) == 0):
+        raise ValueError('A hand has the same card twice')
+    if _RANK_TABLE is None:
+        _build_tables()
+
+    suits = cards // 13
+    # The ace is the highest rank of the tables
+    ranks = (cards - 1) % 13
+    rank_keys = (5 ** ranks).sum(axis=1)
+    strengths = _RANK_STRENGTHS[np.searchsorted(_RANK_KEYS, rank_keys)]
+
+    rank_bits = 1 << ranks
+    for suit in range(4):
+        suit_masks = np.bitwise_or.reduce(np.where(suits == suit, rank_bits, 0), axis=1)
+        np.maximum(strengths, _FLUSH_STRENGTHS[suit_masks], out=strengths)
+    return strengths
+
+def get_hand_category(strength):
+    ''' Get the category of a strength
+
+    Args:
+        strength (int): A strength from evaluate_hand
+
+    Returns:
+        (int): The category, 1 for High Card to 9 for Straight Flush
+    '''
+    return strength >> CATEGORY_SHIFT
+
+def _make_strengths(category, ranks):
+    ''' Pack a category and the columns of tie breaking ranks into strengths
+    '''
+    strengths = np.full(len(ranks), category, dtype=np.int64)
+    for i in range(5):
+        strengths <<= 4
+        if i < ranks.shape[1]:
+            strengths |= ranks[:, i]
+    return strengths
+
+def _top_ranks(has_rank, k):
+    ''' The k highest ranks present in every row of a boolean array of shape (N, 13),
+        0 where a row has less than k ranks
+    '''
+    descending = has_rank[:, ::-1].copy()
+    rows = np.arange(len(has_rank))
+    top_ranks = np.zeros((len(has_rank), k), dtype=np.int64)
+    for i in range(k):
+        first = descending.argmax(axis=1)
+        top_ranks[:, i] = np.where(descending[rows, first], 12 - first, 0)
+        descending[rows, first] = False
+    return top_ranks
+
+def _straight_highs(rank_masks):
+    ''' The highest rank of the best straight in every rank mask, -1 without straight
+    '''
+    highs = np.full(len(rank_masks), -1, dtype=np.int64)
+    # A, 2, 3, 4, 5 first, so that higher straights override it
+    wheel = 0b1000000001111
+    highs[rank_masks & wheel == wheel] = 3
+    for high in range(4, 13):
+        straight = 0b11111 << (high - 4)
+        highs[rank_masks & straight == straight] = high
+    return highs
+
+def _rank_strengths(counts):
+    ''' The strengths of the best five cards of the multisets of ranks given by the
+        rank counts of shape (N, 13), without flush
+    '''
+    rank_masks = (counts > 0).astype(np.int64) @ (1 << np.arange(13))
+    straight_highs = _straight_highs(rank_masks)
+    ranks = np.arange(13)
+
+    quads = _top_ranks(counts == 4, 1)
+    trips = _top_ranks(counts == 3, 1)
+    pairs = _top_ranks(counts == 2, 2)
+    # The pair of a full house can be the lower one of two trips
+    full_house_pairs = _top_ranks((counts >= 2) & (ranks != trips), 1)
+
+    has_quads = (counts == 4).any(axis=1)
+    has_trips = (counts == 3).any(axis=1)
+    num_pairs = (counts == 2).sum(axis=1)
+    is_full_house = has_trips & ((counts >= 2).sum(axis=1) >= 2)
+
+    conditions = [
+        has_quads,
+        is_full_house,
+        straight_highs >= 0,
+        has_trips,
+        num_pairs >= 2,
+        num_pairs == 1,
+    ]
+    choices = [
+        _make_strengths(8, np.hstack([quads, _top_ranks((counts > 0) & (ranks != quads), 1)])),
+        _make_strengths(7, np.hstack([trips, full_house_pairs])),
+        _make_strengths(5, straight_highs[:, np.newaxis]),
+        _make_strengths(4, np.hstack([trips, _top_ranks(counts == 1, 2)])),
+        _make_strengths(3, np.hstack([pairs, _top_ranks((counts > 0) & (ranks != pairs[:, :1]) & (ranks != pairs[:, 1:]), 1)])),
+        _make_strengths(2, np.hstack([pairs[:, :1], _top_ranks(counts == 1, 3)])),
+    ]
+    return np.select(conditions, choices, _make_strengths(1, _top_ranks(counts == 1, 5)))
+
+def _build_tables():
+    global _FLUSH_TABLE, _RANK_TABLE, _FLUSH_STRENGTHS, _RANK_KEYS, _RANK_STRENGTHS
+
+    rank_masks = np.arange(1 << 13)
+    has_rank = (rank_masks[:, np.newaxis] >> np.arange(13) & 1).astype(bool)
+    straight_highs = _straight_highs(rank_masks)
+    flush_table = np.where(straight_highs >= 0,
+                           _make_strengths(9, straight_highs[:, np.newaxis]),
+                           _make_strengths(6, _top_ranks(has_rank, 5)))
+    flush_table[has_rank.sum(axis=1) < 5] = 0
+
+    # Every multiset of 5 to 7 ranks with at most 4 cards of a rank
+    counts = []
+    for num_cards in range(5, 8):
+        hand_ranks = np.array(list(combinations_with_replacement(range(13), num_cards)))
+        hand_counts = np.zeros((len(hand_ranks), 13), dtype=np.int64)
+        for i in range(num_cards):
+            hand_counts[np.arange(len(hand_ranks)), hand_ranks[:, i]] += 1
+        counts.append(hand_counts[hand_counts.max(axis=1) <= 4])
+    counts = np.vstack(counts)
+    rank_keys = counts @ (5 ** np.arange(13))
+    rank_strengths = _rank_strengths(counts)
+    order = np.argsort(rank_keys)
+
+    _FLUSH_STRENGTHS = flush_table.astype(np.int32)
+    _RANK_KEYS = rank_keys[order]
+    _RANK_STRENGTHS = rank_strengths[order].astype(np.int32)
+    for table in (_FLUSH_STRENGTHS, _RANK_KEYS, _RANK_STRENGTHS):
+        table.flags.writeable = False
+    _FLUSH_TABLE = flush_table.tolist()
+    _RANK_TABLE = dict(zip(rank_keys.tolist(), rank_strengths.tolist()))
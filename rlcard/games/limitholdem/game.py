@@ -5,6 +5,7 @@ from rlcard.games.limitholdem import Dealer
 from rlcard.games.limitholdem import Player, PlayerStatus
 from rlcard.games.limitholdem import Judger
 from rlcard.games.limitholdem import Round
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 
 class LimitHoldemGame:
@@ -168,6 +169,25 @@ class LimitHoldemGame:
             return True
         return False
 
+    def clone_state(self):
+        """
+        Take a compact snapshot of the game to branch from, see restore_state.
+        Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        """
+        return take_snapshot([self, self.dealer, self.round] + self.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        """
+        Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        """
+        restore_snapshot(snapshot)
+
     def get_num_players(self):
         """
         Return the number of players in limit texas holdem
@@ -1,5 +1,7 @@
 import numpy as np
 
+from rlcard.games.limitholdem.evaluator import evaluate_hand
+
 class Hand:
     def __init__(self, all_cards):
         self.all_cards = all_cards # two hand cards + five public cards
@@ -540,33 +542,12 @@ def compare_hands(hands):
     elif hands[1] == None:
         return [1, 0]
     '''
-    hand_category = [] #such as high_card, straight_flush, etc
-    all_players = [0]*len(hands) #all the players in this round, 0 for losing and 1 for winning or draw
-    if None in hands:
-        fold_players = [i for i, j in enumerate(hands) if j is None]
-        if len(fold_players) == len(all_players) - 1:
-            for _ in enumerate(hands):
-                if _[0] in fold_players:
-                    all_players[_[0]] = 0
-                else:
-                    all_players[_[0]] = 1
-            return all_players
-        else:
-            for _ in enumerate(hands):
-                if hands[_[0]] is not None:
-                    hand = Hand(hands[_[0]])
-                    hand.evaluateHand()
-                    hand_category.append(hand.category)
-                elif hands[_[0]] is None:
-                    hand_category.append(0)
-    else:
-            for i in enumerate(hands):
-                hand = Hand(hands[i[0]])
-                hand.evaluateHand()
-                hand_category.append(hand.category)
-    potential_winner_index = [i for i, j in enumerate(hand_category) if j == max(hand_category)]# potential winner are those with same max card_catagory
-
-    return final_compare(hands, potential_winner_index, all_players)
+    if sum(hand is not None for hand in hands) == 1:
+        return [0 if hand is None else 1 for hand in hands]
+    # The strengths order the hands, including the ties within a category
+    strengths = [-1 if hand is None else evaluate_hand(hand) for hand in hands]
+    best_strength = max(strengths)
+    return [1 if strength == best_strength else 0 for strength in strengths]
 
 def final_compare(hands, potential_winner_index, all_players):
     '''
@@ -5,6 +5,7 @@ from rlcard.games.mahjong import Dealer
 from rlcard.games.mahjong import Player
 from rlcard.games.mahjong import Round
 from rlcard.games.mahjong import Judger
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 class MahjongGame:
 
@@ -81,6 +82,23 @@ class MahjongGame:
         self.dealer, self.players, self.round = self.history.pop()
         return True
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        return take_snapshot([self, self.dealer, self.round] + self.players, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_state(self, player_id):
         ''' Return player's state
 
@@ -4,6 +4,7 @@ import numpy as np
 from rlcard.games.uno import Dealer
 from rlcard.games.uno import Player
 from rlcard.games.uno import Round
+from rlcard.utils.snapshot import take_snapshot, restore_snapshot
 
 
 class UnoGame:
@@ -91,6 +92,28 @@ class UnoGame:
         self.dealer, self.players, self.round = self.history.pop()
         return True
 
+    def clone_state(self):
+        ''' Take a compact snapshot of the game to branch from, see restore_state.
+            Only the containers of the game objects are copied, the cards are shared
+            except the wild cards, whose color is set when they are played
+
+        Returns:
+            (GameSnapshot): The snapshot
+        '''
+        cards = self.dealer.deck + self.round.played_cards
+        for player in self.players:
+            cards += player.hand
+        wild_cards = [card for card in cards if card.type == 'wild']
+        return take_snapshot([self, self.dealer, self.round] + self.players + wild_cards, self.np_random)
+
+    def restore_state(self, snapshot):
+        ''' Return the game to a snapshot from clone_state. The snapshot can be restored any number of times
+
+        Args:
+            snapshot (GameSnapshot): The snapshot
+        '''
+        restore_snapshot(snapshot)
+
     def get_state(self, player_id):
         ''' Return player's state
 
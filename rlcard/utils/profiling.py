@@ -0,0 +1,200 @@
+''' Opt-in timing of the phases of a game loop, see Env.enable_profiling
+'''
+import time
+
+class LatencyHistogram(object):
+    '''
+    HDR style histogram of durations in nanoseconds. Values below
+    2**sub_bucket_bits are counted exactly, larger values go to buckets
+    that split every power of two into 2**(sub_bucket_bits - 1) linear
+    sub buckets, so every value is kept with a relative error below
+    2**(1 - sub_bucket_bits) whatever its magnitude.
+    '''
+    def __init__(self, sub_bucket_bits=6):
+        ''' Initialize the histogram
+
+        Args:
+            sub_bucket_bits (int): Precision of the buckets, 6 gives about 3%
+        '''
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count >> 1
+        self.reset()
+
+    def reset(self):
+        ''' Forget all the recorded values
+        '''
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = {}
+
+    def record(self, value):
+        ''' Record a duration
+
+        Args:
+            value (int): The duration in nanoseconds
+        '''
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if value < self.sub_bucket_count:
+            index = value
+        else:
+            exponent = value.bit_length() - self.sub_bucket_bits
+            index = exponent * self.half_count + (value >> exponent)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, percent):
+        ''' Estimate a percentile of the recorded values
+
+        Args:
+            percent (float): The percentile, between 0 and 100
+
+        Returns:
+            (float): The value in nanoseconds, the middle of its bucket, or None if nothing was recorded
+        '''
+        if self.count == 0:
+            return None
+        rank = max(1, int(round(percent / 100.0 * self.count)))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                low, width = self._bucket_range(index)
+                # Clamp so that the estimate never leaves the recorded range
+                return float(min(max(low + (width - 1) / 2.0, self.min), self.max))
+        return float(self.max)
+
+    def _bucket_range(self, index):
+        if index < self.sub_bucket_count:
+            return index, 1
+        exponent = (index - self.sub_bucket_count) // self.half_count + 1
+        return (index - exponent * self.half_count) << exponent, 1 << exponent
+
+class _TimedFunction(object):
+    '''
+    Records the duration of every call of a function. Unlike a closure, it is
+    deep copied and pickled with the object of a bound method, so the copy of
+    a profiled game steps the copy, and records into a copy of the histogram
+    '''
+    def __init__(self, function, histogram):
+        self.function = function
+        self.histogram = histogram
+
+    def __call__(self, *args, **kwargs):
+        start = time.perf_counter_ns()
+        try:
+            return self.function(*args, **kwargs)
+        finally:
+            self.histogram.record(time.perf_counter_ns() - start)
+
+class _ProfiledAgent(object):
+    ''' Times step and eval_step of an agent and forwards everything else to it
+    '''
+    def __init__(self, agent, profiler):
+        self.agent = agent
+        self._step = profiler.time_function(agent.step, 'agent.step')
+        self._eval_step = profiler.time_function(agent.eval_step, 'agent.eval_step')
+
+    def step(self, state):
+        return self._step(state)
+
+    def eval_step(self, state):
+        return self._eval_step(state)
+
+    def __getattr__(self, name):
+        # Copies and unpickled wrappers look up attributes before agent is restored
+        if name == 'agent':
+            raise AttributeError(name)
+        return getattr(self.agent, name)
+
+class Profiler(object):
+    '''
+    Times methods of existing objects by shadowing them with timed wrappers
+    on the instances. Nothing in the classes changes, so objects that are
+    not instrumented, or not anymore, run at full speed.
+    '''
+    def __init__(self):
+        self.histograms = {}
+        self._instrumented = []
+
+    def time_function(self, function, phase):
+        ''' Wrap a function so that every call is recorded under a phase
+
+        Args:
+            function (callable): The function to time
+            phase (string): The name of the phase
+
+        Returns:
+            (callable): The timed function
+        '''
+        return _TimedFunction(function, self.histograms.setdefault(phase, LatencyHistogram()))
+
+    def instrument(self, obj, method_name, phase):
+        ''' Time a method of one object, if it has it
+
+        Args:
+            obj (object): The object
+            method_name (string): The name of the method
+            phase (string): The name of the phase
+        '''
+        method = getattr(obj, method_name, None)
+        if method is None:
+            return
+        obj_dict = vars(obj)
+        self._instrumented.append((obj, method_name, method_name in obj_dict, obj_dict.get(method_name)))
+        obj_dict[method_name] = self.time_function(method, phase)
+
+    def profile_agents(self, agents):
+        ''' Time step and eval_step of agents
+
+        Args:
+            agents (list): The agents
+
+        Returns:
+            (list): Wrappers of the agents that forward everything else to them
+        '''
+        return [_ProfiledAgent(agent, self) for agent in agents]
+
+    def uninstrument(self):
+        ''' Remove the timed wrappers of instrument, the histograms are kept
+        '''
+        for obj, method_name, had_attribute, previous in reversed(self._instrumented):
+            if had_attribute:
+                vars(obj)[method_name] = previous
+            else:
+                vars(obj).pop(method_name, None)
+        self._instrumented = []
+
+    def reset(self):
+        ''' Forget all the recorded durations
+        '''
+        for histogram in self.histograms.values():
+            histogram.reset()
+
+    def get_stats(self):
+        ''' Summaries of the recorded phases
+
+        Returns:
+            (dict): For every phase with calls, a dict with count, total_s and the
+                mean, p50, p90, p99 and max durations in microseconds
+        '''
+        stats = {}
+        for phase, histogram in sorted(self.histograms.items()):
+            if histogram.count == 0:
+                continue
+            stats[phase] = {
+                'count': histogram.count,
+                'total_s': histogram.total / 1e9,
+                'mean_us': histogram.total / histogram.count / 1e3,
+                'p50_us': histogram.percentile(50) / 1e3,
+                'p90_us': histogram.percentile(90) / 1e3,
+                'p99_us': histogram.percentile(99) / 1e3,
+                'max_us': histogram.max / 1e3,
+            }
+        return stats
@@ -40,6 +40,58 @@ def np_random(seed=None):
     rng.seed(_int_list_from_bigint(hash_seed(seed)))
     return rng, seed
 
+def seed_sequence(seed=None, *spawn_key):
+    """Return the SeedSequence of one random stream of a run, e.g.
+    seed_sequence(run_seed, worker_id, env_id) for an environment of a worker.
+
+    Streams are addressed by counters instead of being handed out by a
+    parent: the result is the same as spawning the children of
+    SeedSequence(seed) one level per counter, so every process can derive
+    its own streams without coordination, and the streams never overlap.
+
+    Args:
+        seed (Optional[int]): The seed of the run. None draws it from the
+            operating system, read it back from the entropy attribute.
+        spawn_key: Non-negative counters, from the outermost level down.
+    """
+    return np.random.SeedSequence(seed, spawn_key=tuple(int(key) for key in spawn_key))
+
+def child_seed_sequence(parent, index):
+    """Return the index-th child of a SeedSequence. Unlike parent.spawn,
+    it does not depend on how many children were spawned before.
+
+    Args:
+        parent (numpy.random.SeedSequence): The parent sequence.
+        index (int): The counter of the child, e.g. an environment or episode index.
+    """
+    return np.random.SeedSequence(parent.entropy, spawn_key=parent.spawn_key + (int(index),), pool_size=parent.pool_size)
+
+def np_random_from_seed_sequence(seed):
+    """Return a RandomState driven by a PCG64 generator seeded from a
+    SeedSequence. The games keep using the RandomState methods.
+
+    Args:
+        seed (numpy.random.SeedSequence): The sequence of the stream.
+    """
+    return np.random.RandomState(np.random.PCG64(seed))
+
+def spawn_env_seeds(seed, start, stop):
+    """Return the seeds of environments start to stop - 1 of a group of
+    environments sharing one seed: the index-th child of the SeedSequence,
+    or of seed_sequence(seed) for an int seed, and None for None. Unlike
+    seed + index, the groups of two different seeds never share a stream.
+
+    Args:
+        seed (Optional[int, numpy.random.SeedSequence]): The seed of the group.
+        start (int): The index of the first environment.
+        stop (int): One past the index of the last environment.
+    """
+    if seed is None:
+        return [None for _ in range(start, stop)]
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = seed_sequence(seed)
+    return [child_seed_sequence(seed, index) for index in range(start, stop)]
+
 def hash_seed(seed=None, max_bytes=8):
     """Any given evaluation is likely to have many PRNG's active at
     once. (Most commonly, because the environment is running in
@@ -0,0 +1,82 @@
+''' Compact snapshots of game objects for clone_state / restore_state
+'''
+import numpy as np
+
+class GameSnapshot(object):
+    ''' The attributes of the stateful objects of a game and the state of its random generator.
+
+    Only containers (lists, dicts, sets, tuples) and writeable NumPy arrays are
+    copied. Everything else (cards, moves, actions, the objects themselves) is
+    shared, since games never modify those in place. Containers shared by several
+    attributes stay shared in the copies.
+    '''
+    __slots__ = ('object_attributes', 'np_random', 'random_state')
+
+    def __init__(self, object_attributes, np_random, random_state):
+        self.object_attributes = object_attributes
+        self.np_random = np_random
+        self.random_state = random_state
+
+def take_snapshot(objects, np_random):
+    ''' Snapshot the attributes of objects
+
+    Args:
+        objects (list): The stateful objects of the game, e.g. the game, its round, dealer and players
+        np_random (numpy.random.RandomState): The random generator of the game
+
+    Returns:
+        (GameSnapshot): The snapshot
+    '''
+    memo = {}
+    object_attributes = tuple((obj, _copy_containers(vars(obj), memo)) for obj in objects)
+    return GameSnapshot(object_attributes, np_random, np_random.get_state())
+
+def restore_snapshot(snapshot):
+    ''' Write a snapshot back into the objects it was taken from and reset the
+    random generator. The snapshot is not consumed and can be restored again.
+
+    Args:
+        snapshot (GameSnapshot): A snapshot from take_snapshot
+
+    Returns:
+        (list): The objects that were restored, in the order they were passed to take_snapshot
+    '''
+    memo = {}
+    objects = []
+    for obj, attributes in snapshot.object_attributes:
+        obj_dict = vars(obj)
+        obj_dict.clear()
+        obj_dict.update(_copy_containers(attributes, memo))
+        objects.append(obj)
+    snapshot.np_random.set_state(snapshot.random_state)
+    return objects
+
+def _copy_containers(value, memo):
+    value_type = type(value)
+    if value_type in (int, float, str, bool) or value is None:
+        return value
+    value_id = id(value)
+    if value_id in memo:
+        return memo[value_id]
+    if value_type is list:
+        new_value = []
+        memo[value_id] = new_value
+        new_value.extend(_copy_containers(item, memo) for item in value)
+    elif isinstance(value, dict):
+        new_value = value.copy()
+        memo[value_id] = new_value
+        for key, item in value.items():
+            new_value[key] = _copy_containers(item, memo)
+    elif value_type is tuple:
+        new_value = tuple(_copy_containers(item, memo) for item in value)
+        memo[value_id] = new_value
+    elif value_type is set:
+        new_value = set(_copy_containers(item, memo) for item in value)
+        memo[value_id] = new_value
+    elif value_type is np.ndarray and value.flags.writeable:
+        new_value = value.copy()
+        memo[value_id] = new_value
+    else:
+        # Cards, moves, actions, game objects and read-only arrays are shared
+        return value
+    return new_value
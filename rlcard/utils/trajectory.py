@@ -0,0 +1,126 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Columns of the transitions of one player, row i is the i-th transition
+Transitions = namedtuple('Transitions', ['obs', 'legal_mask', 'actions', 'rewards', 'next_obs', 'next_legal_mask', 'dones'])
+
+class TrajectoryRecorder(object):
+    '''
+    Records the trajectories of a game into preallocated NumPy columns, one set
+    of columns per player, instead of the nested lists of state dicts built by
+    Env.run. Pass it to Env.run(recorder=...) and read the transitions with
+    get_transitions, which returns views of the columns without copying.
+
+    The columns are reused: reset clears them for the next game, so copy the
+    transitions that must outlive it.
+    '''
+    def __init__(self, num_players, num_actions, capacity=64):
+        ''' Initialize the recorder
+
+        Args:
+            num_players (int): The number of players
+            num_actions (int): The size of the action space
+            capacity (int): The initial number of states per player, the columns grow as needed
+        '''
+        self.num_players = num_players
+        self.num_actions = num_actions
+        self.capacity = capacity
+        # The column of a player is allocated on its first state, once the observation shape
+        # and dtype are known, the players of some games observe states of different shapes
+        self.obs = [None for _ in range(num_players)]
+        self.legal_mask = [np.zeros((capacity, num_actions), dtype=bool) for _ in range(num_players)]
+        self.actions = [np.zeros(capacity, dtype=np.int64) for _ in range(num_players)]
+        self.num_states = [0 for _ in range(num_players)]
+        self.num_actions_taken = [0 for _ in range(num_players)]
+        self.payoffs = np.zeros(num_players)
+
+    def reset(self):
+        ''' Clear the recorded game, keeping the allocated columns
+        '''
+        self.num_states = [0 for _ in range(self.num_players)]
+        self.num_actions_taken = [0 for _ in range(self.num_players)]
+        self.payoffs[:] = 0
+
+    def record_state(self, player_id, state):
+        ''' Append a state to the trajectory of a player
+
+        Args:
+            player_id (int): The player id
+            state (dict): An extracted state
+        '''
+        obs = np.asarray(state['obs'])
+        if self.obs[player_id] is None:
+            self.obs[player_id] = np.zeros((len(self.legal_mask[player_id]),) + obs.shape, dtype=obs.dtype)
+        index = self.num_states[player_id]
+        if index == len(self.obs[player_id]):
+            self._grow(player_id)
+        self.obs[player_id][index] = obs
+        if 'legal_mask' in state:
+            self.legal_mask[player_id][index] = state['legal_mask']
+        else:
+            self.legal_mask[player_id][index] = False
+            self.legal_mask[player_id][index, list(state['legal_actions'])] = True
+        self.num_states[player_id] += 1
+
+    def record_action(self, player_id, action):
+        ''' Append an action id to the trajectory of a player
+
+        Args:
+            player_id (int): The player id
+            action (int): The action id taken in the last recorded state of the player
+        '''
+        index = self.num_actions_taken[player_id]
+        if index == len(self.actions[player_id]):
+            self._grow(player_id)
+        self.actions[player_id][index] = action
+        self.num_actions_taken[player_id] += 1
+
+    def set_payoffs(self, payoffs):
+        ''' Set the payoffs of the game, the rewards of the last transitions
+
+        Args:
+            payoffs (list): One payoff per player
+        '''
+        self.payoffs[:] = payoffs
+
+    def get_transitions(self):
+        ''' Transitions of every player, in the format of reorganize but as columns.
+            The reward is the payoff on the last transition of a player and 0 before it.
+
+        Returns:
+            (list): One Transitions per player. The obs, legal_mask, actions, next_obs and
+                next_legal_mask columns are views of the recorder's columns
+        '''
+        transitions = []
+        for player_id in range(self.num_players):
+            num_transitions = min(self.num_actions_taken[player_id], self.num_states[player_id] - 1)
+            num_transitions = max(num_transitions, 0)
+            rewards = np.zeros(num_transitions)
+            dones = np.zeros(num_transitions, dtype=bool)
+            if num_transitions > 0:
+                rewards[-1] = self.payoffs[player_id]
+                dones[-1] = True
+            obs = self.obs[player_id] if self.obs[player_id] is not None else np.zeros((0,))
+            legal_mask = self.legal_mask[player_id]
+            transitions.append(Transitions(
+                obs=obs[:num_transitions],
+                legal_mask=legal_mask[:num_transitions],
+                actions=self.actions[player_id][:num_transitions],
+                rewards=rewards,
+                next_obs=obs[1:num_transitions + 1],
+                next_legal_mask=legal_mask[1:num_transitions + 1],
+                dones=dones,
+            ))
+        return transitions
+
+    def _grow(self, player_id):
+        def grow(column):
+            new_column = np.zeros((2 * len(column),) + column.shape[1:], dtype=column.dtype)
+            new_column[:len(column)] = column
+            return new_column
+        if self.obs[player_id] is not None and self.num_states[player_id] == len(self.obs[player_id]):
+            self.obs[player_id] = grow(self.obs[player_id])
+            self.legal_mask[player_id] = grow(self.legal_mask[player_id])
+        if self.num_actions_taken[player_id] == len(self.actions[player_id]):
+            self.actions[player_id] = grow(self.actions[player_id])
@@ -1,15 +1,20 @@
+import importlib.util
+
 import numpy as np
 
 from rlcard.games.base import Card
 
+def is_torch_available():
+    ''' Check whether PyTorch is installed, without importing it
+
+    Returns:
+        (boolean): True if torch can be imported
+    '''
+    return importlib.util.find_spec('torch') is not None
+
 def set_seed(seed):
     if seed is not None:
-        import subprocess
-        import sys
-
-        reqs = subprocess.check_output([sys.executable, '-m', 'pip', 'freeze'])
-        installed_packages = [r.decode().split('==')[0] for r in reqs.split()]
-        if 'torch' in installed_packages:
+        if is_torch_available():
             import torch
             torch.backends.cudnn.deterministic = True
             torch.manual_seed(seed)
@@ -178,13 +183,41 @@ def reorganize(trajectories, payoffs):
             new_trajectories[player].append(transition)
     return new_trajectories
 
+def get_legal_mask(legal_actions, num_actions):
+    ''' Boolean mask of the legal actions
+
+    Args:
+        legal_actions (iterable): Ids of the legal actions, e.g. the legal_actions OrderedDict of an extracted state
+        num_actions (int): The size of the action space
+
+    Returns:
+        legal_mask (numpy.array): A bool array of length num_actions, True for the legal actions
+    '''
+    legal_mask = np.zeros(num_actions, dtype=bool)
+    legal_mask[list(legal_actions)] = True
+    return legal_mask
+
+def get_state_legal_mask(state, num_actions):
+    ''' The legal_mask of an extracted state, built from its legal_actions if it has none
+
+    Args:
+        state (dict): An extracted state
+        num_actions (int): The size of the action space
+
+    Returns:
+        legal_mask (numpy.array): A bool array of length num_actions, True for the legal actions
+    '''
+    if 'legal_mask' in state:
+        return state['legal_mask']
+    return get_legal_mask(state['legal_actions'], num_actions)
+
 def remove_illegal(action_probs, legal_actions):
     ''' Remove illegal actions and normalize the
         probability vector
 
     Args:
         action_probs (numpy.array): A 1 dimention numpy array.
-        legal_actions (list): A list of indices of legal actions.
+        legal_actions (list): A list of indices of legal actions, or a boolean legal action mask.
 
     Returns:
         probd (numpy.array): A normalized vector without legal actions.
@@ -192,9 +225,8 @@ def remove_illegal(action_probs, legal_actions):
     probs = np.zeros(action_probs.shape[0])
     probs[legal_actions] = action_probs[legal_actions]
     if np.sum(probs) == 0:
-        probs[legal_actions] = 1 / len(legal_actions)
-    else:
-        probs /= sum(probs)
+        probs[legal_actions] = 1
+    probs /= np.sum(probs)
     return probs
 
 def tournament(env, num):
@@ -224,6 +256,79 @@ def tournament(env, num):
         payoffs[i] /= counter
     return payoffs
 
+def run_batch(envs, agents, is_training=False):
+    ''' Run one complete game in each environment concurrently. At every round
+    the states waiting for a decision of the same agent are gathered and the agent
+    is called once on all of them with step_batch or eval_step_batch, if it has them.
+    Agents without batch methods are called on one state at a time.
+
+    Args:
+        envs (list): Environments of the same game
+        agents (list): One agent per player, shared by all the environments
+        is_training (boolean): True if for training purpose.
+
+    Returns:
+        (tuple) Tuple containing:
+
+            (list): The trajectories of each game, as returned by Env.run
+            (list): The payoffs of each game
+
+    Note: Agents that look at the state of an environment they are bound to, like PIMCAgent, cannot be used.
+    '''
+    num_players = envs[0].num_players
+    all_trajectories = [[[] for _ in range(num_players)] for _ in envs]
+    states = [None for _ in envs]
+    player_ids = [None for _ in envs]
+    for env_index, env in enumerate(envs):
+        states[env_index], player_ids[env_index] = env.reset()
+        all_trajectories[env_index][player_ids[env_index]].append(states[env_index])
+
+    active_env_indices = [env_index for env_index, env in enumerate(envs) if not env.is_over()]
+    while active_env_indices:
+        # Group the pending decisions by agent, several players may share the same agent
+        pending = {}
+        for env_index in active_env_indices:
+            agent = agents[player_ids[env_index]]
+            pending.setdefault(id(agent), (agent, []))[1].append(env_index)
+
+        for agent, env_indices in pending.values():
+            agent_states = [states[env_index] for env_index in env_indices]
+            if is_training:
+                if hasattr(agent, 'step_batch'):
+                    actions = agent.step_batch(agent_states)
+                else:
+                    actions = [agent.step(state) for state in agent_states]
+            else:
+                if hasattr(agent, 'eval_step_batch'):
+                    actions, _ = agent.eval_step_batch(agent_states)
+                else:
+                    actions = [agent.eval_step(state)[0] for state in agent_states]
+
+            for env_index, action in zip(env_indices, actions):
+                env = envs[env_index]
+                trajectories = all_trajectories[env_index]
+                player_id = player_ids[env_index]
+                # Environment steps
+                next_state, next_player_id = env.step(action, agent.use_raw)
+                # Save action
+                trajectories[player_id].append(action)
+                states[env_index] = next_state
+                player_ids[env_index] = next_player_id
+                # Save state.
+                if not env.game.is_over():
+                    trajectories[next_player_id].append(next_state)
+
+        active_env_indices = [env_index for env_index in active_env_indices if not envs[env_index].is_over()]
+
+    # Add a final state to all the players
+    all_payoffs = []
+    for env, trajectories in zip(envs, all_trajectories):
+        for player_id in range(num_players):
+            trajectories[player_id].append(env.get_state(player_id))
+        all_payoffs.append(env.get_payoffs())
+
+    return all_trajectories, all_payoffs
+
 def plot_curve(csv_path, save_path, algorithm):
     ''' Read data from csv file and plot the results
     '''
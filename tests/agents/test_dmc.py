@@ -0,0 +1,29 @@
+import unittest
+
+import rlcard
+from rlcard.agents.dmc_agent.model import DMCModel
+from rlcard.agents.dmc_agent.utils import seed_actor
+from rlcard.utils import seeding
+
+class TestDMC(unittest.TestCase):
+
+    def test_seed_actor(self):
+        env = rlcard.make('leduc-holdem')
+        action_shape = [[env.num_actions] for _ in range(env.num_players)]
+        model = DMCModel(env.state_shape, action_shape, mlp_layers=[8], exp_epsilon=0.5, device='cpu')
+        env.set_agents(model.get_agents())
+
+        def play(seed):
+            seed_actor(env, model.get_agents(), seeding.seed_sequence(seed, 0, 1))
+            actions = []
+            for _ in range(10):
+                trajectories, _ = env.run(is_training=True)
+                actions.append([list(trajectory[1::2]) for trajectory in trajectories])
+            return actions
+
+        # Actors with the same seed choose the same actions, also when exploring
+        self.assertEqual(play(0), play(0))
+        self.assertNotEqual(play(0), play(1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,10 @@ import unittest
 import torch
 import numpy as np
 
+import rlcard
 from rlcard.agents.dqn_agent import DQNAgent
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.trajectory import TrajectoryRecorder
 
 class TestDQN(unittest.TestCase):
 
@@ -51,3 +54,26 @@ class TestDQN(unittest.TestCase):
         predicted_action = agent.step({'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}})
         self.assertGreaterEqual(predicted_action, 0)
         self.assertLessEqual(predicted_action, 1)
+
+        states = [{'obs': np.random.random_sample((2,)), 'legal_actions': {1: None}, 'raw_legal_actions': ['raise']} for _ in range(4)]
+        self.assertEqual(agent.step_batch(states), [1, 1, 1, 1])
+        predicted_actions, infos = agent.eval_step_batch(states)
+        self.assertEqual(list(predicted_actions), [1, 1, 1, 1])
+        self.assertEqual(len(infos), 4)
+
+    def test_feed_transitions(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        agent = DQNAgent(replay_memory_size=100,
+                         replay_memory_init_size=1000,
+                         num_actions=env.num_actions,
+                         state_shape=env.state_shape[0],
+                         mlp_layers=[10,10],
+                         device=torch.device('cpu'))
+        recorder = TrajectoryRecorder(env.num_players, env.num_actions)
+        env.run(is_training=True, recorder=recorder)
+        transitions = recorder.get_transitions()[0]
+        agent.feed_transitions(transitions)
+        self.assertEqual(agent.total_t, len(transitions.actions))
+        self.assertEqual(len(agent.memory.memory), len(transitions.actions))
+        self.assertEqual(agent.memory.memory[-1].done, True)
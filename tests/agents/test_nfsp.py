@@ -45,3 +45,11 @@ class TestNFSP(unittest.TestCase):
 
             ts = [{'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}}, np.random.randint(2), 0, {'obs': np.random.random_sample((2,)), 'legal_actions': {0: None, 1: None}, 'raw_legal_actions': ['call', 'raise']}, True]
             agent.feed(ts)
+
+        states = [{'obs': np.random.random_sample((2,)), 'legal_actions': {1: None}, 'raw_legal_actions': ['raise']} for _ in range(4)]
+        for _ in range(10):
+            agent.sample_episode_policy()
+            self.assertEqual(list(agent.step_batch(states)), [1, 1, 1, 1])
+        predicted_actions, infos = agent.eval_step_batch(states)
+        self.assertEqual(list(predicted_actions), [1, 1, 1, 1])
+        self.assertEqual(len(infos), 4)
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import rlcard
+from rlcard.agents.pimc_agent import PIMCAgent
+
+
+class TestPIMC(unittest.TestCase):
+
+    def test_lazy_import(self):
+        # rlcard.agents only loads the ctpinochle game when PIMCAgent is asked for
+        code = ('import sys, rlcard.agents; print(any(name.startswith("rlcard.games.ctpinochle") for name in sys.modules)); '
+                'from rlcard.agents import PIMCAgent; print(PIMCAgent.__module__)')
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(rlcard.__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(output.decode().split(), ['False', 'rlcard.agents.pimc_agent'])
+
+    def test_eval_step(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        agent = PIMCAgent(env, num_determinizations=4, seed=0)
+        state, _ = env.reset()
+        for _ in range(5):
+            legal_actions = list(state['legal_actions'].keys())
+            action, info = agent.eval_step(state)
+            self.assertIn(action, legal_actions)
+            self.assertEqual(sorted(info['values'].keys()), sorted(legal_actions))
+            state, _ = env.step(action)
+
+    def test_search_does_not_change_env(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        agent = PIMCAgent(env, num_determinizations=2, seed=0)
+        state, _ = env.reset()
+        hands = [list(player.hand) for player in env.game.round.players]
+        agent.eval_step(state)
+        self.assertEqual(hands, [list(player.hand) for player in env.game.round.players])
+        self.assertEqual(len(env.game.actions), 0)
+
+    def test_workers(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        state, _ = env.reset()
+        agent = PIMCAgent(env, num_determinizations=4, batch_size=2, seed=0)
+        parallel_agent = PIMCAgent(env, num_determinizations=4, batch_size=2, num_workers=2, seed=0)
+        _, info = agent.eval_step(state)
+        _, parallel_info = parallel_agent.eval_step(state)
+        parallel_agent.close()
+        self.assertEqual(info['values'], parallel_info['values'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+
+from rlcard.benchmarks import (
+    MICRO_BENCHMARKS,
+    benchmark_env,
+    compare_results,
+    get_env_ids,
+    run_micro_benchmark,
+)
+
+
+class TestBenchmarks(unittest.TestCase):
+
+    def test_benchmark_env(self):
+        self.assertIn('leduc-holdem', get_env_ids())
+        result = benchmark_env('leduc-holdem', min_time=0.0, min_games=2)
+        self.assertEqual(result['num_games'], 2)
+        for metric in ['steps_per_sec', 'games_per_sec', 'reset_latency_us', 'peak_memory_kb']:
+            self.assertGreater(result[metric], 0)
+        self.assertGreaterEqual(result['steps_per_sec'], result['games_per_sec'])
+
+    def test_micro_benchmarks(self):
+        for name in MICRO_BENCHMARKS:
+            result = run_micro_benchmark(name, min_time=0.0, num_inputs=5)
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertAlmostEqual(result['mean_us'], 1e6 / result['ops_per_sec'])
+        with self.assertRaises(ValueError):
+            run_micro_benchmark('unknown')
+
+    def test_compare_results(self):
+        baseline = {
+            'envs': {'uno': {'steps_per_sec': 1000.0, 'reset_latency_us': 10.0, 'num_games': 5}},
+            'micro': {'mahjong.judge_hu': {'ops_per_sec': 100.0, 'mean_us': 10000.0}},
+        }
+        results = {
+            'envs': {
+                'uno': {'steps_per_sec': 500.0, 'reset_latency_us': 11.0, 'num_games': 1},
+                'bridge': {'steps_per_sec': 1.0},
+            },
+            'micro': {'mahjong.judge_hu': {'ops_per_sec': 150.0, 'mean_us': 6666.0}},
+        }
+        regressions = compare_results(results, baseline, tolerance=0.2)
+        self.assertEqual(len(regressions), 1)
+        self.assertEqual(regressions[0]['name'], 'uno')
+        self.assertEqual(regressions[0]['metric'], 'steps_per_sec')
+        self.assertAlmostEqual(regressions[0]['change'], -0.5)
+        self.assertEqual(compare_results(results, baseline, tolerance=0.6), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+'''
+    File name: tests/envs/test_ctpinochle_env.py
+    Author: Nol Patterson
+    Date created: 2/8/2026
+'''
+
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.agents.random_agent import RandomAgent
+from .determism_util import is_deterministic
+
+
+class TestCTPinochleEnv(unittest.TestCase):
+
+    def test_reset_and_extract_state(self):
+        env = rlcard.make('ctpinochle')
+        state, _ = env.reset()
+        self.assertEqual(state['obs'].size, env.state_shape[0][1])
+        self.assertEqual(state['obs'].dtype, np.float32)
+
+    def test_is_deterministic(self):
+        self.assertTrue(is_deterministic('ctpinochle'))
+
+    def test_step(self):
+        env = rlcard.make('ctpinochle')
+        state, _ = env.reset()
+        action = np.random.choice(list(state['legal_actions'].keys()))
+        _, player_id = env.step(action)
+        self.assertEqual(player_id, env.game.round.current_player_id)
+
+    def test_encode_obs_into_buffer(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        state_extractor = env.pinochleStateExtractor
+        buffer = np.full((2, state_extractor.get_state_shape_size()), 7, dtype=np.float32)
+        state, _ = env.reset()
+        for _ in range(20):
+            obs = state_extractor.encode_obs(game=env.game, out=buffer[1])
+            self.assertTrue(np.shares_memory(obs, buffer))
+            self.assertTrue(np.array_equal(buffer[1], state['obs']))
+            state, _ = env.step(np.random.choice(list(state['legal_actions'].keys())))
+        self.assertTrue(np.all(buffer[0] == 7))
+
+    def test_encode_hands(self):
+        env = rlcard.make('ctpinochle', config={'seed': 1})
+        rep_offsets = env.pinochleStateExtractor.rep_offsets
+        state, player_id = env.reset()
+        for _ in range(40):
+            hand = np.zeros(48)
+            hidden_cards = np.zeros(48)
+            for player in env.game.round.players:
+                for card in player.hand:
+                    (hand if player.player_id == player_id else hidden_cards)[card.card_id] = 1
+            hands_offset = rep_offsets['hands_rep'] + 48 * player_id
+            self.assertTrue(np.array_equal(state['obs'][hands_offset:hands_offset + 48], hand))
+            hidden_cards_offset = rep_offsets['hidden_cards_rep']
+            self.assertTrue(np.array_equal(state['obs'][hidden_cards_offset:hidden_cards_offset + 48], hidden_cards))
+            state, player_id = env.step(np.random.choice(list(state['legal_actions'].keys())))
+
+    def test_step_back(self):
+        env = rlcard.make('ctpinochle', config={'allow_step_back': True})
+        state, player_id = env.reset()
+        action = list(state['legal_actions'].keys())[0]
+        env.step(action)
+        prev_state, prev_player_id = env.step_back()
+        self.assertEqual(prev_player_id, player_id)
+        self.assertTrue(np.array_equal(prev_state['obs'], state['obs']))
+        self.assertEqual(list(prev_state['legal_actions'].keys()), list(state['legal_actions'].keys()))
+        self.assertFalse(env.step_back())
+
+    def test_run(self):
+        env = rlcard.make('ctpinochle')
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        trajectories, payoffs = env.run(is_training=False)
+        self.assertEqual(len(trajectories), 3)
+        self.assertEqual(len(payoffs), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,6 @@
+import pickle
 import unittest
+import numpy as np
 
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
@@ -23,6 +25,18 @@ class TestDoudizhuEnv(unittest.TestCase):
         for legal_action in legal_actions:
             self.assertLessEqual(legal_action, env.num_actions-1)
 
+    def test_lazy_state(self):
+        env = rlcard.make('doudizhu', config={'seed': 0})
+        state, _ = env.reset()
+        self.assertFalse(state.is_computed('raw_legal_actions'))
+        raw_actions = list(env.game.state['actions'])
+        env.step(list(state['legal_actions'].keys())[0])
+        # Lazy fields hold the values of the state they were extracted from
+        self.assertEqual(state['raw_legal_actions'], raw_actions)
+        for action_id, feature in state['legal_actions'].items():
+            self.assertTrue(np.array_equal(feature, env.get_action_feature(action_id)))
+        self.assertEqual(pickle.loads(pickle.dumps(state))['raw_legal_actions'], raw_actions)
+
     def test_step(self):
         env = rlcard.make('doudizhu')
         _, player_id = env.reset()
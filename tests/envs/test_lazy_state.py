@@ -0,0 +1,55 @@
+import copy
+import pickle
+import unittest
+
+from rlcard.envs.lazy_state import LazyState, LazyFeatureDict
+
+
+class TestLazyState(unittest.TestCase):
+
+    def test_lazy_state(self):
+        calls = []
+        def compute(value):
+            calls.append(value)
+            return [value]
+
+        state = LazyState({'obs': 1})
+        state.set_lazy('raw_obs', compute, 2)
+        state['action_record'] = []
+        self.assertEqual(list(state.keys()), ['obs', 'raw_obs', 'action_record'])
+        self.assertEqual(len(state), 3)
+        self.assertIn('raw_obs', state)
+        self.assertFalse(state.is_computed('raw_obs'))
+        self.assertEqual(calls, [])
+        self.assertEqual(state['raw_obs'], [2])
+        self.assertEqual(state['raw_obs'], [2])
+        self.assertEqual(calls, [2])
+        self.assertEqual(state, {'obs': 1, 'raw_obs': [2], 'action_record': []})
+        del state['action_record']
+        self.assertNotIn('action_record', state)
+
+    def test_pickle_and_copy(self):
+        state = LazyState({'obs': 1})
+        state.set_lazy('raw_obs', lambda: 'raw')
+        self.assertEqual(dict(pickle.loads(pickle.dumps(state))), {'obs': 1, 'raw_obs': 'raw'})
+        self.assertEqual(dict(copy.deepcopy(state)), {'obs': 1, 'raw_obs': 'raw'})
+        self.assertEqual(dict(state.copy()), {'obs': 1, 'raw_obs': 'raw'})
+
+    def test_lazy_feature_dict(self):
+        calls = []
+        def feature(arg):
+            calls.append(arg)
+            return arg * 2
+
+        legal_actions = LazyFeatureDict([5, 3], ['a', 'b'], feature)
+        self.assertEqual(list(legal_actions), [5, 3])
+        self.assertEqual(list(legal_actions.keys()), [5, 3])
+        self.assertIn(3, legal_actions)
+        self.assertEqual(calls, [])
+        self.assertEqual(legal_actions[3], 'bb')
+        self.assertEqual(list(legal_actions.values()), ['aa', 'bb'])
+        self.assertEqual(calls, ['b', 'a'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import copy
+import pickle
+import unittest
+
+import numpy as np
+
+import rlcard
+from rlcard.agents.pimc_agent import PIMCAgent
+from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.profiling import LatencyHistogram
+
+
+class TestProfiling(unittest.TestCase):
+
+    def test_latency_histogram(self):
+        histogram = LatencyHistogram()
+        self.assertIsNone(histogram.percentile(50))
+        values = list(range(1, 1001)) + [10 ** 9]
+        for value in values:
+            histogram.record(value)
+        self.assertEqual(histogram.count, len(values))
+        self.assertEqual(histogram.max, 10 ** 9)
+        # Buckets keep about 3% of relative precision
+        self.assertAlmostEqual(histogram.percentile(50), 500, delta=500 * 0.04)
+        self.assertAlmostEqual(histogram.percentile(99), 990, delta=990 * 0.04)
+        self.assertAlmostEqual(histogram.percentile(100), 10 ** 9, delta=10 ** 9 * 0.04)
+
+    def test_perf_stats(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        agents = [RandomAgent(env.num_actions) for _ in range(env.num_players)]
+        env.set_agents(agents)
+        self.assertEqual(env.perf_stats(), {})
+
+        env.enable_profiling()
+        trajectories, _ = env.run(is_training=False)
+        stats = env.perf_stats(reset=True)
+        for phase in ['game.init_game', 'game.step', 'env.extract_state', 'env.decode_action',
+                      'judger.get_legal_action_ids', 'agent.eval_step']:
+            self.assertIn(phase, stats)
+            self.assertGreater(stats[phase]['total_s'], 0)
+            self.assertLessEqual(stats[phase]['p50_us'], stats[phase]['max_us'])
+        self.assertEqual(stats['game.init_game']['count'], 1)
+        self.assertEqual(stats['game.step']['count'], stats['agent.eval_step']['count'])
+        self.assertEqual(env.perf_stats(), {})
+
+        # Disabled, the original methods and agents are back
+        env.disable_profiling()
+        self.assertEqual(env.perf_stats(), {})
+        self.assertIs(env.agents, agents)
+        self.assertNotIn('step', vars(env.game))
+        self.assertNotIn('_extract_state', vars(env))
+        self.assertNotIn('get_legal_action_ids', vars(env.game.judger))
+
+    def test_copy_profiled_game(self):
+        env = rlcard.make('ctpinochle', config={'seed': 0})
+        env.enable_profiling()
+        state, _ = env.reset()
+        obs = state['obs'].copy()
+        game = copy.deepcopy(env.game)
+        for _ in range(5):
+            game.step(game.judger.get_legal_actions()[0])
+        # The copy steps itself and records into its own stats
+        self.assertTrue(np.array_equal(env.get_state(env.get_player_id())['obs'], obs))
+        self.assertNotIn('game.step', env.perf_stats())
+        action, _ = PIMCAgent(env, num_determinizations=2).eval_step(state)
+        self.assertIn(action, state['legal_actions'])
+
+    def test_pickle_profiled_env(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'profile': True})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        env.reset()
+        unpickled_env = pickle.loads(pickle.dumps(env))
+        unpickled_env.run(is_training=False)
+        self.assertIn('game.step', unpickled_env.perf_stats())
+        self.assertEqual(env.perf_stats().get('game.step'), None)
+        unpickled_env.disable_profiling()
+        self.assertNotIn('step', vars(unpickled_env.game))
+
+    def test_profile_config(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0, 'profile': True})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        env.run(is_training=True)
+        stats = env.perf_stats()
+        self.assertIn('agent.step', stats)
+        self.assertIn('game.get_legal_actions', stats)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,10 @@
+import os
+import subprocess
+import sys
 import unittest
 
+import numpy as np
+
 import rlcard
 from rlcard.envs.registration import register, make
 from .determism_util import is_deterministic
@@ -20,8 +25,52 @@ class TestRegistration(unittest.TestCase):
         with self.assertRaises(ValueError):
             make('test_random_make')
 
+    def test_lazy_entry_point(self):
+        # The entry point is only imported on make
+        register(env_id='test_lazy', entry_point='rlcard.envs.no_such_env:NoSuchEnv')
+        try:
+            with self.assertRaises(ImportError):
+                make('test_lazy')
+        finally:
+            del rlcard.envs.registration.registry.env_specs['test_lazy']
+
+        code = 'import sys, rlcard; print(sorted(name for name in sys.modules if name.startswith("rlcard.games.")))'
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(rlcard.__file__)))
+        output = subprocess.check_output([sys.executable, '-c', code], env=env)
+        self.assertEqual(output.decode().strip(), "['rlcard.games.base']")
+
     def test_make_modes(self):
         register(env_id='test_env', entry_point='rlcard.envs.blackjack:BlackjackEnv')
 
+    def test_clone_state(self):
+        def play(env, state, seed):
+            np_random = np.random.RandomState(seed)
+            trace = []
+            for _ in range(200):
+                # Sorted since the order of the legal actions may depend on set iteration
+                legal_actions = sorted(state['legal_actions'])
+                trace.append((env.get_player_id(), np.asarray(state['obs']).tobytes(), legal_actions))
+                if env.is_over():
+                    trace.append(list(env.get_payoffs()))
+                    break
+                state, _ = env.step(np_random.choice(legal_actions))
+            return trace
+
+        for env_id in rlcard.envs.registration.registry.env_specs:
+            env = make(env_id, config={'seed': 0})
+            state, _ = env.reset()
+            snapshot = env.clone_state()
+            action_recorder = list(env.action_recorder)
+            trace = play(env, state, 1)
+            # Branch off with other actions, then replay the same ones: the game
+            # must be the same, including the cards dealt after the snapshot
+            for seed in [2, 3, 1]:
+                state, player_id = env.restore_state(snapshot)
+                self.assertEqual(player_id, trace[0][0], env_id)
+                self.assertEqual(env.action_recorder, action_recorder, env_id)
+                branch_trace = play(env, state, seed)
+                self.assertEqual(branch_trace[0], trace[0], env_id)
+            self.assertEqual(branch_trace, trace, env_id)
+
 if __name__ == '__main__':
     unittest.main()
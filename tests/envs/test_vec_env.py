@@ -0,0 +1,148 @@
+import unittest
+import numpy as np
+
+import rlcard
+from rlcard.envs.vec_env import VectorEnv
+from rlcard.envs.subproc_vec_env import SubprocVectorEnv
+from rlcard.utils import seeding
+
+
+class TestVectorEnv(unittest.TestCase):
+
+    def test_make_vec(self):
+        vec_env = rlcard.make_vec('leduc-holdem', 4, config={'seed': 0})
+        self.assertIsInstance(vec_env, VectorEnv)
+        self.assertEqual(vec_env.num_envs, 4)
+        self.assertEqual(vec_env.num_actions, 4)
+        with self.assertRaises(ValueError):
+            rlcard.make_vec('leduc-holdem', 0)
+
+    def test_step(self):
+        num_envs = 3
+        vec_env = rlcard.make_vec('ctpinochle', num_envs, config={'seed': 0})
+        envs = [rlcard.make('ctpinochle', config={'seed': env_seed}) for env_seed in seeding.spawn_env_seeds(0, 0, num_envs)]
+        obs, legal_action_mask, player_ids = vec_env.reset()
+        for env in envs:
+            env.reset()
+        self.assertEqual(obs.shape, (num_envs, envs[0].get_state(player_ids[0])['obs'].size))
+        self.assertEqual(legal_action_mask.shape, (num_envs, vec_env.num_actions))
+
+        np_random = np.random.RandomState(0)
+        num_dones = 0
+        while num_dones < num_envs:
+            for env_index, env in enumerate(envs):
+                state = env.get_state(env.get_player_id())
+                self.assertEqual(player_ids[env_index], env.get_player_id())
+                self.assertTrue(np.array_equal(obs[env_index], state['obs']))
+                self.assertEqual(list(np.flatnonzero(legal_action_mask[env_index])), sorted(state['legal_actions']))
+            actions = [np_random.choice(np.flatnonzero(mask)) for mask in legal_action_mask]
+            obs, legal_action_mask, player_ids, dones, payoffs = vec_env.step(actions)
+            for env_index, env in enumerate(envs):
+                # Encoded in place into the row of the environment
+                self.assertTrue(np.shares_memory(vec_env.get_states()[env_index]['obs'], obs[env_index]))
+                env.step(actions[env_index])
+                self.assertEqual(dones[env_index], env.is_over())
+                if env.is_over():
+                    num_dones += 1
+                    self.assertTrue(np.array_equal(payoffs[env_index], env.get_payoffs()))
+                    env.reset()
+                else:
+                    self.assertFalse(np.any(payoffs[env_index]))
+
+    def test_ragged_obs(self):
+        # The landlord and the peasants of doudizhu observe states of different sizes
+        num_envs = 3
+        vec_env = rlcard.make_vec('doudizhu', num_envs, config={'seed': 0})
+        envs = [rlcard.make('doudizhu', config={'seed': env_seed}) for env_seed in seeding.spawn_env_seeds(0, 0, num_envs)]
+        obs, legal_action_mask, player_ids = vec_env.reset()
+        for env in envs:
+            env.reset()
+        self.assertEqual(obs.shape, (num_envs, 901))
+
+        np_random = np.random.RandomState(0)
+        seen_player_ids = set()
+        for _ in range(60):
+            for env_index, env in enumerate(envs):
+                state = env.get_state(env.get_player_id())
+                self.assertEqual(player_ids[env_index], env.get_player_id())
+                seen_player_ids.add(player_ids[env_index])
+                size = state['obs'].size
+                self.assertTrue(np.array_equal(obs[env_index, :size], state['obs']))
+                self.assertFalse(np.any(obs[env_index, size:]))
+            actions = [np_random.choice(np.flatnonzero(mask)) for mask in legal_action_mask]
+            obs, legal_action_mask, player_ids, dones, _ = vec_env.step(actions)
+            for env_index, env in enumerate(envs):
+                env.step(actions[env_index])
+                if env.is_over():
+                    env.reset()
+        self.assertEqual(seen_player_ids, {0, 1, 2})
+
+    def test_subproc_vec_env(self):
+        num_envs = 5
+        vec_env = rlcard.make_vec('leduc-holdem', num_envs, config={'seed': 0})
+        subproc_vec_env = rlcard.make_vec('leduc-holdem', num_envs, config={'seed': 0}, num_workers=2)
+        self.assertIsInstance(subproc_vec_env, SubprocVectorEnv)
+        try:
+            outputs = vec_env.reset()
+            subproc_outputs = subproc_vec_env.reset()
+            np_random = np.random.RandomState(0)
+            for _ in range(30):
+                for output, subproc_output in zip(outputs, subproc_outputs):
+                    self.assertTrue(np.array_equal(output, subproc_output))
+                actions = [np_random.choice(np.flatnonzero(mask)) for mask in outputs[1]]
+                outputs = vec_env.step(actions)
+                subproc_outputs = subproc_vec_env.step(actions)
+
+            with self.assertRaises(Exception):
+                # Illegal action ids fail in the worker and close the pool
+                subproc_vec_env.step([100] * num_envs)
+            self.assertTrue(subproc_vec_env.closed)
+        finally:
+            subproc_vec_env.close()
+
+    def test_subproc_ragged_obs(self):
+        num_envs = 4
+        vec_env = rlcard.make_vec('doudizhu', num_envs, config={'seed': 0})
+        subproc_vec_env = rlcard.make_vec('doudizhu', num_envs, config={'seed': 0}, num_workers=2)
+        try:
+            outputs = vec_env.reset()
+            subproc_outputs = subproc_vec_env.reset()
+            self.assertEqual(subproc_outputs[0].shape, (num_envs, 901))
+            np_random = np.random.RandomState(0)
+            for _ in range(30):
+                for output, subproc_output in zip(outputs, subproc_outputs):
+                    self.assertTrue(np.array_equal(output, subproc_output))
+                actions = [np_random.choice(np.flatnonzero(mask)) for mask in outputs[1]]
+                outputs = vec_env.step(actions)
+                subproc_outputs = subproc_vec_env.step(actions)
+        finally:
+            subproc_vec_env.close()
+
+    def test_seed_sequence(self):
+        num_envs = 4
+        vec_env = rlcard.make_vec('uno', num_envs, config={'seed': seeding.seed_sequence(3, 1)})
+        subproc_vec_env = rlcard.make_vec('uno', num_envs, num_workers=2)
+        try:
+            subproc_vec_env.seed(seeding.seed_sequence(3, 1))
+            obs, _, _ = vec_env.reset()
+            self.assertTrue(np.array_equal(obs, subproc_vec_env.reset()[0]))
+            self.assertEqual(len(set(row.tobytes() for row in obs)), num_envs)
+        finally:
+            subproc_vec_env.close()
+
+        # A game only depends on the sequence of the environment and the episode number,
+        # not on how the previous games were played
+        env = vec_env.envs[2]
+        env.seed(seeding.seed_sequence(3, 1, 2))
+        state, _ = env.reset()
+        self.assertTrue(np.array_equal(state['obs'], obs[2]))
+        while not env.is_over():
+            state, _ = env.step(max(state['legal_actions']))
+        second_obs = env.reset()[0]['obs']
+        env.seed(seeding.seed_sequence(3, 1, 2))
+        env.reset()
+        self.assertTrue(np.array_equal(env.reset()[0]['obs'], second_obs))
+
+
+if __name__ == '__main__':
+    unittest.main()
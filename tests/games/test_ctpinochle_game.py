@@ -0,0 +1,276 @@
+'''
+    File name: test_ctpinochle_game.py
+    Author: Nol Patterson
+    Date created: 2/8/2026
+'''
+
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from rlcard.games.ctpinochle.game import CTPinochleGame as Game
+from rlcard.games.ctpinochle.batched_game import BatchedCTPinochleGame
+from rlcard.games.ctpinochle.player import CTPinochlePlayer
+from rlcard.games.ctpinochle.utils.action_event import ActionEvent, BidAction, PassBid
+from rlcard.games.ctpinochle.utils.move import PlayCardMove
+from rlcard.games.ctpinochle.utils.ctpinochle_card import CTPinochleCard, hand_mask_to_array
+from rlcard.games.ctpinochle.utils.determinization import sample_determinizations, owners_to_card_counts
+from rlcard.games.ctpinochle.utils.tracer import CTPinochleTracer, read_trace
+from rlcard.games.ctpinochle.utils.trick_table import build_trick_winner_table, get_trick_winner_table
+from rlcard.games.ctpinochle.utils.meld_calculator import calculate_meld, calculate_meld_batch, calculate_meld_points, get_card_counts
+from rlcard.envs.ctpinochle import DefaultPinochleStateExtractor
+
+
+class TestCTPinochleGame(unittest.TestCase):
+
+    def test_get_num_players(self):
+        game = Game()
+        self.assertEqual(game.get_num_players(), 3)
+
+    def test_get_num_actions(self):
+        game = Game()
+        self.assertEqual(game.get_num_actions(), 83)
+
+    def test_init_game(self):
+        game = Game()
+        state, current_player_id = game.init_game()
+        self.assertIn(current_player_id, [0, 1, 2])
+        self.assertEqual(len(state['hand']), 16)
+        for player in game.round.players:
+            self.assertEqual(len(player.hand), 16)
+            self.assertEqual(int(player.card_counts.sum()), 16)
+            self.assertEqual(bin(player.hand_mask).count('1'), 16)
+
+    def test_first_legal_bids(self):
+        game = Game()
+        game.init_game()
+        legal_actions = game.judger.get_legal_actions()
+        self.assertEqual(len(legal_actions), 31)
+        self.assertIn(PassBid(), legal_actions)
+        game.step(BidAction(25))
+        legal_action_ids = game.judger.get_legal_action_ids()
+        self.assertEqual(legal_action_ids[0], PassBid().action_id)
+        self.assertEqual(legal_action_ids[1], BidAction(26).action_id)
+        self.assertEqual(len(legal_action_ids), 1 + 50 - 25)
+
+    def test_legal_action_mask(self):
+        game = Game()
+        game.np_random = np.random.RandomState(1)
+        game.init_game()
+        while not game.is_over():
+            legal_actions = game.judger.get_legal_actions()
+            legal_action_mask = game.judger.get_legal_action_mask()
+            self.assertEqual(legal_action_mask.shape, (83,))
+            self.assertEqual(list(np.flatnonzero(legal_action_mask)), sorted(game.judger.get_legal_action_ids()))
+            action = legal_actions[game.np_random.randint(len(legal_actions))]
+            self.assertIs(action, ActionEvent.from_action_id(action.action_id))
+            game.step(action)
+
+    def test_hand_representation(self):
+        player = CTPinochlePlayer(player_id=0, np_random=np.random.RandomState())
+        deck = CTPinochleCard.get_deck()
+        for card in deck[:4]:  # 9C, 9C, JC, JC
+            player.add_card_to_hand(card)
+        self.assertEqual(player.hand_mask, 0b1111)
+        self.assertEqual(list(player.card_counts[:2]), [2, 2])
+        self.assertEqual(list(hand_mask_to_array(player.hand_mask)[:5]), [1, 1, 1, 1, 0])
+        player.remove_card_from_hand(deck[3])
+        self.assertEqual(len(player.hand), 3)
+        self.assertNotIn(deck[3].card_id, [card.card_id for card in player.hand])
+        self.assertEqual(bin(player.hand_mask).count('1'), 3)
+        self.assertEqual(list(player.card_counts[:2]), [2, 1])
+
+    def test_calculate_meld(self):
+        deck = CTPinochleCard.get_deck()
+        # Run in hearts and a pinochle, marriages are not counted alongside a run
+        hand = [card for card in deck if card.suit == 'H' and card.rank != '9' and card.card_id % 2 == 0]
+        hand += [card for card in deck if str(card) in ['KC', 'QC', 'QS', 'JD'] and card.card_id % 2 == 0]
+        meld_points, _ = calculate_meld(hand, 'H')
+        self.assertEqual(meld_points, 15 + 4)
+        self.assertEqual(int(get_card_counts(hand).sum()), len(hand))
+
+    def test_calculate_meld_batch(self):
+        np_random = np.random.RandomState(0)
+        deck = CTPinochleCard.get_deck()
+        hands = [[deck[card_id] for card_id in np_random.choice(48, 16, replace=False)] for _ in range(50)]
+        hands.append([card for card in deck if card.suit == 'S'])  # double run and double pinochle half
+        meld_points = calculate_meld_batch(hands)
+        self.assertEqual(meld_points.shape, (len(hands), 4))
+        for hand, hand_meld_points in zip(hands, meld_points):
+            for trump_suit, points in zip(CTPinochleCard.suits, hand_meld_points):
+                self.assertEqual(points, calculate_meld(hand, trump_suit)[0])
+                self.assertEqual(points, calculate_meld_points(get_card_counts(hand), trump_suit))
+        self.assertTrue(np.array_equal(calculate_meld_batch(tuple(tuple(hand) for hand in hands)), meld_points))
+        trump_meld_points = calculate_meld_batch(hands[:4], ['C', 'D', 'H', 'S'])
+        self.assertEqual(list(trump_meld_points), [meld_points[i][i] for i in range(4)])
+
+    def test_trick_winner_table(self):
+        table = get_trick_winner_table()
+        self.assertEqual(table.shape, (48, 48, 48, 4))
+        self.assertEqual(table.dtype, np.int8)
+        self.assertTrue(np.array_equal(table, build_trick_winner_table()))
+        np_random = np.random.RandomState(0)
+        for _ in range(500):
+            trick_card_ids = np_random.randint(48, size=3)
+            trump_suit_index = np_random.randint(4)
+            cards = [CTPinochleCard.card(card_id) for card_id in trick_card_ids]
+            winning_position = 0
+            for position in range(1, 3):
+                card, winning_card = cards[position], cards[winning_position]
+                if card.suit_index == trump_suit_index and winning_card.suit_index != trump_suit_index:
+                    winning_position = position
+                elif card.suit_index == winning_card.suit_index and card.rank_index > winning_card.rank_index:
+                    winning_position = position
+            self.assertEqual(table[tuple(trick_card_ids) + (trump_suit_index,)], winning_position)
+
+    def test_step_back(self):
+        def snapshot(game):
+            state = game.round.get_perfect_information()
+            state['hands'] = [[card.card_id for card in hand] for hand in state['hands']]
+            state['hand_masks'] = [player.hand_mask for player in game.round.players]
+            state['card_counts'] = [player.card_counts.tolist() for player in game.round.players]
+            state['trick_moves'] = [move.card.card_id for move in state['trick_moves']]
+            state['move_sheet'] = list(game.round.move_sheet)
+            state['legal_action_ids'] = game.judger.get_legal_action_ids()
+            return repr(state), game.round_number, list(game.total_scores), game.winner_id, len(game.actions)
+
+        game = Game(allow_step_back=True)
+        game.np_random = np.random.RandomState(2)
+        game.init_game()
+        self.assertFalse(game.step_back())
+        snapshots = []
+        while not game.is_over():
+            snapshots.append(snapshot(game))
+            legal_actions = game.judger.get_legal_actions()
+            game.step(legal_actions[game.np_random.randint(len(legal_actions))])
+        self.assertGreater(game.round_number, 1)
+        while snapshots:
+            self.assertTrue(game.step_back())
+            self.assertEqual(snapshot(game), snapshots.pop())
+        self.assertFalse(game.step_back())
+
+    def test_sample_determinizations(self):
+        game = Game()
+        game.np_random = np.random.RandomState(4)
+        game.init_game()
+        for _ in range(40):
+            legal_actions = game.judger.get_legal_actions()
+            game.step(legal_actions[game.np_random.randint(len(legal_actions))])
+        player_id = game.round.current_player_id
+        owners = sample_determinizations(game, player_id, num_samples=100)
+        self.assertEqual(owners.shape, (100, 48))
+        hand_sizes = [len(player.hand) for player in game.round.players]
+        for owner_id in range(3):
+            self.assertTrue(np.all(np.sum(owners == owner_id, axis=1) == hand_sizes[owner_id]))
+        for card in game.round.players[player_id].hand:
+            self.assertTrue(np.all(owners[:, card.card_id] == player_id))
+        card_counts = owners_to_card_counts(owners)
+        self.assertEqual(card_counts.shape, (100, 3, 24))
+        for opponent_id in range(3):
+            if opponent_id != player_id and game.round.meld_shown:
+                # Shown meld cards are still held unless they were played
+                played_counts = np.zeros(24, dtype=int)
+                for move in game.round.move_sheet:
+                    if isinstance(move, PlayCardMove) and move.player.player_id == opponent_id:
+                        played_counts[move.card.card_index] += 1
+                required_counts = np.maximum(game.round.player_meld_cards[opponent_id] - played_counts, 0)
+                self.assertTrue(np.all(card_counts[:, opponent_id, :] >= required_counts))
+
+    def test_tracer(self):
+        for trace_file_name in ['trace.jsonl', 'trace.pkl']:
+            with tempfile.TemporaryDirectory() as trace_dir:
+                trace_path = os.path.join(trace_dir, trace_file_name)
+                tracer = CTPinochleTracer(path=trace_path, batch_size=64)
+                game = Game(tracer=tracer)
+                game.np_random = np.random.RandomState(3)
+                game.init_game()
+                while not game.is_over():
+                    legal_actions = game.judger.get_legal_actions()
+                    game.step(legal_actions[game.np_random.randint(len(legal_actions))])
+                tracer.close()
+                records = read_trace(trace_path)
+                events = set(record['event'] for record in records)
+                self.assertEqual(events, {'game_start', 'legal_actions', 'phase', 'trick'})
+                num_tricks = sum(1 for record in records if record['event'] == 'trick')
+                self.assertEqual(num_tricks, 16 * game.round_number)
+
+    def test_tracer_disabled(self):
+        game = Game()
+        game.init_game()
+        self.assertIsNone(game.tracer)
+        self.assertFalse(game.is_tracing)
+        tracer = CTPinochleTracer(path=os.devnull, sample_rate=0.0)
+        game = Game(tracer=tracer)
+        game.init_game()
+        self.assertFalse(game.is_tracing)
+        tracer.close()
+
+    def test_batched_game(self):
+        def copy_round(batched_game, game_index, game):
+            # Give the scalar game the dealer and deal of the batched game
+            dealer_id = int(batched_game.dealer_id[game_index])
+            game._current_dealer_id = dealer_id
+            game.round._dealer_id = dealer_id
+            game.round.current_player_id = int(batched_game.current_player_id[game_index])
+            for player in game.round.players:
+                player.hand = []
+                player.hand_mask = 0
+                player.card_counts[:] = 0
+                for card_id in np.flatnonzero(batched_game.hands[game_index, player.player_id]):
+                    player.add_card_to_hand(CTPinochleCard.card(card_id))
+            game.state_version += 1
+
+        num_games = 8
+        np_random = np.random.RandomState(5)
+        state_extractor = DefaultPinochleStateExtractor()
+        batched_game = BatchedCTPinochleGame(num_games=num_games, seed=5)
+        current_player_ids = batched_game.init_game()
+        games = [Game() for _ in range(num_games)]
+        for game_index, game in enumerate(games):
+            game.init_game()
+            copy_round(batched_game, game_index, game)
+
+        while not np.all(batched_game.is_over()):
+            legal_action_mask = batched_game.get_legal_action_mask()
+            obs = state_extractor.encode_obs_batch(batched_game)
+            action_ids = np.zeros(num_games, dtype=int)
+            for game_index, game in enumerate(games):
+                self.assertEqual(batched_game.game_over[game_index], game.is_over())
+                self.assertEqual(list(batched_game.total_scores[game_index]), game.total_scores)
+                self.assertTrue(np.array_equal(obs[game_index], state_extractor.encode_obs(game)))
+                if game.is_over():
+                    self.assertFalse(np.any(legal_action_mask[game_index]))
+                    self.assertEqual(batched_game.winner_id[game_index], -1 if game.winner_id is None else game.winner_id)
+                    continue
+                self.assertEqual(current_player_ids[game_index], game.get_player_id())
+                self.assertTrue(np.array_equal(legal_action_mask[game_index], game.judger.get_legal_action_mask()))
+                action_ids[game_index] = np_random.choice(np.flatnonzero(legal_action_mask[game_index]))
+            current_player_ids = batched_game.step(action_ids)
+            for game_index, game in enumerate(games):
+                if not game.is_over():
+                    round_number = game.round_number
+                    game.step(ActionEvent.from_action_id(int(action_ids[game_index])))
+                    if game.round_number != round_number:
+                        copy_round(batched_game, game_index, game)
+        for game_index, game in enumerate(games):
+            self.assertTrue(game.is_over())
+            self.assertEqual(list(batched_game.get_payoffs()[game_index]), game.get_payoffs())
+
+        with self.assertRaises(Exception):
+            batched_game.init_game([0])
+            batched_game.step(np.full(num_games, ActionEvent.min_trump))
+
+    def test_play_random_game(self):
+        game = Game()
+        game.np_random = np.random.RandomState(0)
+        game.init_game()
+        while not game.is_over():
+            legal_actions = game.judger.get_legal_actions()
+            self.assertTrue(legal_actions)
+            game.step(legal_actions[game.np_random.randint(len(legal_actions))])
+        self.assertEqual(len(game.get_payoffs()), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,15 @@
 import itertools
+import os
+import tempfile
 import unittest
+from unittest import mock
 
+from rlcard.games.limitholdem import equity
+from rlcard.games.limitholdem.evaluator import evaluate_hand, evaluate_hands_batch, get_hand_category
 from rlcard.games.limitholdem.judger import LimitHoldemJudger
 from rlcard.games.limitholdem.utils import compare_hands
 from rlcard.games.limitholdem.utils import Hand as Hand
+from rlcard.games.limitholdem.utils import final_compare
 import numpy as np
 ''' Combinations selected for testing compare_hands function
 Royal straight flush ['CJ', 'CT', 'CQ', 'CK', 'C9', 'C8', 'CA']
@@ -25,6 +31,94 @@ class TestHoldemUtils(unittest.TestCase):
         with self.assertRaises(Exception):
             hand.evaluateHand()
 
+    def test_evaluate_hand(self):
+        # Same categories and winners as the Hand based comparison on random showdowns
+        deck = [suit + rank for suit in 'SHDC' for rank in 'A23456789TJQK']
+        randstate = np.random.RandomState(0)
+        for _ in range(2000):
+            cards = [deck[i] for i in randstate.choice(52, 11, replace=False)]
+            hands = [cards[0:2] + cards[6:], cards[2:4] + cards[6:], cards[4:6] + cards[6:]]
+            strengths = [evaluate_hand(hand) for hand in hands]
+            categories = []
+            for hand in hands:
+                old_hand = Hand(list(hand))
+                old_hand.evaluateHand()
+                categories.append(old_hand.category)
+            self.assertEqual([get_hand_category(strength) for strength in strengths], categories)
+            potential_winner_index = [i for i, category in enumerate(categories) if category == max(categories)]
+            winners = final_compare([list(hand) for hand in hands], potential_winner_index, [0] * len(hands))
+            self.assertEqual([int(strength == max(strengths)) for strength in strengths], winners)
+
+        # 5 and 6 cards
+        self.assertEqual(get_hand_category(evaluate_hand(['CJ', 'CT', 'CQ', 'CK', 'CA'])), 9)
+        self.assertGreater(evaluate_hand(['S5', 'H5', 'D5', 'C9', 'S9', 'H2']), evaluate_hand(['S4', 'H4', 'D4', 'CA', 'SA']))
+        self.assertEqual(evaluate_hand(['SA', 'H2', 'D3', 'C4', 'S5']), evaluate_hand(['HA', 'S2', 'C3', 'D4', 'H5', 'SK']))
+        with self.assertRaises(ValueError):
+            evaluate_hand(['CJ', 'CT', 'CQ', 'CK'])
+
+    def test_evaluate_hands_batch(self):
+        deck = [suit + rank for suit in 'SHDC' for rank in 'A23456789TJQK']  # the order of card2index.json
+        randstate = np.random.RandomState(0)
+        cards = np.argsort(randstate.rand(1000, 52), axis=1)[:, :7]
+        for num_cards in range(5, 8):
+            strengths = evaluate_hands_batch(cards[:, :num_cards])
+            self.assertEqual(strengths.shape, (1000,))
+            self.assertEqual(strengths.tolist(), [evaluate_hand([deck[i] for i in hand]) for hand in cards[:, :num_cards]])
+        self.assertEqual(evaluate_hands_batch(np.zeros((0, 7), dtype=int)).shape, (0,))
+        with self.assertRaises(ValueError):
+            evaluate_hands_batch([[0, 0, 1, 2, 3, 4, 5]])
+        with self.assertRaises(ValueError):
+            evaluate_hands_batch([[0, 1, 2, 3, 52]])
+        with self.assertRaises(ValueError):
+            evaluate_hands_batch([[0, 1, 2, 3]])
+
+    def test_estimate_equity(self):
+        np_random = np.random.RandomState(0)
+        win, tie = equity.estimate_equity(['SA', 'HA'], num_samples=5000, np_random=np_random)
+        self.assertAlmostEqual(win + tie / 2, 0.85, delta=0.02)
+        win, tie = equity.estimate_equity(['SA', 'HA'], num_opponents=4, num_samples=5000, np_random=np_random)
+        self.assertAlmostEqual(win + tie / 5, 0.56, delta=0.03)
+        self.assertEqual(equity.estimate_equity(['SA', 'SK'], ['SQ', 'SJ', 'ST'], num_samples=100, np_random=np_random), (1.0, 0.0))
+        # Everyone plays the straight on the board, unless an opponent has a 9
+        win, tie = equity.estimate_equity(['H2', 'D3'], ['S4', 'H5', 'D6', 'C7', 'S8'], num_samples=1000, np_random=np_random)
+        self.assertEqual(win, 0.0)
+        self.assertGreater(tie, 0.5)
+        with self.assertRaises(ValueError):
+            equity.estimate_equity(['SA', 'SA'])
+        with self.assertRaises(ValueError):
+            equity.estimate_equity(['SA', 'HA'], num_opponents=23)
+
+    def test_preflop_equity_table(self):
+        deck = [suit + rank for suit in 'SHDC' for rank in 'A23456789TJQK']
+        classes = set(equity.get_preflop_class(hand) for hand in itertools.combinations(deck, 2))
+        self.assertEqual(classes, set(range(equity.NUM_PREFLOP_CLASSES)))
+        self.assertEqual(equity.get_preflop_class(['SA', 'SK']), equity.get_preflop_class(['HK', 'HA']))
+        self.assertNotEqual(equity.get_preflop_class(['SA', 'SK']), equity.get_preflop_class(['SA', 'HK']))
+
+        table = equity.build_preflop_equity_table(num_samples=200)
+        self.assertEqual(table.shape, (169, 2))
+        self.assertTrue(np.array_equal(table, equity.build_preflop_equity_table(num_samples=200)))
+        self.assertGreater(table[equity.get_preflop_class(['SA', 'HA'])][0], table[equity.get_preflop_class(['S7', 'H2'])][0])
+
+        # Loaded from the disk cache
+        with tempfile.TemporaryDirectory() as table_dir, \
+                mock.patch.object(equity, 'PREFLOP_EQUITY_TABLE_DIR', table_dir), \
+                mock.patch.object(equity, 'PREFLOP_NUM_SAMPLES', 200), \
+                mock.patch.object(equity, '_preflop_equity_tables', {}):
+            equity._save_preflop_equity_table(os.path.join(table_dir, 'preflop_equity_1_200_0.npy'), table)
+            self.assertTrue(np.array_equal(equity.get_preflop_equity_table(), table))
+            self.assertFalse(equity.get_preflop_equity_table().flags.writeable)
+            self.assertEqual(equity.get_preflop_equity(['SA', 'HA']), tuple(table[equity.get_preflop_class(['SA', 'HA'])]))
+
+        # A table sampled differently is not reused
+        with tempfile.TemporaryDirectory() as table_dir, \
+                mock.patch.object(equity, 'PREFLOP_EQUITY_TABLE_DIR', table_dir), \
+                mock.patch.object(equity, 'PREFLOP_NUM_SAMPLES', 100), \
+                mock.patch.object(equity, '_preflop_equity_tables', {}):
+            equity._save_preflop_equity_table(os.path.join(table_dir, 'preflop_equity_1_200_0.npy'), table)
+            self.assertFalse(np.array_equal(equity.get_preflop_equity_table(), table))
+            self.assertTrue(os.path.exists(os.path.join(table_dir, 'preflop_equity_1_100_0.npy')))
+
     def test_has_high_card_false(self):
 
         hand = Hand(['CJ', 'CT', 'CQ', 'CK', 'C9', 'C8', 'S3'])
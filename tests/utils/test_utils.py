@@ -1,11 +1,68 @@
+import os
+import subprocess
+import sys
 import unittest
 import numpy as np
-from rlcard.utils.utils import init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament
+from rlcard.utils.utils import is_torch_available, init_54_deck, init_standard_deck, rank2int, print_card, elegent_form, reorganize, tournament, run_batch, remove_illegal
 import rlcard
 from rlcard.agents.random_agent import RandomAgent
+from rlcard.utils.trajectory import TrajectoryRecorder
+from rlcard.utils import seeding
+
+# Seconds that importing rlcard and its agents plus set_seed may take, not counting torch itself.
+# The fastest of STARTUP_RUNS runs is compared, with a wide margin over the usual 0.1 second so
+# that only a regression like an eager import of a large module or a subprocess fails the test
+STARTUP_TIME_BUDGET = 2.0
+STARTUP_RUNS = 5
+
+STARTUP_BENCHMARK = '''
+import importlib.util, subprocess, time
+if importlib.util.find_spec('torch') is not None:
+    import torch
+def no_subprocess(*args, **kwargs):
+    raise AssertionError('subprocess started during startup')
+subprocess.Popen = no_subprocess
+start = time.perf_counter()
+import rlcard
+import rlcard.agents
+from rlcard.utils import set_seed
+set_seed(0)
+print(time.perf_counter() - start)
+'''
 
 class TestUtils(unittest.TestCase):
 
+    def test_startup_time(self):
+        env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(rlcard.__file__)))
+        startup_time = min(float(subprocess.check_output([sys.executable, '-c', STARTUP_BENCHMARK], env=env))
+                           for _ in range(STARTUP_RUNS))
+        self.assertLess(startup_time, STARTUP_TIME_BUDGET)
+
+    def test_seed_sequence(self):
+        spawned = np.random.SeedSequence(5).spawn(3)[2].spawn(2)[1]
+        self.assertTrue(np.array_equal(seeding.seed_sequence(5, 2, 1).generate_state(4), spawned.generate_state(4)))
+        child = seeding.child_seed_sequence(seeding.seed_sequence(5, 2), 1)
+        self.assertTrue(np.array_equal(child.generate_state(4), spawned.generate_state(4)))
+        env_seeds = seeding.spawn_env_seeds(10, 2, 4)
+        self.assertEqual([env_seed.spawn_key for env_seed in env_seeds], [(2,), (3,)])
+        self.assertEqual(env_seeds[0].entropy, 10)
+        # Environment 1 of seed 0 is not environment 0 of seed 1
+        self.assertNotEqual(seeding.spawn_env_seeds(0, 1, 2)[0].generate_state(4).tolist(),
+                            seeding.spawn_env_seeds(1, 0, 1)[0].generate_state(4).tolist())
+        self.assertEqual(seeding.spawn_env_seeds(None, 0, 2), [None, None])
+        env_seeds = seeding.spawn_env_seeds(seeding.seed_sequence(5), 1, 3)
+        self.assertEqual([env_seed.spawn_key for env_seed in env_seeds], [(1,), (2,)])
+        np_random = seeding.np_random_from_seed_sequence(seeding.seed_sequence(5))
+        self.assertEqual(np_random.get_state(legacy=False)['bit_generator'], 'PCG64')
+
+    def test_is_torch_available(self):
+        try:
+            import torch
+            torch_installed = True
+        except ImportError:
+            torch_installed = False
+        self.assertEqual(is_torch_available(), torch_installed)
+
     def test_init_standard_deck(self):
         self.assertEqual(len(init_standard_deck()), 52)
 
@@ -37,11 +94,80 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(len(trajectories[0]), 1)
         self.assertEqual(len(trajectories[0][0]), 5)
 
+    def test_trajectory_recorder(self):
+        env = rlcard.make('leduc-holdem', config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
+        recorder = TrajectoryRecorder(env.num_players, env.num_actions, capacity=1)
+        for _ in range(20):
+            # Replay the recorded game with the list based run
+            np.random.seed(0)
+            env.seed(0)
+            trajectories, payoffs = env.run(is_training=True)
+            np.random.seed(0)
+            env.seed(0)
+            _, recorded_payoffs = env.run(is_training=True, recorder=recorder)
+            self.assertEqual(list(payoffs), list(recorded_payoffs))
+
+            trajectories = reorganize(trajectories, payoffs)
+            for player_id, transitions in enumerate(recorder.get_transitions()):
+                self.assertEqual(len(transitions.actions), len(trajectories[player_id]))
+                for i, (state, action, reward, next_state, done) in enumerate(trajectories[player_id]):
+                    self.assertTrue(np.array_equal(transitions.obs[i], state['obs']))
+                    self.assertTrue(np.array_equal(transitions.legal_mask[i], state['legal_mask']))
+                    self.assertEqual(transitions.actions[i], action)
+                    self.assertEqual(transitions.rewards[i], reward)
+                    self.assertTrue(np.array_equal(transitions.next_obs[i], next_state['obs']))
+                    self.assertTrue(np.array_equal(transitions.next_legal_mask[i], next_state['legal_mask']))
+                    self.assertEqual(transitions.dones[i], done)
+
+    def test_trajectory_recorder_state_shapes(self):
+        # The landlord observes larger states than the peasants
+        env = rlcard.make('doudizhu', config={'seed': 0})
+        env.set_agents([RandomAgent(env.num_actions) for _ in range(env.num_players)])
+        recorder = TrajectoryRecorder(env.num_players, env.num_actions, capacity=4)
+        for _ in range(3):
+            env.run(is_training=True, recorder=recorder)
+            for player_id, transitions in enumerate(recorder.get_transitions()):
+                self.assertEqual(transitions.obs.shape[1:], tuple(env.state_shape[player_id]))
+                self.assertEqual(transitions.next_obs.shape[1:], tuple(env.state_shape[player_id]))
+
     def test_tournament(self):
         env = rlcard.make('leduc-holdem')
         env.set_agents([RandomAgent(env.num_actions), RandomAgent(env.num_actions)])
         payoffs = tournament(env,1000)
         self.assertEqual(len(payoffs), 2)
 
+    def test_legal_mask(self):
+        for env_id in rlcard.envs.registration.registry.env_specs:
+            env = rlcard.make(env_id, config={'seed': 0})
+            state, _ = env.reset()
+            for _ in range(20):
+                legal_mask = state['legal_mask']
+                self.assertEqual(legal_mask.dtype, bool)
+                self.assertEqual(list(np.flatnonzero(legal_mask)), sorted(state['legal_actions']), env_id)
+                if env.is_over():
+                    break
+                state, _ = env.step(np.random.choice(np.flatnonzero(legal_mask)))
+
+    def test_remove_illegal(self):
+        action_probs = np.array([0.5, 0.2, 0.3])
+        self.assertTrue(np.allclose(remove_illegal(action_probs, [1, 2]), [0, 0.4, 0.6]))
+        self.assertTrue(np.allclose(remove_illegal(action_probs, np.array([False, True, True])), [0, 0.4, 0.6]))
+        self.assertTrue(np.allclose(remove_illegal(np.zeros(3), np.array([True, False, True])), [0.5, 0, 0.5]))
+
+    def test_run_batch(self):
+        envs = [rlcard.make('leduc-holdem', config={'seed': seed}) for seed in range(8)]
+        agent = RandomAgent(envs[0].num_actions)
+        for is_training in [False, True]:
+            all_trajectories, all_payoffs = run_batch(envs, [agent, agent], is_training=is_training)
+            self.assertEqual(len(all_trajectories), 8)
+            self.assertEqual(len(all_payoffs), 8)
+            for env, trajectories, payoffs in zip(envs, all_trajectories, all_payoffs):
+                self.assertTrue(env.is_over())
+                self.assertEqual(list(payoffs), list(env.get_payoffs()))
+                for player_trajectory in trajectories:
+                    # Alternating states and actions, ending with a state
+                    self.assertEqual(len(player_trajectory) % 2, 1)
+
 if __name__ == '__main__':
     unittest.main()